@@ -0,0 +1,26 @@
+"""add audio hash to tiktok videos for transcription dedup
+
+Revision ID: 2d6f9a1c8e43
+Revises: 7e1a4c9b3d52
+Create Date: 2026-10-19 13:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d6f9a1c8e43'
+down_revision = '7e1a4c9b3d52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tiktok_videos', sa.Column('audio_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_tiktok_videos_audio_hash'), 'tiktok_videos', ['audio_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tiktok_videos_audio_hash'), table_name='tiktok_videos')
+    op.drop_column('tiktok_videos', 'audio_hash')
@@ -0,0 +1,33 @@
+"""add short links cache table
+
+Revision ID: 3c9d7b2e5f18
+Revises: 6a4e1f8c2b95
+Create Date: 2026-10-19 14:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9d7b2e5f18'
+down_revision = '6a4e1f8c2b95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('short_links',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('short_url', sa.String(length=1000), nullable=False),
+        sa.Column('expanded_url', sa.String(length=1000), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_short_links_short_url'), 'short_links', ['short_url'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_short_links_short_url'), table_name='short_links')
+    op.drop_table('short_links')
@@ -0,0 +1,39 @@
+"""add transcription_chunks table for semantic search
+
+Revision ID: 4e7b2c9d1a36
+Revises: 1aa7588ac9f5
+Create Date: 2026-10-18 10:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4e7b2c9d1a36'
+down_revision = '1aa7588ac9f5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Chunked transcriptions with their embedding vectors
+    op.create_table('transcription_chunks',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('video_id', sa.UUID(), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('embedding', postgresql.ARRAY(sa.REAL()), nullable=False),
+    sa.Column('embedding_model', sa.String(length=100), nullable=False),
+    sa.Column('transcription_md5', sa.String(length=32), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['video_id'], ['tiktok_videos.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_transcription_chunks_video', 'transcription_chunks', ['video_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transcription_chunks_video', table_name='transcription_chunks')
+    op.drop_table('transcription_chunks')
@@ -0,0 +1,119 @@
+"""make influencers.owner_id authoritative and drop the ownertype enum
+
+Revision ID: 4f2c8e1a7b39
+Revises: 8b5e2f7a1d64
+Create Date: 2026-10-19 19:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4f2c8e1a7b39'
+down_revision = '8b5e2f7a1d64'
+branch_labels = None
+depends_on = None
+
+# Values of ownertype when it was dropped (downgrade recreates it with these)
+LEGACY_OWNERS = ('alejandra', 'alessandro', 'bianca', 'camilo', 'jesus', 'julia', 'samuel')
+
+
+def upgrade() -> None:
+    # Owners are looked up by lowercase name from now on (API, CSV import, assistant).
+    # Names that only differ in case or spaces are merged into one owner: the one
+    # already lowercase, else the oldest, which takes over the others' influencers
+    # and any display name/email it lacks. Each merge is reported.
+    op.execute("""
+        CREATE TEMP TABLE owner_merges AS
+        SELECT id, name, keep_id FROM (
+            SELECT id, name, first_value(id) OVER (
+                PARTITION BY lower(trim(name))
+                ORDER BY name = lower(trim(name)) DESC, created_at, id
+            ) AS keep_id
+            FROM owners
+        ) ranked
+        WHERE id <> keep_id
+    """)
+    merges = op.get_bind().execute(sa.text("""
+        SELECT m.name, lower(trim(keep.name)) AS kept, count(i.id) AS influencers
+        FROM owner_merges m
+        JOIN owners keep ON keep.id = m.keep_id
+        LEFT JOIN influencers i ON i.owner_id = m.id
+        GROUP BY m.name, lower(trim(keep.name))
+        ORDER BY kept, m.name
+    """)).all()
+    for merge in merges:
+        print(f"[WARNING] Owner '{merge.name}' merged into '{merge.kept}' "
+              f"({merge.influencers} influencers moved)")
+
+    op.execute("""
+        UPDATE influencers i SET owner_id = m.keep_id
+        FROM owner_merges m
+        WHERE i.owner_id = m.id
+    """)
+    op.execute("""
+        UPDATE owners keep SET
+            display_name = COALESCE(keep.display_name, merged.display_name),
+            email = COALESCE(keep.email, merged.email),
+            is_active = COALESCE(keep.is_active, false) OR COALESCE(merged.is_active, false)
+        FROM (
+            SELECT m.keep_id, max(o.display_name) AS display_name, max(o.email) AS email, bool_or(o.is_active) AS is_active
+            FROM owner_merges m
+            JOIN owners o ON o.id = m.id
+            GROUP BY m.keep_id
+        ) merged
+        WHERE keep.id = merged.keep_id
+    """)
+    op.execute("DELETE FROM owners o USING owner_merges m WHERE o.id = m.id")
+    op.execute("DROP TABLE owner_merges")
+    op.execute("UPDATE owners SET name = lower(trim(name)) WHERE name <> lower(trim(name))")
+
+    # Every enum value (used or not) becomes a row in owners
+    op.execute("""
+        INSERT INTO owners (name, display_name, is_active)
+        SELECT value, initcap(value), true
+        FROM unnest(enum_range(NULL::ownertype)::text[]) AS value
+        ON CONFLICT (name) DO NOTHING
+    """)
+
+    # The enum was what the API wrote and read, so it wins over any stale owner_id
+    op.execute("""
+        UPDATE influencers i SET owner_id = o.id
+        FROM owners o
+        WHERE o.name = i.owner::text
+          AND i.owner_id IS DISTINCT FROM o.id
+    """)
+
+    op.alter_column('influencers', 'owner_id', existing_type=sa.UUID(), nullable=False)
+    op.create_index(op.f('ix_influencers_owner_id'), 'influencers', ['owner_id'], unique=False)
+
+    op.drop_column('influencers', 'owner')
+    op.execute("DROP TYPE ownertype")
+
+    # Compatibility for SQL that read influencers.owner (reports, ad-hoc queries)
+    op.execute("""
+        CREATE VIEW influencers_with_owner AS
+        SELECT i.id, i.first_name, i.eldorado_username, i.phone, i.country, i.status,
+               i.owner_id, o.name AS owner, i.created_at, i.updated_at
+        FROM influencers i
+        JOIN owners o ON o.id = i.owner_id
+    """)
+
+
+def downgrade() -> None:
+    # Fails on influencers whose owner was added after the upgrade (not in LEGACY_OWNERS)
+    op.execute("DROP VIEW IF EXISTS influencers_with_owner")
+    values = ", ".join(f"'{value}'" for value in LEGACY_OWNERS)
+    op.execute(f"CREATE TYPE ownertype AS ENUM ({values})")
+    op.add_column('influencers', sa.Column('owner', postgresql.ENUM(*LEGACY_OWNERS, name='ownertype', create_type=False), nullable=True))
+    op.execute("""
+        UPDATE influencers i SET owner = o.name::ownertype
+        FROM owners o
+        WHERE o.id = i.owner_id
+    """)
+    op.alter_column('influencers', 'owner', nullable=False)
+
+    op.drop_index(op.f('ix_influencers_owner_id'), table_name='influencers')
+    op.alter_column('influencers', 'owner_id', existing_type=sa.UUID(), nullable=True)
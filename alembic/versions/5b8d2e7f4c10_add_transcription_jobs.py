@@ -0,0 +1,41 @@
+"""add transcription jobs queue
+
+Revision ID: 5b8d2e7f4c10
+Revises: 9c3f5a8e2b17
+Create Date: 2026-10-19 09:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8d2e7f4c10'
+down_revision = '9c3f5a8e2b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('transcription_jobs',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('tiktok_url', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+    sa.Column('step', sa.String(length=100), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False, server_default=sa.text('0')),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('result', sa.Text(), nullable=True),
+    sa.Column('video_id', sa.UUID(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['video_id'], ['tiktok_videos.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_transcription_jobs_status', 'transcription_jobs', ['status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transcription_jobs_status', table_name='transcription_jobs')
+    op.drop_table('transcription_jobs')
@@ -0,0 +1,71 @@
+"""add video url aliases for indexed url lookup
+
+Revision ID: 6a4e1f8c2b95
+Revises: 2d6f9a1c8e43
+Create Date: 2026-10-19 14:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6a4e1f8c2b95'
+down_revision = '2d6f9a1c8e43'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('video_url_aliases',
+        sa.Column('id', postgresql.UUID(as_uuid=True), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('alias', sa.String(length=1000), nullable=False),
+        sa.Column('tiktok_video_id', sa.String(length=255), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_video_url_aliases_alias'), 'video_url_aliases', ['alias'], unique=True)
+    op.create_index(op.f('ix_video_url_aliases_tiktok_video_id'), 'video_url_aliases', ['tiktok_video_id'], unique=False)
+
+    # Index the URLs of the videos already synced, normalized exactly like
+    # VideoUrlIndex.normalize: lowercase host without port and one leading www./m.,
+    # plus the path without trailing slash (scheme, query and fragment dropped),
+    # plus ?<name>=<id> when the ID is a query parameter (/share/video?aweme_id=...)
+    op.execute("""
+        INSERT INTO video_url_aliases (alias, tiktok_video_id, kind)
+        SELECT DISTINCT ON (alias) alias, tiktok_video_id,
+               CASE WHEN split_part(alias, '/', 1) IN ('vm.tiktok.com', 'vt.tiktok.com')
+                         OR alias LIKE 'tiktok.com/t/%' THEN 'short'
+                    WHEN alias LIKE '%/video/%' THEN 'canonical'
+                    ELSE 'share' END
+        FROM (
+            SELECT left(host || rtrim(path, '/') || coalesce('?' || id_param, ''), 1000) AS alias, tiktok_video_id
+            FROM (
+                SELECT regexp_replace(lower(split_part(substring(rest FROM '^[^/?#]*'), ':', 1)), '^(www\\.)?(m\\.)?', '') AS host,
+                       substring(rest FROM '^[^/?#]*([^?#]*)') AS path,
+                       substring(rest FROM '[?&#]((?:aweme_id|item_id|share_item_id)=\\d{5,})') AS id_param,
+                       tiktok_video_id
+                FROM (
+                    SELECT CASE WHEN position('://' IN url) > 0 THEN substring(url FROM position('://' IN url) + 3)
+                                ELSE url END AS rest,
+                           tiktok_video_id
+                    FROM (SELECT trim(public_video_url) AS url, tiktok_video_id FROM tiktok_videos) raw
+                    WHERE url IS NOT NULL AND url <> ''
+                ) without_scheme
+            ) parts
+            WHERE host <> ''
+            UNION ALL
+            SELECT 'tiktok.com/@' || tiktok_username || '/video/' || tiktok_video_id, tiktok_video_id
+            FROM tiktok_videos
+            WHERE tiktok_username IS NOT NULL
+        ) urls
+        ON CONFLICT (alias) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_video_url_aliases_tiktok_video_id'), table_name='video_url_aliases')
+    op.drop_index(op.f('ix_video_url_aliases_alias'), table_name='video_url_aliases')
+    op.drop_table('video_url_aliases')
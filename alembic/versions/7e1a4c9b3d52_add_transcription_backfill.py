@@ -0,0 +1,51 @@
+"""add transcription backfill runs and per-video attempt tracking
+
+Revision ID: 7e1a4c9b3d52
+Revises: 5b8d2e7f4c10
+Create Date: 2026-10-19 11:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e1a4c9b3d52'
+down_revision = '5b8d2e7f4c10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tiktok_videos', sa.Column('transcription_attempts', sa.Integer(), nullable=False, server_default=sa.text('0')))
+    op.add_column('tiktok_videos', sa.Column('transcription_error', sa.Text(), nullable=True))
+    op.add_column('tiktok_videos', sa.Column('transcription_attempted_at', sa.DateTime(timezone=True), nullable=True))
+    
+    # Backfill picks untranscribed videos by views
+    op.create_index(
+        'idx_tiktok_videos_untranscribed_views', 'tiktok_videos', [sa.text('view_count DESC')],
+        unique=False, postgresql_where=sa.text('transcription IS NULL')
+    )
+    
+    op.create_table('transcription_backfill_runs',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False, server_default='running'),
+    sa.Column('budget_minutes', sa.Float(), nullable=False),
+    sa.Column('max_videos', sa.Integer(), nullable=True),
+    sa.Column('audio_seconds', sa.Float(), nullable=False, server_default=sa.text('0')),
+    sa.Column('videos_transcribed', sa.Integer(), nullable=False, server_default=sa.text('0')),
+    sa.Column('videos_failed', sa.Integer(), nullable=False, server_default=sa.text('0')),
+    sa.Column('last_error', sa.String(length=1000), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('transcription_backfill_runs')
+    op.drop_index('idx_tiktok_videos_untranscribed_views', table_name='tiktok_videos')
+    op.drop_column('tiktok_videos', 'transcription_attempted_at')
+    op.drop_column('tiktok_videos', 'transcription_error')
+    op.drop_column('tiktok_videos', 'transcription_attempts')
@@ -0,0 +1,38 @@
+"""add TikTok ID resolution tracking to influencer_ids
+
+Revision ID: 8b5e2f7a1d64
+Revises: 3c9d7b2e5f18
+Create Date: 2026-10-19 17:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b5e2f7a1d64'
+down_revision = '3c9d7b2e5f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('influencer_ids', sa.Column('tiktok_id_attempts', sa.Integer(), nullable=False, server_default=sa.text('0')))
+    op.add_column('influencer_ids', sa.Column('tiktok_id_error', sa.String(length=1000), nullable=True))
+    op.add_column('influencer_ids', sa.Column('tiktok_id_attempted_at', sa.DateTime(timezone=True), nullable=True))
+    
+    # Empty strings were written by the old sync scripts; the resolver only looks for NULL
+    op.execute("UPDATE influencer_ids SET tiktok_id = NULL WHERE tiktok_id = ''")
+    
+    # The resolver scans influencers with a TikTok username but no TikTok ID
+    op.create_index(
+        'idx_influencer_ids_tiktok_id_pending', 'influencer_ids', ['tiktok_id_attempts'],
+        unique=False, postgresql_where=sa.text('tiktok_username IS NOT NULL AND tiktok_id IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_influencer_ids_tiktok_id_pending', table_name='influencer_ids')
+    op.drop_column('influencer_ids', 'tiktok_id_attempted_at')
+    op.drop_column('influencer_ids', 'tiktok_id_error')
+    op.drop_column('influencer_ids', 'tiktok_id_attempts')
@@ -0,0 +1,45 @@
+"""add chat sessions and messages for the AI assistant
+
+Revision ID: 9c3f5a8e2b17
+Revises: 4e7b2c9d1a36
+Create Date: 2026-10-18 11:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3f5a8e2b17'
+down_revision = '4e7b2c9d1a36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('chat_sessions',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('context_data', sa.Text(), nullable=True),
+    sa.Column('data_version', sa.String(length=100), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('chat_messages',
+    sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('compacted', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('clock_timestamp()'), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['chat_sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_chat_messages_session', 'chat_messages', ['session_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_chat_messages_session', table_name='chat_messages')
+    op.drop_table('chat_messages')
+    op.drop_table('chat_sessions')
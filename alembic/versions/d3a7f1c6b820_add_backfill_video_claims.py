@@ -0,0 +1,35 @@
+"""add exclusive backfill claims on tiktok_videos
+
+Revision ID: d3a7f1c6b820
+Revises: 4f2c8e1a7b39
+Create Date: 2026-10-19 21:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a7f1c6b820'
+down_revision = '4f2c8e1a7b39'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Backfill run currently transcribing the video (cleared when it finishes with it)
+    op.add_column('tiktok_videos', sa.Column('transcription_claimed_by', sa.UUID(), nullable=True))
+    op.create_foreign_key(
+        'fk_tiktok_videos_transcription_claimed_by', 'tiktok_videos', 'transcription_backfill_runs',
+        ['transcription_claimed_by'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(
+        'idx_tiktok_videos_transcription_claimed_by', 'tiktok_videos', ['transcription_claimed_by'],
+        unique=False, postgresql_where=sa.text('transcription_claimed_by IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tiktok_videos_transcription_claimed_by', table_name='tiktok_videos')
+    op.drop_constraint('fk_tiktok_videos_transcription_claimed_by', 'tiktok_videos', type_='foreignkey')
+    op.drop_column('tiktok_videos', 'transcription_claimed_by')
@@ -0,0 +1,25 @@
+"""add next_attempt_at to transcription_jobs
+
+Revision ID: e8c4b2d9f173
+Revises: d3a7f1c6b820
+Create Date: 2026-10-19 22:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c4b2d9f173'
+down_revision = 'd3a7f1c6b820'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Retry backoff: a queued job is not claimed before this time (NULL = right away)
+    op.add_column('transcription_jobs', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('transcription_jobs', 'next_attempt_at')
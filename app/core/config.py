@@ -16,6 +16,61 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str = "your_openai_api_key_here"
     
+    # AI Assistant
+    ai_model: str = "gpt-4"
+    ai_context_token_budget: int = 3000  # Max tokens for database context in the system prompt
+    ai_max_completion_tokens: int = 1000
+    ai_cache_max_entries: int = 500
+    ai_cache_ttl_seconds: int = 3600
+    ai_cache_similarity: float = 0.9  # Word similarity to reuse an answer for a near-duplicate question
+    ai_summary_model: str = "gpt-3.5-turbo"  # Used to compact older chat turns
+    ai_session_recent_turns: int = 4  # Turns kept verbatim in the prompt, older ones are summarized
+    ai_session_max_context_sections: int = 8
+    
+    # Transcription audio extraction
+    ffmpeg_binary: str = "ffmpeg"
+    transcription_audio_codec: str = "libopus"  # libopus, libmp3lame or copy (remux original AAC)
+    transcription_audio_bitrate: str = "24k"
+    ffmpeg_timeout_seconds: int = 300
+    download_probe_timeout_seconds: int = 5  # Health check of candidate video URLs
+    transcription_chunk_seconds: int = 300  # Longer audio is split and transcribed in parallel
+    transcription_chunk_overlap_seconds: float = 1.5
+    transcription_max_parallel_chunks: int = 4
+    transcription_silence_db: int = -35  # Below this level counts as silence for cut points
+    transcription_silence_min_seconds: float = 0.4
+    
+    # Background transcription jobs
+    transcription_workers: int = 2
+    transcription_job_max_attempts: int = 3
+    transcription_job_retry_backoff_seconds: int = 10  # Doubles after each failed attempt
+    whisper_max_concurrent_requests: int = 4  # Per process, across all transcription paths
+    upload_spool_max_bytes: int = 8 * 1024 * 1024  # Extracted audio past this size buffers on disk
+    
+    # TikTok short links (vm.tiktok.com) resolved once, kept in memory + short_links table
+    short_link_cache_size: int = 10000
+    url_resolve_workers: int = 8  # Short links expanded at the same time by POST /videos/resolve
+    url_resolve_max_urls: int = 500
+    
+    # Transcription engine: "openai" (Whisper API) or "local" (faster-whisper, optional: pip install faster-whisper)
+    transcription_backend: str = "openai"
+    local_whisper_model: str = "small"  # tiny, base, small, medium, large-v3 or a CTranslate2 model path
+    local_whisper_compute_type: str = "int8"
+    local_whisper_cpu_threads: int = 0  # 0 lets CTranslate2 pick
+    local_whisper_workers: int = 2  # Files transcribed at the same time on the loaded model
+    local_whisper_batch_size: int = 8  # Audio windows decoded per batch (BatchedInferencePipeline)
+    
+    # Transcription backfill (backfill_transcriptions.py / POST /videos/transcriptions/backfill)
+    backfill_workers: int = 3  # Videos downloaded and transcribed at the same time
+    backfill_budget_minutes: int = 600  # Audio minutes sent to Whisper per run
+    backfill_max_attempts: int = 3  # Videos failing this many times are skipped
+    
+    # Transcription semantic search
+    embedding_model: str = "text-embedding-3-small"
+    embedding_batch_size: int = 64
+    embedding_chunk_words: int = 200
+    embedding_chunk_overlap: int = 40
+    semantic_search_min_score: float = 0.3  # Cosine similarity; weaker matches fall back to keyword search
+    
     # Security
     secret_key: str = "your-secret-key-here"
     algorithm: str = "HS256"
@@ -24,6 +79,14 @@ class Settings(BaseSettings):
     # El Dorado Settings
     eldorado_mention: str = "@El Dorado P2P"
     sync_video_count: int = 20
+    onboarding_sync_workers: int = 3  # Influencers synced at the same time after POST /influencers/bulk
+    onboarding_max_batch: int = 500
+    
+    # TikTok ID resolution (sync_tiktok_ids.py / POST /influencers/tiktok-ids/resolve)
+    tiktok_id_workers: int = 4  # ScrapTik lookups in flight at the same time
+    tiktok_id_requests_per_second: float = 2.0  # Across all workers
+    tiktok_id_max_attempts: int = 5  # Influencers failing this many times are skipped (unless retry_failed)
+    tiktok_id_batch_size: int = 100  # Lookups written back per UPDATE
     
     # App
     app_name: str = "El Dorado Influencer API"
@@ -5,6 +5,7 @@ from .core.config import settings
 from .routes import influencers_router, videos_router, analytics_router, owners_router, ai_assistant_router
 import os
 import subprocess
+import threading
 
 # Run migrations on startup (only in production)
 if os.getenv("RAILWAY_ENVIRONMENT") or os.getenv("PORT"):  # Railway environment
@@ -43,6 +44,41 @@ app.include_router(videos_router)
 app.include_router(analytics_router)
 app.include_router(ai_assistant_router)
 
+
+@app.on_event("startup")
+def resume_transcription_jobs():
+    """Pick up transcription jobs interrupted by a restart or deploy"""
+    from .services import TranscriptionJobQueue
+    try:
+        TranscriptionJobQueue().resume_pending()
+    except Exception as e:
+        print(f"⚠️ Could not resume transcription jobs: {e}")
+
+@app.on_event("startup")
+def resume_transcription_backfills():
+    """Pick up backfill runs whose process died (stale heartbeat)"""
+    from .services import TranscriptionBackfill
+    try:
+        TranscriptionBackfill().resume_stale()
+    except Exception as e:
+        print(f"⚠️ Could not resume transcription backfills: {e}")
+
+@app.on_event("startup")
+def warm_up_transcription_backend():
+    """Load the local Whisper model in the background so the first transcription doesn't pay for it"""
+    if settings.transcription_backend != "local":
+        return
+
+    def warm_up():
+        from .services.transcription_backends import get_transcription_backend
+        try:
+            get_transcription_backend().warm_up()
+            print("✅ Local Whisper model loaded")
+        except Exception as e:
+            print(f"⚠️ Could not load local Whisper model: {e}")
+
+    threading.Thread(target=warm_up, daemon=True, name="whisper-warm-up").start()
+
 @app.get("/api")
 def api_root():
     """API root endpoint with basic information"""
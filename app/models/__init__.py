@@ -2,14 +2,27 @@ from .owner import Owner
 from .influencer import Influencer
 from .influencer_ids import InfluencerIds
 from .tiktok_video import TikTokVideo
+from .transcription_chunk import TranscriptionChunk
 from .campaign import Campaign
 from .partnership import Partnership
+from .chat_session import ChatSession, ChatSessionMessage
+from .transcription_job import TranscriptionJob
+from .transcription_backfill_run import TranscriptionBackfillRun
+from .video_url_alias import VideoUrlAlias
+from .short_link import ShortLink
 
 __all__ = [
     "Owner",
     "Influencer",
     "InfluencerIds", 
     "TikTokVideo",
+    "TranscriptionChunk",
     "Campaign",
-    "Partnership"
+    "Partnership",
+    "ChatSession",
+    "ChatSessionMessage",
+    "TranscriptionJob",
+    "TranscriptionBackfillRun",
+    "VideoUrlAlias",
+    "ShortLink"
 ]
\ No newline at end of file
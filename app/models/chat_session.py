@@ -0,0 +1,54 @@
+from sqlalchemy import Column, String, Text, Boolean, DateTime, ForeignKey, text, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class ChatSession(Base):
+    __tablename__ = "chat_sessions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    
+    # Rolling summary of the turns that were compacted out of the history
+    summary = Column(Text)
+    
+    # Data fetched in previous turns (JSON), valid while data_version is unchanged
+    context_data = Column(Text)
+    data_version = Column(String(100))
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    messages = relationship(
+        "ChatSessionMessage",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        order_by="ChatSessionMessage.created_at"
+    )
+
+    def __repr__(self):
+        return f"<ChatSession(id='{self.id}')>"
+
+
+class ChatSessionMessage(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    session_id = Column(UUID(as_uuid=True), ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False)
+    role = Column(String(20), nullable=False)  # user | assistant
+    content = Column(Text, nullable=False)
+    compacted = Column(Boolean, default=False, nullable=False)  # Already folded into the session summary
+    # clock_timestamp keeps the order of messages inserted in the same transaction
+    created_at = Column(DateTime(timezone=True), server_default=func.clock_timestamp())
+
+    # Relationships
+    session = relationship("ChatSession", back_populates="messages")
+
+    __table_args__ = (
+        Index("idx_chat_messages_session", "session_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<ChatSessionMessage(session_id='{self.session_id}', role='{self.role}')>"
@@ -1,19 +1,9 @@
-from sqlalchemy import Column, String, DateTime, Enum, ForeignKey, text
+from typing import Optional
+from sqlalchemy import Column, String, DateTime, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..core.database import Base
-import enum
-
-
-class OwnerType(enum.Enum):
-    alejandra = "alejandra"
-    alessandro = "alessandro"
-    bianca = "bianca"
-    camilo = "camilo"
-    jesus = "jesus"
-    julia = "julia"
-    samuel = "samuel"
 
 
 class Influencer(Base):
@@ -24,17 +14,21 @@ class Influencer(Base):
     eldorado_username = Column(String(100), unique=True, nullable=False, index=True)
     phone = Column(String(20))
     country = Column(String(100))
-    owner = Column(Enum(OwnerType), nullable=False)  # Keep for backward compatibility
-    owner_id = Column(UUID(as_uuid=True), ForeignKey("owners.id"))
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("owners.id"), nullable=False, index=True)
     status = Column(String(20), default="active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    owner_obj = relationship("Owner", back_populates="influencers")
+    owner_obj = relationship("Owner", back_populates="influencers", lazy="joined", innerjoin=True)
     influencer_ids = relationship("InfluencerIds", back_populates="influencer", uselist=False, cascade="all, delete-orphan")
     tiktok_videos = relationship("TikTokVideo", back_populates="influencer", cascade="all, delete-orphan")
     partnerships = relationship("Partnership", back_populates="influencer", cascade="all, delete-orphan")
 
+    @property
+    def owner(self) -> Optional[str]:
+        """Owner name (filter and group by owner_id / a join on owners, not this)"""
+        return self.owner_obj.name if self.owner_obj else None
+
     def __repr__(self):
         return f"<Influencer(eldorado_username='{self.eldorado_username}', first_name='{self.first_name}')>"
\ No newline at end of file
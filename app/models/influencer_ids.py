@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -14,6 +14,9 @@ class InfluencerIds(Base):
     # TikTok
     tiktok_username = Column(String(100))
     tiktok_id = Column(String(255))
+    tiktok_id_attempts = Column(Integer, nullable=False, server_default=text("0"))  # Failed lookups (TikTokIdResolver)
+    tiktok_id_error = Column(String(1000))
+    tiktok_id_attempted_at = Column(DateTime(timezone=True))
     
     # Instagram
     instagram_username = Column(String(100))
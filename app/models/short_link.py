@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, DateTime, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class ShortLink(Base):
+    """Where a TikTok short link (vm.tiktok.com) redirects to, resolved once and kept"""
+    __tablename__ = "short_links"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    short_url = Column(String(1000), unique=True, nullable=False, index=True)  # Normalized, see VideoUrlIndex.normalize
+    expanded_url = Column(String(1000), nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<ShortLink(short_url='{self.short_url}', expanded_url='{self.expanded_url}')>"
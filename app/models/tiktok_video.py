@@ -28,6 +28,11 @@ class TikTokVideo(Base):
     
     # Transcription
     transcription = Column(Text, nullable=True)
+    audio_hash = Column(String(64), index=True)  # SHA-256 of the extracted audio, reused across duplicates
+    transcription_attempts = Column(Integer, default=0, nullable=False)  # Failed backfill attempts
+    transcription_error = Column(Text)
+    transcription_attempted_at = Column(DateTime(timezone=True))
+    transcription_claimed_by = Column(UUID(as_uuid=True), ForeignKey("transcription_backfill_runs.id", ondelete="SET NULL"))  # Backfill run working on it
     
     # Timestamps
     published_at = Column(DateTime(timezone=True))
@@ -36,6 +41,7 @@ class TikTokVideo(Base):
 
     # Relationships
     influencer = relationship("Influencer", back_populates="tiktok_videos")
+    transcription_chunks = relationship("TranscriptionChunk", back_populates="video", cascade="all, delete-orphan")
 
     # Índices para performance
     __table_args__ = (
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class TranscriptionBackfillRun(Base):
+    __tablename__ = "transcription_backfill_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    
+    # running | completed | budget_exhausted | stopped | failed
+    status = Column(String(20), nullable=False, default="running")
+    
+    # Limits
+    budget_minutes = Column(Float, nullable=False)
+    max_videos = Column(Integer)
+    
+    # Progress (a resumed run keeps accumulating on the same row)
+    audio_seconds = Column(Float, nullable=False, default=0)
+    videos_transcribed = Column(Integer, nullable=False, default=0)
+    videos_failed = Column(Integer, nullable=False, default=0)
+    last_error = Column(String(1000))
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<TranscriptionBackfillRun(id='{self.id}', status='{self.status}')>"
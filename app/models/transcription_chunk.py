@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, REAL, text, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class TranscriptionChunk(Base):
+    __tablename__ = "transcription_chunks"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    video_id = Column(UUID(as_uuid=True), ForeignKey("tiktok_videos.id", ondelete="CASCADE"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    content = Column(Text, nullable=False)
+    
+    # Embedding vector and md5 of the transcription it was generated from
+    embedding = Column(ARRAY(REAL), nullable=False)
+    embedding_model = Column(String(100), nullable=False)
+    transcription_md5 = Column(String(32), nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    video = relationship("TikTokVideo", back_populates="transcription_chunks")
+
+    __table_args__ = (
+        Index("idx_transcription_chunks_video", "video_id"),
+    )
+
+    def __repr__(self):
+        return f"<TranscriptionChunk(video_id='{self.video_id}', chunk_index={self.chunk_index})>"
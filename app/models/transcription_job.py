@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, text, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class TranscriptionJob(Base):
+    __tablename__ = "transcription_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    tiktok_url = Column(Text, nullable=False)
+    
+    # queued | running | succeeded | failed
+    status = Column(String(20), nullable=False, default="queued")
+    step = Column(String(100))  # Current stage, shown to the user while polling
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True))  # Retry backoff: not claimed before this (NULL = right away)
+    error = Column(Text)
+    
+    # VideoTranscriptionResponse (JSON) once the job finishes
+    result = Column(Text)
+    video_id = Column(UUID(as_uuid=True), ForeignKey("tiktok_videos.id", ondelete="SET NULL"))
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("idx_transcription_jobs_status", "status", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<TranscriptionJob(id='{self.id}', status='{self.status}')>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class VideoUrlAlias(Base):
+    """Any URL a video is known by (short link, canonical or share URL) mapped to its TikTok ID"""
+    __tablename__ = "video_url_aliases"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    # Normalized URL: host without www./m. + path, no scheme, query or trailing slash
+    alias = Column(String(1000), unique=True, nullable=False, index=True)
+    tiktok_video_id = Column(String(255), nullable=False, index=True)  # Not a FK: expanded links may point to unregistered videos
+    kind = Column(String(20), nullable=False)  # short | canonical | share
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<VideoUrlAlias(alias='{self.alias}', video='{self.tiktok_video_id}')>"
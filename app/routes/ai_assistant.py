@@ -4,24 +4,48 @@ from ..core.database import get_db
 from ..services.ai_assistant import ElDoradoAIAssistant
 from ..schemas import *
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional, Dict, Any
+from uuid import UUID
+from datetime import datetime
+from functools import lru_cache
 
 router = APIRouter(prefix="/api/v1/ai-assistant", tags=["AI Assistant"])
 
 # Schemas
 class ChatMessage(BaseModel):
     message: str = Field(..., min_length=1, max_length=1000, description="Mensagem do usuário")
+    session_id: Optional[UUID] = Field(None, description="Sessão de chat (mantém o histórico da conversa)")
 
 class ChatResponse(BaseModel):
     success: bool
+    session_id: Optional[UUID] = None
     response: str
     suggestions: List[str] = []
+    usage: Optional[Dict[str, Any]] = None
+    cached: bool = False
 
 class SuggestionsResponse(BaseModel):
     suggestions: List[str]
 
-# Initialize AI Assistant
-ai_assistant = ElDoradoAIAssistant()
+class ChatHistoryMessage(BaseModel):
+    role: str
+    content: str
+    compacted: bool
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ChatSessionResponse(BaseModel):
+    session_id: UUID
+    summary: Optional[str] = None
+    messages: List[ChatHistoryMessage] = []
+    created_at: Optional[datetime] = None
+
+@lru_cache(maxsize=1)
+def get_ai_assistant() -> ElDoradoAIAssistant:
+    """AI Assistant do processo, criado na primeira requisição e não no import"""
+    return ElDoradoAIAssistant()
 
 @router.post("/chat", response_model=ChatResponse)
 def chat_with_assistant(
@@ -39,29 +63,70 @@ def chat_with_assistant(
     - "Quantos influenciadores temos ativos?"
     """
     try:
-        response = ai_assistant.process_user_message(request.message, db)
-        suggestions = ai_assistant.get_suggestions(db)
+        result = get_ai_assistant().process_user_message(request.message, db, session_id=request.session_id)
+        suggestions = get_ai_assistant().get_suggestions(db)
         
         return ChatResponse(
             success=True,
-            response=response,
-            suggestions=suggestions[:4]  # Limit suggestions
+            session_id=request.session_id,
+            response=result["response"],
+            suggestions=suggestions[:4],  # Limit suggestions
+            usage=result["usage"],
+            cached=result["cached"]
         )
         
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         return ChatResponse(
             success=False,
+            session_id=request.session_id,
             response=f"❌ Erro interno: {str(e)}",
             suggestions=[]
         )
 
+@router.post("/sessions", response_model=ChatSessionResponse, status_code=201)
+def create_chat_session(db: Session = Depends(get_db)):
+    """
+    Criar uma sessão de chat; envie o session_id em /chat para manter o histórico
+    """
+    chat_session = get_ai_assistant().sessions.create(db)
+    return ChatSessionResponse(session_id=chat_session.id, created_at=chat_session.created_at)
+
+@router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
+def get_chat_session(session_id: UUID, db: Session = Depends(get_db)):
+    """
+    Obter o histórico e o resumo compacto de uma sessão de chat
+    """
+    chat_session = get_ai_assistant().sessions.get(db, session_id)
+    if not chat_session:
+        raise HTTPException(status_code=404, detail=f"Sessão '{session_id}' não encontrada")
+    
+    return ChatSessionResponse(
+        session_id=chat_session.id,
+        summary=chat_session.summary,
+        messages=[ChatHistoryMessage.model_validate(message) for message in chat_session.messages],
+        created_at=chat_session.created_at
+    )
+
+@router.delete("/sessions/{session_id}", status_code=204)
+def delete_chat_session(session_id: UUID, db: Session = Depends(get_db)):
+    """
+    Apagar uma sessão de chat e seu histórico
+    """
+    chat_session = get_ai_assistant().sessions.get(db, session_id)
+    if not chat_session:
+        raise HTTPException(status_code=404, detail=f"Sessão '{session_id}' não encontrada")
+    
+    get_ai_assistant().sessions.delete(db, chat_session)
+
 @router.get("/suggestions", response_model=SuggestionsResponse)
 def get_chat_suggestions(db: Session = Depends(get_db)):
     """
     Obter sugestões de perguntas para o chat
     """
     try:
-        suggestions = ai_assistant.get_suggestions(db)
+        suggestions = get_ai_assistant().get_suggestions(db)
         return SuggestionsResponse(suggestions=suggestions)
         
     except Exception as e:
@@ -70,6 +135,24 @@ def get_chat_suggestions(db: Session = Depends(get_db)):
             detail=f"Erro ao obter sugestões: {str(e)}"
         )
 
+@router.get("/usage")
+def get_assistant_usage(recent: int = 20):
+    """
+    Consumo de tokens e latência das chamadas ao modelo (desde o início do processo)
+    """
+    return {
+        **get_ai_assistant().usage.summary(recent=recent),
+        "answer_cache": get_ai_assistant().answer_cache.stats()
+    }
+
+@router.delete("/cache")
+def clear_assistant_cache():
+    """
+    Limpar o cache de respostas do assistente
+    """
+    get_ai_assistant().answer_cache.clear()
+    return {"success": True, "message": "Cache de respostas limpo"}
+
 @router.get("/health")
 def ai_assistant_health():
     """Health check do assistente AI"""
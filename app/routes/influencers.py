@@ -1,28 +1,117 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from typing import Dict, List, Optional
 from ..core.database import get_db
-from ..models import Influencer, InfluencerIds
+from ..models import Influencer, InfluencerIds, Owner, TikTokVideo
 from ..schemas import (
     InfluencerCreate,
     InfluencerUpdate, 
     InfluencerResponse,
-    InfluencerIdsResponse
+    InfluencerDetailResponse,
+    InfluencerIdsResponse,
+    InfluencerVideoStats,
+    InfluencerImportResponse,
+    InfluencerBulkRequest,
+    InfluencerBulkResponse,
+    TikTokIdResolveRequest,
+    TikTokIdResolutionStatus
 )
-from ..services import ScrapTikService
+from ..core.config import settings
+from ..services import ScrapTikService, InfluencerImporter, InfluencerOnboarding, TikTokIdResolver
 
 router = APIRouter(prefix="/api/v1/influencers", tags=["influencers"])
 
 
-@router.get("/", response_model=List[InfluencerResponse])
+LIST_INCLUDES = ("social_ids", "stats")
+
+
+@router.get("/", response_model=List[InfluencerDetailResponse])
 def list_influencers(
     skip: int = 0,
     limit: int = 1000,
+    include: Optional[str] = Query(None, description="Comma-separated extras: social_ids, stats"),
     db: Session = Depends(get_db)
 ):
-    """List all influencers with pagination"""
-    influencers = db.query(Influencer).offset(skip).limit(limit).all()
-    return influencers
+    """List all influencers with pagination, optionally with social IDs and video stats (constant number of queries)"""
+    includes = {item.strip() for item in include.split(",") if item.strip()} if include else set()
+    unknown = includes - set(LIST_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))} (allowed: {', '.join(LIST_INCLUDES)})"
+        )
+    
+    query = db.query(Influencer)
+    if "social_ids" in includes:
+        query = query.options(selectinload(Influencer.influencer_ids))
+    influencers = query.offset(skip).limit(limit).all()
+    
+    stats = {}
+    if "stats" in includes and influencers:
+        stats = _video_stats_by_influencer(db, [influencer.eldorado_username for influencer in influencers])
+    
+    results = []
+    for influencer in influencers:
+        item = InfluencerDetailResponse.model_validate(influencer)
+        if "social_ids" in includes:
+            item.social_ids = (
+                InfluencerIdsResponse.model_validate(influencer.influencer_ids) if influencer.influencer_ids
+                else InfluencerIdsResponse(eldorado_username=influencer.eldorado_username)
+            )
+        if "stats" in includes:
+            item.stats = stats.get(influencer.eldorado_username, InfluencerVideoStats())
+        results.append(item)
+    return results
+
+
+def _video_stats_by_influencer(db: Session, usernames: List[str]) -> Dict[str, InfluencerVideoStats]:
+    """Video aggregates for many influencers in one grouped query (influencers without videos are absent)"""
+    rows = db.query(
+        TikTokVideo.eldorado_username,
+        func.count(TikTokVideo.id).label("total_videos"),
+        func.coalesce(func.sum(TikTokVideo.view_count), 0).label("total_views"),
+        func.coalesce(func.sum(TikTokVideo.like_count), 0).label("total_likes"),
+        func.coalesce(func.sum(TikTokVideo.comment_count), 0).label("total_comments"),
+        func.coalesce(func.sum(TikTokVideo.share_count), 0).label("total_shares"),
+        func.avg(TikTokVideo.view_count).label("avg_views"),
+        func.avg(TikTokVideo.like_count).label("avg_likes"),
+        func.avg(
+            (TikTokVideo.like_count + TikTokVideo.comment_count + TikTokVideo.share_count) /
+            func.nullif(TikTokVideo.view_count, 0) * 100
+        ).label("avg_engagement"),
+        func.max(TikTokVideo.view_count).label("best_performance"),
+        func.max(TikTokVideo.published_at).label("last_video_date")
+    ).filter(
+        TikTokVideo.eldorado_username.in_(usernames)
+    ).group_by(TikTokVideo.eldorado_username).all()
+    
+    return {
+        row.eldorado_username: InfluencerVideoStats(
+            total_videos=row.total_videos,
+            total_views=row.total_views,
+            total_likes=row.total_likes,
+            total_comments=row.total_comments,
+            total_shares=row.total_shares,
+            avg_views=round(float(row.avg_views or 0), 2),
+            avg_likes=round(float(row.avg_likes or 0), 2),
+            avg_engagement_rate=round(float(row.avg_engagement or 0), 2),
+            best_performance=row.best_performance or 0,
+            last_video_date=row.last_video_date
+        )
+        for row in rows
+    }
+
+
+def _owner_id(db: Session, owner_name: Optional[str]):
+    """ID of the owner with this name, or 400"""
+    owner = db.query(Owner.id).filter(Owner.name == (owner_name or "").strip().lower()).first()
+    if not owner:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Owner '{owner_name}' not found"
+        )
+    return owner.id
 
 
 @router.post("/", response_model=InfluencerResponse, status_code=status.HTTP_201_CREATED)
@@ -49,7 +138,7 @@ def create_influencer(
         eldorado_username=influencer_data.eldorado_username,
         phone=influencer_data.phone,
         country=influencer_data.country,
-        owner=influencer_data.owner
+        owner_id=_owner_id(db, influencer_data.owner)
     )
     
     db.add(db_influencer)
@@ -68,6 +157,81 @@ def create_influencer(
     return db_influencer
 
 
+@router.post("/bulk", response_model=InfluencerBulkResponse)
+def bulk_create_influencers(
+    request: InfluencerBulkRequest,
+    db: Session = Depends(get_db)
+):
+    """Create (or update) many influencers in one transaction, optionally syncing TikTok IDs and videos afterwards"""
+    if len(request.influencers) > settings.onboarding_max_batch:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.onboarding_max_batch} influencers per request"
+        )
+    
+    onboarding = InfluencerOnboarding()
+    try:
+        result = onboarding.bulk_upsert(db, request.influencers, update_existing=request.update_existing)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}"
+        )
+    
+    # Only influencers written by this request that have a TikTok username
+    to_sync = [
+        data.eldorado_username.strip() for data, outcome in zip(request.influencers, result["results"])
+        if outcome["status"] in ("created", "updated") and data.tiktok_username
+    ]
+    if request.sync and to_sync:
+        onboarding.start_sync_in_background(to_sync)
+    
+    return InfluencerBulkResponse(**result, sync_started=bool(request.sync and to_sync))
+
+
+@router.post("/import", response_model=InfluencerImportResponse)
+def import_influencers_csv(
+    file: UploadFile = File(..., description="CSV with Nome, User El dorado, tiktok @, Pais, Owner, telefone"),
+    update_existing: bool = False,
+    dry_run: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Bulk import influencers from CSV (COPY into staging + set-based merge), with per-row errors"""
+    try:
+        return InfluencerImporter().import_csv(db, file.file, update_existing=update_existing, dry_run=dry_run)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Import failed: {str(e)}"
+        )
+
+
+@router.post("/tiktok-ids/resolve", response_model=TikTokIdResolutionStatus, status_code=status.HTTP_202_ACCEPTED)
+def resolve_tiktok_ids(
+    request: TikTokIdResolveRequest,
+    db: Session = Depends(get_db)
+):
+    """Look up the TikTok ID of every influencer missing one (background, concurrent and rate limited)"""
+    resolver = TikTokIdResolver()
+    if not resolver.start_in_background(retry_failed=request.retry_failed, limit=request.limit):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A TikTok ID resolution run is already in progress"
+        )
+    return {**resolver.status(db), "running": True}
+
+
+@router.get("/tiktok-ids/status", response_model=TikTokIdResolutionStatus)
+def tiktok_id_resolution_status(db: Session = Depends(get_db)):
+    """How many influencers have, lack or failed to get a TikTok ID"""
+    return TikTokIdResolver().status(db)
+
+
 @router.get("/{eldorado_username}", response_model=InfluencerResponse)
 def get_influencer(
     eldorado_username: str,
@@ -105,7 +269,10 @@ def update_influencer(
         )
     
     # Update only provided fields
-    for field, value in influencer_data.dict(exclude_unset=True).items():
+    updates = influencer_data.dict(exclude_unset=True)
+    if "owner" in updates:
+        influencer.owner_id = _owner_id(db, updates.pop("owner"))
+    for field, value in updates.items():
         setattr(influencer, field, value)
     
     db.commit()
@@ -192,6 +359,8 @@ def sync_tiktok_id(
     
     # Update TikTok ID
     influencer_ids.tiktok_id = tiktok_id
+    influencer_ids.tiktok_id_attempts = 0
+    influencer_ids.tiktok_id_error = None
     db.commit()
     
     return {
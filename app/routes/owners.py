@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
 from ..core.database import get_db
@@ -6,8 +7,12 @@ from ..models import Owner
 from ..schemas import (
     OwnerCreate,
     OwnerUpdate, 
-    OwnerResponse
+    OwnerResponse,
+    OwnerStatsResponse,
+    OwnerLeaderboardResponse
 )
+from ..services import OwnerStats
+from ..services.owner_stats import SORT_FIELDS
 
 router = APIRouter(prefix="/api/v1/owners", tags=["owners"])
 
@@ -30,18 +35,21 @@ def create_owner(
 ):
     """Create new owner"""
     
+    # Names are stored lowercase: influencers, imports and the assistant look them up that way
+    name = owner_data.name.strip().lower()
+    
     # Check if name already exists
-    existing = db.query(Owner).filter(Owner.name == owner_data.name).first()
+    existing = db.query(Owner).filter(func.lower(Owner.name) == name).first()
     
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Owner with name '{owner_data.name}' already exists"
+            detail=f"Owner with name '{name}' already exists"
         )
     
     # Create owner
     db_owner = Owner(
-        name=owner_data.name,
+        name=name,
         display_name=owner_data.display_name,
         email=owner_data.email,
         is_active=owner_data.is_active
@@ -54,13 +62,49 @@ def create_owner(
     return db_owner
 
 
+@router.get("/leaderboard", response_model=OwnerLeaderboardResponse)
+def get_owner_leaderboard(
+    days: int = Query(30, ge=1, le=365, description="Length of the period compared with the one before it"),
+    sort_by: str = Query("views", description=f"One of: {', '.join(SORT_FIELDS)}"),
+    db: Session = Depends(get_db)
+):
+    """Rank owners by their influencers' video performance (one grouped query)"""
+    try:
+        owners = OwnerStats(days=days).leaderboard(db, sort_by=sort_by)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return OwnerLeaderboardResponse(period_days=days, sort_by=sort_by, owners=owners)
+
+
+@router.get("/{owner_name}/stats", response_model=OwnerStatsResponse)
+def get_owner_stats(
+    owner_name: str,
+    days: int = Query(30, ge=1, le=365, description="Length of the period compared with the one before it"),
+    db: Session = Depends(get_db)
+):
+    """Influencers, videos, views and engagement of an owner, with the change over the last period"""
+    owner = db.query(Owner).filter(Owner.name == owner_name.strip().lower()).first()
+    
+    if not owner:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Owner '{owner_name}' not found"
+        )
+    
+    return OwnerStats(days=days).stats(db, owner.name)
+
+
 @router.get("/{owner_name}", response_model=OwnerResponse)
 def get_owner(
     owner_name: str,
     db: Session = Depends(get_db)
 ):
     """Get owner by name"""
-    owner = db.query(Owner).filter(Owner.name == owner_name).first()
+    owner = db.query(Owner).filter(Owner.name == owner_name.strip().lower()).first()
     
     if not owner:
         raise HTTPException(
@@ -78,7 +122,7 @@ def update_owner(
     db: Session = Depends(get_db)
 ):
     """Update owner data"""
-    owner = db.query(Owner).filter(Owner.name == owner_name).first()
+    owner = db.query(Owner).filter(Owner.name == owner_name.strip().lower()).first()
     
     if not owner:
         raise HTTPException(
@@ -86,8 +130,24 @@ def update_owner(
             detail=f"Owner '{owner_name}' not found"
         )
     
+    updates = owner_data.dict(exclude_unset=True)
+    
+    # Same normalization and duplicate check as create
+    if updates.get("name") is not None:
+        updates["name"] = updates["name"].strip().lower()
+        existing = db.query(Owner).filter(
+            func.lower(Owner.name) == updates["name"],
+            Owner.id != owner.id
+        ).first()
+        
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Owner with name '{updates['name']}' already exists"
+            )
+    
     # Update only provided fields
-    for field, value in owner_data.dict(exclude_unset=True).items():
+    for field, value in updates.items():
         setattr(owner, field, value)
     
     db.commit()
@@ -102,7 +162,7 @@ def deactivate_owner(
     db: Session = Depends(get_db)
 ):
     """Deactivate owner (soft delete)"""
-    owner = db.query(Owner).filter(Owner.name == owner_name).first()
+    owner = db.query(Owner).filter(Owner.name == owner_name.strip().lower()).first()
     
     if not owner:
         raise HTTPException(
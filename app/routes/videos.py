@@ -1,11 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
-from typing import List
+from typing import List, Optional
+from uuid import UUID
+from ..core.config import settings
 from ..core.database import get_db
-from ..models import Influencer, InfluencerIds, TikTokVideo
-from ..schemas import TikTokVideoResponse, VideoSyncResponse, VideoTranscriptionRequest, VideoTranscriptionResponse
-from ..services import ScrapTikService, OpenAIService, URLExpander
+from ..models import Influencer, InfluencerIds, TikTokVideo, TranscriptionJob
+from ..schemas import (
+    TikTokVideoResponse,
+    VideoSyncResponse,
+    VideoTranscriptionRequest,
+    VideoTranscriptionResponse,
+    TranscriptionJobResponse,
+    TranscriptionSearchResult,
+    TranscriptionIndexResponse,
+    TranscriptionBackfillRequest,
+    TranscriptionBackfillRunResponse,
+    VideoResolveRequest,
+    VideoResolveResponse
+)
+from ..services import (
+    ScrapTikService,
+    URLExpander,
+    TranscriptIndex,
+    TranscriptionService,
+    TransientTranscriptionError,
+    TranscriptionJobQueue,
+    TranscriptionBackfill,
+    VideoSync,
+    VideoUrlResolver
+)
 
 router = APIRouter(prefix="/api/v1/videos", tags=["videos"])
 
@@ -81,51 +105,9 @@ def sync_all_influencers_videos(
             scraptik = ScrapTikService()
             sponsored_videos = scraptik.get_eldorado_videos(influencer_ids.tiktok_username)
             
-            new_videos = 0
-            updated_videos = 0
-            errors = []
-            
-            for video_data in sponsored_videos:
-                try:
-                    existing_video = db.query(TikTokVideo).filter(
-                        TikTokVideo.tiktok_video_id == video_data['tiktok_video_id']
-                    ).first()
-                    
-                    if existing_video:
-                        # Update metrics
-                        existing_video.view_count = video_data['view_count']
-                        existing_video.like_count = video_data['like_count']
-                        existing_video.comment_count = video_data['comment_count']
-                        existing_video.share_count = video_data['share_count']
-                        
-                        # Always update URLs (they might have changed)
-                        existing_video.public_video_url = video_data['public_video_url']
-                        existing_video.watermark_free_url = video_data['watermark_free_url']
-                        existing_video.watermark_free_url_alt1 = video_data.get('watermark_free_url_alt1')
-                        existing_video.watermark_free_url_alt2 = video_data.get('watermark_free_url_alt2')
-                        
-                        updated_videos += 1
-                    else:
-                        new_video = TikTokVideo(
-                            eldorado_username=influencer.eldorado_username,
-                            tiktok_username=influencer_ids.tiktok_username,
-                            tiktok_video_id=video_data['tiktok_video_id'],
-                            description=video_data['description'],
-                            view_count=video_data['view_count'],
-                            like_count=video_data['like_count'],
-                            comment_count=video_data['comment_count'],
-                            share_count=video_data['share_count'],
-                            public_video_url=video_data['public_video_url'],
-                            watermark_free_url=video_data['watermark_free_url'],
-                            watermark_free_url_alt1=video_data.get('watermark_free_url_alt1'),
-                            watermark_free_url_alt2=video_data.get('watermark_free_url_alt2'),
-                            published_at=video_data['published_at']
-                        )
-                        db.add(new_video)
-                        new_videos += 1
-                        
-                except Exception as e:
-                    errors.append(f"Video {video_data.get('tiktok_video_id', 'unknown')}: {str(e)}")
+            new_videos, updated_videos, errors = VideoSync().upsert_videos(
+                db, influencer.eldorado_username, influencer_ids.tiktok_username, sponsored_videos
+            )
             
             db.commit()
             
@@ -192,53 +174,9 @@ def sync_influencer_videos(
     scraptik = ScrapTikService()
     sponsored_videos = scraptik.get_eldorado_videos(influencer_ids.tiktok_username)
     
-    new_videos = 0
-    updated_videos = 0
-    errors = []
-    
-    for video_data in sponsored_videos:
-        try:
-            # Check if video already exists
-            existing_video = db.query(TikTokVideo).filter(
-                TikTokVideo.tiktok_video_id == video_data['tiktok_video_id']
-            ).first()
-            
-            if existing_video:
-                # UPDATE existing video metrics
-                existing_video.view_count = video_data['view_count']
-                existing_video.like_count = video_data['like_count']
-                existing_video.comment_count = video_data['comment_count']
-                existing_video.share_count = video_data['share_count']
-                
-                # Always update URLs (they might have changed)
-                existing_video.public_video_url = video_data['public_video_url']
-                existing_video.watermark_free_url = video_data['watermark_free_url']
-                existing_video.watermark_free_url_alt1 = video_data.get('watermark_free_url_alt1')
-                existing_video.watermark_free_url_alt2 = video_data.get('watermark_free_url_alt2')
-                
-                updated_videos += 1
-            else:
-                # INSERT new sponsored video
-                new_video = TikTokVideo(
-                    eldorado_username=eldorado_username,
-                    tiktok_username=influencer_ids.tiktok_username,
-                    tiktok_video_id=video_data['tiktok_video_id'],
-                    description=video_data['description'],
-                    view_count=video_data['view_count'],
-                    like_count=video_data['like_count'],
-                    comment_count=video_data['comment_count'],
-                    share_count=video_data['share_count'],
-                    public_video_url=video_data['public_video_url'],
-                    watermark_free_url=video_data['watermark_free_url'],
-                    watermark_free_url_alt1=video_data.get('watermark_free_url_alt1'),
-                    watermark_free_url_alt2=video_data.get('watermark_free_url_alt2'),
-                    published_at=video_data['published_at']
-                )
-                db.add(new_video)
-                new_videos += 1
-                
-        except Exception as e:
-            errors.append(f"Error processing video {video_data.get('tiktok_video_id', 'unknown')}: {str(e)}")
+    new_videos, updated_videos, errors = VideoSync().upsert_videos(
+        db, eldorado_username, influencer_ids.tiktok_username, sponsored_videos
+    )
     
     try:
         db.commit()
@@ -264,185 +202,195 @@ def transcribe_video_from_url(
     request: VideoTranscriptionRequest,
     db: Session = Depends(get_db)
 ):
-    """Transcribe TikTok video from URL using OpenAI Whisper"""
-    
+    """Transcribe TikTok video from URL using OpenAI Whisper (blocks until done, see /transcribe/jobs)"""
     try:
-        # Extract video ID from TikTok URL
-        tiktok_url = request.tiktok_url.strip()
-        
-        # Basic URL validation
-        if not tiktok_url or not ("tiktok.com" in tiktok_url or "vm.tiktok.com" in tiktok_url):
-            return VideoTranscriptionResponse(
-                success=False,
-                message="URL inválida. Forneça uma URL válida do TikTok."
-            )
-        
-        # Expand URL if it's a short URL and extract video ID
-        print(f"[DEBUG] Original URL: {tiktok_url}")
-        
-        # Expand short URLs to full URLs
-        expanded_url = URLExpander.expand_tiktok_url(tiktok_url)
-        print(f"[DEBUG] Expanded URL: {expanded_url}")
-        
-        # Extract video ID from expanded URL
-        video_id = URLExpander.extract_video_id_from_url(expanded_url)
-        print(f"[DEBUG] Extracted video ID: {video_id}")
-        
-        if not video_id:
-            return VideoTranscriptionResponse(
-                success=False,
-                message="Não foi possível extrair o ID do vídeo da URL fornecida. Tente usar uma URL válida do TikTok."
-            )
-        
-        # Search for video in database using public_video_url
-        video = db.query(TikTokVideo).filter(
-            TikTokVideo.public_video_url.contains(video_id)
-        ).first()
-        
-        if not video:
-            # Try searching by tiktok_video_id as fallback
-            video = db.query(TikTokVideo).filter(
-                TikTokVideo.tiktok_video_id == video_id
-            ).first()
-        
-        # If still not found and we have a short URL, try broader search
-        if not video and "vm.tiktok.com/" in tiktok_url:
-            short_id = tiktok_url.split("vm.tiktok.com/")[-1].rstrip("/").split("?")[0]
-            # Try to find video by searching for the short ID in any URL field
-            video = db.query(TikTokVideo).filter(
-                TikTokVideo.public_video_url.contains(short_id)
-            ).first()
-        
-        if not video:
-            return VideoTranscriptionResponse(
-                success=True,
-                message="Este vídeo não é de um influenciador cadastrado.",
-                video_found=False,
-                is_influencer_video=False
-            )
-        
-        # Video found - ALWAYS sync videos first to get fresh URLs
-        print(f"[DEBUG] Sincronizando vídeos para {video.eldorado_username} antes da transcrição...")
-        try:
-            scraptik = ScrapTikService()
-            sponsored_videos = scraptik.get_eldorado_videos(video.tiktok_username)
-            
-            # Update the specific video with fresh URLs if found
-            for video_data in sponsored_videos:
-                if video_data['tiktok_video_id'] == video.tiktok_video_id:
-                    video.watermark_free_url = video_data['watermark_free_url']
-                    video.watermark_free_url_alt1 = video_data.get('watermark_free_url_alt1')
-                    video.watermark_free_url_alt2 = video_data.get('watermark_free_url_alt2')
-                    db.commit()
-                    print(f"[DEBUG] URLs atualizados para vídeo {video.tiktok_video_id}")
-                    break
-        except Exception as sync_error:
-            print(f"[DEBUG] Erro na sincronização prévia: {sync_error}")
-            # Continue mesmo se a sincronização falhar
-        
-        # Refresh video object to get updated URLs
-        db.refresh(video)
-        
-        if not video.watermark_free_url:
-            return VideoTranscriptionResponse(
-                success=False,
-                message="URL do vídeo sem marca d'água não disponível mesmo após sincronização.",
-                video_found=True,
-                is_influencer_video=True,
-                eldorado_username=video.eldorado_username
-            )
-        
-        # Check if transcription already exists
-        if video.transcription:
-            return VideoTranscriptionResponse(
-                success=True,
-                message="Transcrição já existe (cache)!",
-                video_found=True,
-                is_influencer_video=True,
-                eldorado_username=video.eldorado_username,
-                transcription=video.transcription,
-                video_info=TikTokVideoResponse.model_validate(video)
-            )
-        
-        # Transcribe video using OpenAI
-        openai_service = OpenAIService()
-        
-        try:
-            # Try multiple URLs in cascata: primary, alt1, alt2
-            transcription = None
-            urls_to_try = []
-            
-            # Build list of URLs to try in order
-            if video.watermark_free_url:
-                urls_to_try.append(("primary", video.watermark_free_url))
-            if hasattr(video, 'watermark_free_url_alt1') and video.watermark_free_url_alt1:
-                urls_to_try.append(("alt1", video.watermark_free_url_alt1))
-            if hasattr(video, 'watermark_free_url_alt2') and video.watermark_free_url_alt2:
-                urls_to_try.append(("alt2", video.watermark_free_url_alt2))
-            
-            print(f"[DEBUG] Testando {len(urls_to_try)} URLs em cascata...")
-            
-            last_error = None
-            errors_by_url = {}
-            
-            for url_type, video_url in urls_to_try:
-                try:
-                    print(f"[DEBUG] Tentando URL {url_type}: {video_url[:50]}...")
-                    transcription = openai_service.transcribe_from_url(video_url)
-                    print(f"[DEBUG] SUCESSO com URL {url_type}!")
-                    break  # Success, exit loop
-                    
-                except Exception as url_error:
-                    error_msg = str(url_error)
-                    print(f"[DEBUG] FALHA com URL {url_type}: {error_msg}")
-                    errors_by_url[url_type] = error_msg
-                    last_error = url_error
-                    continue  # Try next URL
-            
-            # If we get here without transcription, ALL URLs failed
-            if transcription is None:
-                # Create detailed error message showing all failed attempts
-                error_details = []
-                for url_type, error_msg in errors_by_url.items():
-                    error_details.append(f"{url_type}: {error_msg}")
-                
-                detailed_error = f"Todos os {len(urls_to_try)} URLs falharam:\n" + "\n".join(error_details)
-                print(f"[DEBUG] {detailed_error}")
-                
-                # Return comprehensive error response
-                return VideoTranscriptionResponse(
-                    success=False,
-                    message=f"Não foi possível transcrever o vídeo. Todos os URLs falharam mesmo após sincronização. Últimos erros: {'; '.join([f'{k}={v}' for k, v in errors_by_url.items()])}",
-                    video_found=True,
-                    is_influencer_video=True,
-                    eldorado_username=video.eldorado_username
-                )
-            
-            # Save transcription to database
-            video.transcription = transcription
-            db.commit()
-            
-            return VideoTranscriptionResponse(
-                success=True,
-                message="Transcrição realizada com sucesso!",
-                video_found=True,
-                is_influencer_video=True,
-                eldorado_username=video.eldorado_username,
-                transcription=transcription,
-                video_info=TikTokVideoResponse.model_validate(video)
-            )
-            
-        except Exception as e:
-            return VideoTranscriptionResponse(
-                success=False,
-                message=f"Erro na transcrição: {str(e)}",
-                video_found=True,
-                is_influencer_video=True,
-                eldorado_username=video.eldorado_username
-            )
-    
+        return TranscriptionService().transcribe(db, request.tiktok_url)
+    except TransientTranscriptionError as e:
+        return e.response
     except Exception as e:
         return VideoTranscriptionResponse(
             success=False,
             message=f"Erro interno: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/resolve", response_model=VideoResolveResponse)
+def resolve_video_urls(
+    request: VideoResolveRequest,
+    db: Session = Depends(get_db)
+):
+    """Check which of many TikTok links belong to registered influencers (optionally queueing their transcriptions)"""
+    if len(request.urls) > settings.url_resolve_max_urls:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Máximo de {settings.url_resolve_max_urls} URLs por requisição"
+        )
+    
+    results = VideoUrlResolver().resolve(db, request.urls, request.enqueue_transcriptions)
+    return VideoResolveResponse(
+        total=len(results),
+        matched=sum(1 for result in results if result["is_influencer_video"]),
+        jobs_enqueued=len({result["job_id"] for result in results if result["job_id"]}),
+        results=results
+    )
+
+
+def _job_response(job: TranscriptionJob) -> TranscriptionJobResponse:
+    return TranscriptionJobResponse(
+        job_id=job.id,
+        status=job.status,
+        step=job.step,
+        attempts=job.attempts,
+        error=job.error,
+        result=VideoTranscriptionResponse.model_validate_json(job.result) if job.result else None,
+        created_at=job.created_at,
+        finished_at=job.finished_at
+    )
+
+
+@router.post("/transcribe/jobs", response_model=TranscriptionJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_transcription_job(
+    request: VideoTranscriptionRequest,
+    db: Session = Depends(get_db)
+):
+    """Queue a transcription and return immediately with the job id to poll"""
+    job = TranscriptionJobQueue().submit(db, request.tiktok_url)
+    return _job_response(job)
+
+
+@router.get("/transcribe/jobs/{job_id}", response_model=TranscriptionJobResponse)
+def get_transcription_job(
+    job_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Status of a transcription job, with the result once it has finished"""
+    job = TranscriptionJobQueue().get(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job de transcrição não encontrado"
+        )
+    return _job_response(job)
+
+@router.post("/transcriptions/index", response_model=TranscriptionIndexResponse)
+def index_transcriptions(
+    limit: int = Query(200, ge=1, le=2000),
+    db: Session = Depends(get_db)
+):
+    """Embed transcriptions that are not indexed yet (or changed since indexing)"""
+    try:
+        result = TranscriptIndex().index_pending(db, limit=limit)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Indexing error: {str(e)}"
+        )
+    
+    return TranscriptionIndexResponse(success=True, **result)
+
+
+@router.get("/transcriptions/search", response_model=List[TranscriptionSearchResult])
+def search_transcriptions(
+    q: str = Query(..., min_length=1, description="Search query"),
+    k: int = Query(5, ge=1, le=50),
+    min_score: Optional[float] = Query(None, ge=-1, le=1, description="Minimum cosine similarity (default SEMANTIC_SEARCH_MIN_SCORE)"),
+    db: Session = Depends(get_db)
+):
+    """Semantic search over video transcriptions (top-k videos by similarity)"""
+    try:
+        matches = TranscriptIndex().search(db, q, k=k, min_score=min_score)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Search error: {str(e)}"
+        )
+    
+    videos = {
+        video.id: video for video in db.query(TikTokVideo).filter(
+            TikTokVideo.id.in_([match["video_id"] for match in matches])
+        ).all()
+    } if matches else {}
+    
+    return [
+        TranscriptionSearchResult(
+            eldorado_username=videos[match["video_id"]].eldorado_username,
+            tiktok_video_id=videos[match["video_id"]].tiktok_video_id,
+            chunk_index=match["chunk_index"],
+            content=match["content"],
+            score=match["score"],
+            public_video_url=videos[match["video_id"]].public_video_url
+        )
+        for match in matches if match["video_id"] in videos
+    ]
+
+
+@router.post("/transcriptions/backfill", response_model=TranscriptionBackfillRunResponse, status_code=status.HTTP_202_ACCEPTED)
+def start_transcription_backfill(
+    request: TranscriptionBackfillRequest,
+    db: Session = Depends(get_db)
+):
+    """Transcribe untranscribed videos in the background, most-viewed first, within a minutes budget"""
+    backfill = TranscriptionBackfill()
+    
+    if request.resume_run_id:
+        run = backfill.get_run(db, request.resume_run_id)
+        if not run:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Execução de backfill não encontrada"
+            )
+        # A run left running by a dead process (stale heartbeat) can be taken over
+        if not backfill.take_over(db, run.id, request.budget_minutes, request.max_videos):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Esta execução de backfill ainda está em andamento"
+            )
+        db.refresh(run)
+    else:
+        run = backfill.create_run(db, request.budget_minutes, request.max_videos)
+    
+    backfill.start_in_background(run.id)
+    return backfill.summary(db, run)
+
+
+@router.get("/transcriptions/backfill/{run_id}", response_model=TranscriptionBackfillRunResponse)
+def get_transcription_backfill(
+    run_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Progress of a backfill run"""
+    backfill = TranscriptionBackfill()
+    run = backfill.get_run(db, run_id)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Execução de backfill não encontrada"
+        )
+    return backfill.summary(db, run)
+
+
+@router.post("/transcriptions/backfill/{run_id}/stop", response_model=TranscriptionBackfillRunResponse)
+def stop_transcription_backfill(
+    run_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Stop a backfill run after the videos in progress finish (resume it later with resume_run_id)"""
+    backfill = TranscriptionBackfill()
+    run = backfill.get_run(db, run_id)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Execução de backfill não encontrada"
+        )
+    if run.status == "running":
+        # Nobody is left to notice "stopping" when the run's process died
+        run.status = "stopping" if backfill.is_alive(run) else "stopped"
+        db.commit()
+    return backfill.summary(db, run)
+
+
+@router.get("/short-links/stats")
+def get_short_link_cache_stats():
+    """Short link expansion cache: memory/DB hits and network resolutions (since the process started)"""
+    return URLExpander.short_links.stats()
@@ -1,20 +1,9 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
-from enum import Enum
 from uuid import UUID
 
 
-class OwnerType(str, Enum):
-    alejandra = "alejandra"
-    alessandro = "alessandro"
-    bianca = "bianca"
-    camilo = "camilo"
-    jesus = "jesus"
-    julia = "julia"
-    samuel = "samuel"
-
-
 # Owner Schemas
 class OwnerBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=50)
@@ -28,6 +17,7 @@ class OwnerCreate(OwnerBase):
 
 
 class OwnerUpdate(BaseModel):
+    name: Optional[str] = Field(None, min_length=1, max_length=50)
     display_name: Optional[str] = Field(None, max_length=100)
     email: Optional[str] = Field(None, max_length=255)
     is_active: Optional[bool] = None
@@ -42,13 +32,47 @@ class OwnerResponse(OwnerBase):
         from_attributes = True
 
 
+class OwnerPeriodStats(BaseModel):
+    videos: int
+    views: int
+    engagement_rate: float
+    posting_influencers: int  # Influencers who published in the period
+
+
+class OwnerStatsResponse(BaseModel):
+    owner: str
+    influencers: int
+    active_influencers: int
+    total_videos: int
+    total_views: int
+    total_likes: int
+    total_comments: int
+    total_shares: int
+    engagement_rate: float  # (likes + comments + shares) / views * 100
+    period_days: int
+    period: OwnerPeriodStats  # Last period_days days (by published_at)
+    previous_period: OwnerPeriodStats  # The period_days days before that
+    videos_change: int
+    views_change_pct: Optional[float] = None  # None when the previous period had no views
+
+
+class OwnerLeaderboardEntry(OwnerStatsResponse):
+    rank: int
+
+
+class OwnerLeaderboardResponse(BaseModel):
+    period_days: int
+    sort_by: str
+    owners: List[OwnerLeaderboardEntry]
+
+
 # Influencer Schemas
 class InfluencerBase(BaseModel):
     first_name: str = Field(..., min_length=1, max_length=255)
     eldorado_username: str = Field(..., min_length=1, max_length=100)
     phone: Optional[str] = Field(None, max_length=20)
     country: Optional[str] = Field(None, max_length=100)
-    owner: OwnerType
+    owner: str = Field(..., min_length=1, max_length=50, description="Name of an existing owner (owners table)")
 
 
 class InfluencerCreate(InfluencerBase):
@@ -59,7 +83,7 @@ class InfluencerUpdate(BaseModel):
     first_name: Optional[str] = Field(None, min_length=1, max_length=255)
     phone: Optional[str] = Field(None, max_length=20)
     country: Optional[str] = Field(None, max_length=100)
-    owner: Optional[OwnerType] = None
+    owner: Optional[str] = Field(None, min_length=1, max_length=50)
     status: Optional[str] = Field(None, max_length=20)
 
 
@@ -73,11 +97,66 @@ class InfluencerResponse(InfluencerBase):
         from_attributes = True
 
 
+class InfluencerBulkRequest(BaseModel):
+    influencers: List[InfluencerCreate] = Field(..., min_length=1)
+    update_existing: bool = Field(False, description="Overwrite influencers that already exist")
+    sync: bool = Field(False, description="Then look up TikTok IDs and sync videos for the batch (background)")
+
+
+class InfluencerBulkResult(BaseModel):
+    eldorado_username: str
+    status: str  # created | updated | existing | invalid
+    error: Optional[str] = None
+
+
+class InfluencerBulkResponse(BaseModel):
+    created: int
+    updated: int
+    skipped_existing: int
+    invalid: int
+    social_ids_upserted: int
+    sync_started: bool
+    results: List[InfluencerBulkResult]
+
+
+class InfluencerImportError(BaseModel):
+    row: int  # Line of the CSV file the record starts on (header is line 1)
+    eldorado_username: Optional[str] = None
+    error: str
+
+
+class InfluencerImportResponse(BaseModel):
+    total_rows: int
+    inserted: int
+    updated: int
+    skipped_existing: int
+    invalid: int
+    social_ids_upserted: int
+    dry_run: bool
+    duration_ms: int
+    errors: List[InfluencerImportError]
+
+
+class TikTokIdResolveRequest(BaseModel):
+    retry_failed: bool = Field(False, description="Also retry influencers that reached TIKTOK_ID_MAX_ATTEMPTS")
+    limit: Optional[int] = Field(None, gt=0, description="Resolve at most this many influencers")
+
+
+class TikTokIdResolutionStatus(BaseModel):
+    running: bool
+    resolved: int  # TikTok username and ID
+    pending: int  # No ID yet, will be tried
+    given_up: int  # No ID after max_attempts lookups
+    with_errors: int  # Last lookup failed
+    max_attempts: int
+
+
 # InfluencerIds Schemas
 class InfluencerIdsResponse(BaseModel):
     eldorado_username: str
     tiktok_username: Optional[str] = None
     tiktok_id: Optional[str] = None
+    tiktok_id_error: Optional[str] = None
     instagram_username: Optional[str] = None
     instagram_id: Optional[str] = None
     facebook_username: Optional[str] = None
@@ -89,6 +168,25 @@ class InfluencerIdsResponse(BaseModel):
         from_attributes = True
 
 
+class InfluencerVideoStats(BaseModel):
+    total_videos: int = 0
+    total_views: int = 0
+    total_likes: int = 0
+    total_comments: int = 0
+    total_shares: int = 0
+    avg_views: float = 0.0
+    avg_likes: float = 0.0
+    avg_engagement_rate: float = 0.0
+    best_performance: int = 0  # Most views on one video
+    last_video_date: Optional[datetime] = None
+
+
+class InfluencerDetailResponse(InfluencerResponse):
+    """InfluencerResponse plus what `include=` asked for (null otherwise)"""
+    social_ids: Optional[InfluencerIdsResponse] = None
+    stats: Optional[InfluencerVideoStats] = None
+
+
 # TikTok Video Schemas
 class TikTokVideoResponse(BaseModel):
     id: UUID
@@ -162,4 +260,74 @@ class VideoTranscriptionResponse(BaseModel):
     is_influencer_video: Optional[bool] = None
     eldorado_username: Optional[str] = None
     transcription: Optional[str] = None
-    video_info: Optional[TikTokVideoResponse] = None
\ No newline at end of file
+    video_info: Optional[TikTokVideoResponse] = None
+
+
+class TranscriptionJobResponse(BaseModel):
+    job_id: UUID
+    status: str  # queued | running | succeeded | failed
+    step: Optional[str] = None
+    attempts: int
+    error: Optional[str] = None
+    result: Optional[VideoTranscriptionResponse] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class VideoResolveRequest(BaseModel):
+    urls: List[str] = Field(..., min_length=1, description="TikTok video URLs (short or full)")
+    enqueue_transcriptions: bool = Field(False, description="Queue a transcription job for matched videos without one")
+
+
+class VideoResolveResult(BaseModel):
+    url: str
+    tiktok_video_id: Optional[str] = None
+    is_influencer_video: bool
+    eldorado_username: Optional[str] = None
+    has_transcription: bool
+    job_id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class VideoResolveResponse(BaseModel):
+    total: int
+    matched: int
+    jobs_enqueued: int
+    results: List[VideoResolveResult]
+
+
+# Transcription Search Schemas
+class TranscriptionSearchResult(BaseModel):
+    eldorado_username: str
+    tiktok_video_id: str
+    chunk_index: int
+    content: str
+    score: float
+    public_video_url: Optional[str] = None
+
+
+class TranscriptionIndexResponse(BaseModel):
+    success: bool
+    videos_indexed: int
+    chunks_indexed: int
+    remaining: int
+
+
+class TranscriptionBackfillRequest(BaseModel):
+    budget_minutes: Optional[float] = Field(None, gt=0, description="Audio minutes sent to Whisper (default BACKFILL_BUDGET_MINUTES)")
+    max_videos: Optional[int] = Field(None, gt=0)
+    resume_run_id: Optional[UUID] = Field(None, description="Continue a stopped run with its remaining budget")
+
+
+class TranscriptionBackfillRunResponse(BaseModel):
+    run_id: UUID
+    status: str  # running | stopping | completed | budget_exhausted | stopped | failed
+    budget_minutes: float
+    audio_minutes: float
+    max_videos: Optional[int] = None
+    videos_transcribed: int
+    videos_failed: int
+    last_error: Optional[str] = None
+    remaining_videos: int
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
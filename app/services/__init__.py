@@ -1,5 +1,32 @@
 from .scraptik import ScrapTikService
 from .openai_service import OpenAIService
 from .url_expander import URLExpander
+from .video_url_index import VideoUrlIndex
+from .video_sync import VideoSync
+from .transcript_index import TranscriptIndex
+from .transcription_service import TranscriptionService, TransientTranscriptionError
+from .transcription_jobs import TranscriptionJobQueue
+from .transcription_backfill import TranscriptionBackfill
+from .video_url_resolver import VideoUrlResolver
+from .influencer_import import InfluencerImporter
+from .tiktok_id_resolver import TikTokIdResolver
+from .influencer_onboarding import InfluencerOnboarding
+from .owner_stats import OwnerStats
 
-__all__ = ["ScrapTikService", "OpenAIService", "URLExpander"]
\ No newline at end of file
+__all__ = [
+    "ScrapTikService",
+    "OpenAIService",
+    "URLExpander",
+    "VideoUrlIndex",
+    "VideoSync",
+    "TranscriptIndex",
+    "TranscriptionService",
+    "TransientTranscriptionError",
+    "TranscriptionJobQueue",
+    "TranscriptionBackfill",
+    "VideoUrlResolver",
+    "InfluencerImporter",
+    "TikTokIdResolver",
+    "InfluencerOnboarding",
+    "OwnerStats"
+]
\ No newline at end of file
@@ -1,19 +1,37 @@
-from openai import OpenAI
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
 from ..core.config import settings
 from ..models import Influencer, TikTokVideo, Owner, InfluencerIds
 from sqlalchemy import func, desc
 from datetime import datetime, timedelta
-import json
+from uuid import UUID
+import time
+from .context_builder import PromptContextBuilder, TokenCounter, UsageTracker
+from .answer_cache import AnswerCache
+from .data_version import DataVersion
+from .transcript_index import TranscriptIndex
+from .chat_sessions import ChatSessionManager
+from .owner_stats import OwnerStats
+from .openai_client import get_openai_client
 
 
 class ElDoradoAIAssistant:
     """AI Assistant com contexto da El Dorado e acesso aos dados dos influenciadores"""
     
     def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
         self.company_context = self._get_company_context()
+        self.token_counter = TokenCounter(settings.ai_model)
+        self.usage = UsageTracker()
+        self.answer_cache = AnswerCache(
+            max_entries=settings.ai_cache_max_entries,
+            ttl_seconds=settings.ai_cache_ttl_seconds,
+            similarity=settings.ai_cache_similarity
+        )
+        self.sessions = ChatSessionManager(self.usage)
+    
+    @property
+    def client(self):
+        return get_openai_client()
     
     def _get_company_context(self) -> str:
         """Contexto base da empresa El Dorado"""
@@ -67,10 +85,11 @@ class ElDoradoAIAssistant:
             
             # Influenciadores por owner
             owners_stats = db.query(
-                Influencer.owner, 
+                Owner.name, 
                 func.count(Influencer.id).label('count')
-            ).filter(Influencer.status == "active")\
-             .group_by(Influencer.owner)\
+            ).join(Influencer, Influencer.owner_id == Owner.id)\
+             .filter(Influencer.status == "active")\
+             .group_by(Owner.id, Owner.name)\
              .all()
             
             return {
@@ -87,7 +106,7 @@ class ElDoradoAIAssistant:
                     } for video in top_videos
                 ],
                 "owners_distribution": [
-                    {"owner": owner.value, "count": count} 
+                    {"owner": owner, "count": count} 
                     for owner, count in owners_stats
                 ]
             }
@@ -97,13 +116,14 @@ class ElDoradoAIAssistant:
     def _search_influencers(self, db: Session, query_terms: List[str]) -> List[Dict]:
         """Buscar influenciadores baseado em termos de pesquisa"""
         try:
-            query = db.query(Influencer).filter(Influencer.status == "active")
+            query = db.query(Influencer).join(Owner, Influencer.owner_id == Owner.id)\
+                .filter(Influencer.status == "active")
             
             for term in query_terms:
                 query = query.filter(
                     (Influencer.first_name.ilike(f"%{term}%")) |
                     (Influencer.eldorado_username.ilike(f"%{term}%")) |
-                    (Influencer.owner == term.lower())
+                    (Owner.name == term.lower())
                 )
             
             influencers = query.limit(10).all()
@@ -121,7 +141,7 @@ class ElDoradoAIAssistant:
                 result.append({
                     "eldorado_username": inf.eldorado_username,
                     "first_name": inf.first_name,
-                    "owner": inf.owner.value,
+                    "owner": inf.owner,
                     "country": inf.country,
                     "total_videos": video_stats.total_videos or 0,
                     "avg_likes": round(video_stats.avg_likes or 0, 1),
@@ -176,42 +196,74 @@ class ElDoradoAIAssistant:
         except Exception as e:
             return [{"error": f"Erro na busca de transcrições: {str(e)}"}]
     
+    def _semantic_search_transcriptions(self, db: Session, question: str, k: int = 5) -> List[Dict]:
+        """Buscar trechos de transcrições semanticamente próximos da pergunta"""
+        matches = TranscriptIndex().search(db, question, k=k)
+        if not matches:
+            return []
+        
+        videos = {
+            video.id: video for video in db.query(TikTokVideo).filter(
+                TikTokVideo.id.in_([match["video_id"] for match in matches])
+            ).all()
+        }
+        
+        result = []
+        for match in matches:
+            video = videos.get(match["video_id"])
+            if not video:
+                continue
+            result.append({
+                "eldorado_username": video.eldorado_username,
+                "tiktok_video_id": video.tiktok_video_id,
+                "trecho_transcricao": match["content"],
+                "similaridade": match["score"],
+                "likes": video.like_count,
+                "views": video.view_count,
+                "published_at": video.published_at
+            })
+        return result
+    
     def _get_analytics_data(self, db: Session, filters: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Obter dados de analytics com filtros opcionais"""
+        """Obter dados de analytics com filtros opcionais (agregados no SQL, sem carregar os vídeos)"""
         try:
-            query = db.query(TikTokVideo)
-            
-            # Aplicar filtros se fornecidos
-            if filters:
-                if "owner" in filters:
-                    query = query.join(Influencer).filter(Influencer.owner == filters["owner"])
-                if "days" in filters:
-                    date_threshold = datetime.now() - timedelta(days=filters["days"])
-                    query = query.filter(TikTokVideo.created_at >= date_threshold)
-                if "eldorado_username" in filters:
-                    query = query.filter(TikTokVideo.eldorado_username == filters["eldorado_username"])
+            filters = filters or {}
+            conditions = []
+            if "owner" in filters:
+                conditions.append(TikTokVideo.eldorado_username.in_(
+                    db.query(Influencer.eldorado_username).join(Owner, Influencer.owner_id == Owner.id)
+                    .filter(Owner.name == filters["owner"])
+                ))
+            if "days" in filters:
+                date_threshold = datetime.now() - timedelta(days=filters["days"])
+                conditions.append(TikTokVideo.created_at >= date_threshold)
+            if "eldorado_username" in filters:
+                conditions.append(TikTokVideo.eldorado_username == filters["eldorado_username"])
             
-            videos = query.all()
+            totals = db.query(
+                func.count(TikTokVideo.id).label("total_videos"),
+                func.coalesce(func.sum(TikTokVideo.view_count), 0).label("total_views"),
+                func.coalesce(func.sum(TikTokVideo.like_count), 0).label("total_likes"),
+                func.coalesce(func.sum(TikTokVideo.comment_count), 0).label("total_comments"),
+                func.coalesce(func.sum(TikTokVideo.share_count), 0).label("total_shares")
+            ).filter(*conditions).one()
             
-            if not videos:
+            if not totals.total_videos:
                 return {"message": "Nenhum vídeo encontrado com os filtros aplicados"}
             
-            # Calcular métricas
-            total_videos = len(videos)
-            total_views = sum(v.view_count for v in videos)
-            total_likes = sum(v.like_count for v in videos)
-            total_comments = sum(v.comment_count for v in videos)
-            total_shares = sum(v.share_count for v in videos)
-            
-            avg_engagement = ((total_likes + total_comments + total_shares) / total_views * 100) if total_views > 0 else 0
+            total_views = int(totals.total_views)
+            interactions = int(totals.total_likes) + int(totals.total_comments) + int(totals.total_shares)
+            avg_engagement = (interactions / total_views * 100) if total_views > 0 else 0
             
             # Top performers
-            top_videos = sorted(videos, key=lambda x: x.like_count, reverse=True)[:5]
+            top_videos = db.query(TikTokVideo).filter(*conditions).order_by(
+                desc(TikTokVideo.like_count)
+            ).limit(5).all()
             
-            return {
-                "total_videos": total_videos,
+            result = {
+                "total_videos": totals.total_videos,
                 "total_views": total_views,
-                "total_likes": total_likes,
+                "total_likes": int(totals.total_likes),
                 "avg_engagement_rate": round(avg_engagement, 2),
                 "top_videos": [
                     {
@@ -223,29 +275,55 @@ class ElDoradoAIAssistant:
                     } for v in top_videos
                 ]
             }
+            if set(filters) == {"owner"}:
+                # Comparação dos últimos 30 dias com os 30 anteriores
+                owner_stats = OwnerStats(days=30).stats(db, filters["owner"])
+                result.update({
+                    "influencers": owner_stats["influencers"],
+                    "ultimos_30_dias": owner_stats["period"],
+                    "30_dias_anteriores": owner_stats["previous_period"],
+                    "variacao_views_pct": owner_stats["views_change_pct"]
+                })
+            return result
         except Exception as e:
             return {"error": f"Erro ao obter analytics: {str(e)}"}
     
-    def process_user_message(self, message: str, db: Session) -> str:
-        """Processar mensagem do usuário e gerar resposta contextualizada"""
-        try:
-            # Obter contexto atual do banco
-            db_summary = self._get_database_summary(db)
-            
-            # Detectar intenção do usuário e buscar dados relevantes
-            message_lower = message.lower()
-            relevant_data = {}
-            
-            # Se pergunta sobre owner específico
-            owners = ["alejandra", "alessandro", "bianca", "camilo", "jesus", "julia", "samuel"]
-            for owner in owners:
-                if owner in message_lower:
-                    relevant_data["owner_analytics"] = self._get_analytics_data(db, {"owner": owner})
-                    relevant_data["owner_influencers"] = self._search_influencers(db, [owner])
-                    break
-            
-            # Se pergunta sobre transcrições
-            if any(word in message_lower for word in ["transcri", "transcrição", "transcricao", "fala", "disse", "falou"]):
+    def _gather_relevant_data(self, message: str, db: Session, reusable: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Detectar intenção do usuário e buscar dados relevantes
+        
+        Seções já presentes em `reusable` (buscadas em turnos anteriores da sessão,
+        com a mesma versão dos dados) não são buscadas de novo.
+        """
+        message_lower = message.lower()
+        relevant_data = {}
+        
+        def fetch(name, loader):
+            value = reusable[name] if name in reusable else loader()
+            if value:
+                relevant_data[name] = value
+        
+        # Se pergunta sobre owner específico
+        owners = [name for (name,) in db.query(Owner.name).all()]
+        for owner in owners:
+            if owner in message_lower:
+                fetch(f"owner_analytics_{owner}", lambda: self._get_analytics_data(db, {"owner": owner}))
+                fetch(f"owner_influencers_{owner}", lambda: self._search_influencers(db, [owner]))
+                break
+        
+        # Se pergunta sobre transcrições
+        if any(word in message_lower for word in ["transcri", "transcrição", "transcricao", "fala", "disse", "falou", "diz", "mencion"]):
+            def load_transcriptions():
+                # Busca semântica primeiro: encontra trechos mesmo sem a palavra exata
+                try:
+                    semantic_matches = self._semantic_search_transcriptions(db, message)
+                except Exception as e:
+                    db.rollback()
+                    print(f"[DEBUG] Busca semântica indisponível: {e}")
+                    semantic_matches = []
+                if semantic_matches:
+                    return semantic_matches
+                
                 # Extrair possíveis nomes para busca de transcrições
                 words = message.split()
                 search_terms = []
@@ -256,53 +334,155 @@ class ElDoradoAIAssistant:
                 if search_terms:
                     found_transcriptions = self._search_video_transcriptions(db, search_terms)
                     if found_transcriptions and not (len(found_transcriptions) == 1 and found_transcriptions[0].get("error")):
-                        relevant_data["video_transcriptions"] = found_transcriptions
-                        
-            # Se menciona algum influenciador específico
-            elif any(word in message_lower for word in ["influencer", "usuário", "@"]):
+                        return found_transcriptions
+                return None
+            
+            fetch(f"video_transcriptions_{message_lower.strip()}", load_transcriptions)
+                    
+        # Se menciona algum influenciador específico
+        elif any(word in message_lower for word in ["influencer", "usuário", "@"]):
+            def load_influencers():
                 # Extrair possíveis nomes de usuário
                 words = message.split()
                 for word in words:
                     if len(word) > 3:  # Evitar palavras muito curtas
                         found_influencers = self._search_influencers(db, [word])
                         if found_influencers and not found_influencers[0].get("error"):
-                            relevant_data["searched_influencers"] = found_influencers
-                            break
+                            return found_influencers
+                return None
             
-            # Se pergunta sobre período específico
-            if any(word in message_lower for word in ["mes", "mês", "semana", "dia", "último"]):
-                if "semana" in message_lower:
-                    relevant_data["recent_analytics"] = self._get_analytics_data(db, {"days": 7})
-                elif "mes" in message_lower or "mês" in message_lower:
-                    relevant_data["recent_analytics"] = self._get_analytics_data(db, {"days": 30})
+            fetch(f"searched_influencers_{message_lower.strip()}", load_influencers)
+        
+        # Se pergunta sobre período específico
+        if any(word in message_lower for word in ["mes", "mês", "semana", "dia", "último"]):
+            if "semana" in message_lower:
+                fetch("recent_analytics_7_dias", lambda: self._get_analytics_data(db, {"days": 7}))
+            elif "mes" in message_lower or "mês" in message_lower:
+                fetch("recent_analytics_30_dias", lambda: self._get_analytics_data(db, {"days": 30}))
+        
+        return relevant_data
+    
+    def process_user_message(self, message: str, db: Session, session_id: Optional[UUID] = None) -> Dict[str, Any]:
+        """
+        Processar mensagem do usuário e gerar resposta contextualizada
+        
+        Args:
+            message: Pergunta do usuário
+            db: Sessão do banco
+            session_id: Sessão de chat opcional; com ela o histórico e os dados já
+                buscados são reaproveitados nas perguntas seguintes
+        
+        Returns:
+            Dict com a resposta ("response"), o uso de tokens da chamada ("usage")
+            e se a resposta veio do cache ("cached")
+        """
+        chat_session = None
+        if session_id is not None:
+            chat_session = self.sessions.get(db, session_id)
+            if chat_session is None:
+                raise LookupError(f"Sessão '{session_id}' não encontrada")
+        
+        try:
+            data_version = DataVersion.current(db)
+            history = self.sessions.recent_messages(chat_session) if chat_session else []
+            has_history = bool(history or (chat_session and chat_session.summary))
+            
+            # Mesma pergunta com os mesmos dados: responder do cache. Perguntas de
+            # continuação ("e o Samuel?") dependem do histórico e não usam o cache;
+            # perguntas completas (ex.: sugestões) usam mesmo no meio de uma conversa
+            if not has_history or self.answer_cache.is_self_contained(message):
+                cached_response = self.answer_cache.get(message, data_version)
+                if cached_response is not None:
+                    if chat_session:
+                        self.sessions.record_turn(db, chat_session, message, cached_response, data_version,
+                                                  self.sessions.reusable_context(chat_session, data_version))
+                    return {"response": cached_response, "usage": None, "cached": True}
+            
+            # Dados de turnos anteriores continuam válidos se a versão dos dados não mudou
+            reusable = self.sessions.reusable_context(chat_session, data_version) if chat_session else {}
+            
+            # Obter contexto atual do banco
+            db_summary = reusable.get("resumo_do_sistema") or self._get_database_summary(db)
+            relevant_data = self._gather_relevant_data(message, db, reusable)
+            
+            # Montar contexto dentro do orçamento de tokens: resumo geral, dados da pergunta
+            # atual e, por último, dados de perguntas anteriores da sessão
+            context = PromptContextBuilder(self.token_counter, settings.ai_context_token_budget)
+            context.add_section("resumo_do_sistema", db_summary, priority=0)
+            for priority, (name, data) in enumerate(relevant_data.items(), start=1):
+                context.add_section(name, data, priority=priority)
+            previous_sections = [
+                (name, data) for name, data in reusable.items()
+                if name != "resumo_do_sistema" and name not in relevant_data
+            ]
+            for priority, (name, data) in enumerate(reversed(previous_sections), start=len(relevant_data) + 1):
+                context.add_section(name, data, priority=priority)
+            built_context = context.build()
+            
+            conversation_summary = ""
+            if chat_session and chat_session.summary:
+                conversation_summary = f"""
+            RESUMO DA CONVERSA ATÉ AQUI:
+            {chat_session.summary}
+            """
             
             # Preparar prompt para o ChatGPT
             system_prompt = f"""
             {self.company_context}
-            
-            DADOS ATUAIS DO SISTEMA:
-            {json.dumps(db_summary, indent=2, ensure_ascii=False, default=str)}
-            
-            DADOS RELEVANTES PARA A PERGUNTA:
-            {json.dumps(relevant_data, indent=2, ensure_ascii=False, default=str)}
+            {conversation_summary}
+            DADOS DO SISTEMA E DADOS RELEVANTES PARA A PERGUNTA (JSON):
+            {built_context["text"]}
             
             Responda de forma natural, útil e baseada nos dados reais. Use emojis quando apropriado e seja conversacional mas profissional.
             """
             
+            started = time.perf_counter()
             response = self.client.chat.completions.create(
-                model="gpt-4",
+                model=settings.ai_model,
                 messages=[
                     {"role": "system", "content": system_prompt},
+                    *history,
                     {"role": "user", "content": message}
                 ],
                 temperature=0.7,
-                max_tokens=1000
+                max_tokens=settings.ai_max_completion_tokens
             )
+            latency_ms = (time.perf_counter() - started) * 1000
+            
+            usage = self.usage.record(
+                model=settings.ai_model,
+                prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
+                completion_tokens=response.usage.completion_tokens if response.usage else 0,
+                latency_ms=latency_ms,
+                context_tokens=built_context["tokens"],
+                history_messages=len(history),
+                truncated_sections=built_context["truncated_sections"],
+                dropped_sections=built_context["dropped_sections"]
+            )
+            
+            answer = response.choices[0].message.content
+            if not has_history:
+                # Only answers computed without history go to the cache, so they never carry a conversation
+                self.answer_cache.set(message, data_version, answer)
             
-            return response.choices[0].message.content
+            if chat_session:
+                session_context = {name: data for name, data in reusable.items() if name not in relevant_data}
+                session_context.update(relevant_data)
+                session_context["resumo_do_sistema"] = db_summary
+                self.sessions.record_turn(db, chat_session, message, answer, data_version, session_context)
+            
+            return {
+                "response": answer,
+                "usage": usage,
+                "cached": False
+            }
             
         except Exception as e:
-            return f"❌ Desculpe, ocorreu um erro ao processar sua pergunta: {str(e)}"
+            return {
+                "response": f"❌ Desculpe, ocorreu um erro ao processar sua pergunta: {str(e)}",
+                "usage": None,
+                "cached": False
+            }
     
     def get_suggestions(self, db: Session) -> List[str]:
         """Gerar sugestões de perguntas baseadas nos dados disponíveis"""
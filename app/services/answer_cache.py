@@ -0,0 +1,137 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Words (normalized) that point back to earlier turns: "e ele?", "compare com isso", "o mesmo no mês anterior"
+FOLLOW_UP_WORDS = {
+    "ele", "ela", "eles", "elas", "dele", "dela", "deles", "delas", "nele", "nela", "neles", "nelas",
+    "isso", "isto", "disso", "nisso", "esse", "essa", "esses", "essas", "desse", "dessa", "desses", "dessas",
+    "nesse", "nessa", "mesmo", "mesma", "mesmos", "mesmas", "tambem", "anterior", "anteriores", "acima",
+    "compare", "compara", "comparar", "comparado", "continue", "continua", "detalhe", "detalhes"
+}
+
+# Words that flip the meaning of a question ("quais influenciadores não postaram")
+NEGATION_WORDS = {"nao", "nem", "nunca", "jamais", "sem", "nenhum", "nenhuma"}
+# Words two phrasings of the same question may differ on; any other differing word
+# (an owner, an @username, a metric, a period) makes them different questions
+FILLER_WORDS = {
+    "o", "a", "os", "as", "um", "uma", "uns", "umas", "de", "do", "da", "dos", "das", "no", "na", "nos", "nas",
+    "em", "ao", "aos", "por", "favor", "pf", "me", "pra", "para", "voce", "vc", "pode", "poderia", "consegue",
+    "sabe", "dizer", "diga", "mostre", "mostra", "mostrar", "liste", "listar", "informe", "ai", "entao", "agora"
+}
+
+
+class AnswerCache:
+    """
+    Cache de respostas do assistente indexado pela pergunta normalizada e pela
+    versão dos dados (ver DataVersion).
+
+    Perguntas iguais após normalização (acentos, emojis, pontuação, caixa) são
+    servidas direto do cache. Perguntas quase iguais também, quando a similaridade
+    de palavras passa do limiar e só diferem em palavras de preenchimento
+    ("me mostre", "por favor"): números ("top 5" e "top 10"), negações ("não") e
+    qualquer outra palavra (um owner, um @) tornam as perguntas diferentes.
+    Quando a versão dos dados muda, as entradas antigas deixam de ser usadas e
+    são descartadas.
+    """
+
+    def __init__(self, max_entries: int = 500, ttl_seconds: int = 3600, similarity: float = 0.9):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self._entries: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "near_hits": 0, "misses": 0}
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        text = unicodedata.normalize("NFKD", question.lower())
+        text = "".join(char for char in text if not unicodedata.combining(char))
+        text = re.sub(r"[^a-z0-9@_ ]+", " ", text)
+        return " ".join(text.split())
+
+    def is_self_contained(self, question: str) -> bool:
+        """
+        The question can be answered without the conversation so far (its cached
+        answer is valid in any session): it has a few words, doesn't start with "e"
+        ("e o Samuel?") and has no word referring back to earlier turns
+        """
+        words = self.normalize(question).split()
+        return len(words) >= 3 and words[0] != "e" and not FOLLOW_UP_WORDS.intersection(words)
+
+    def get(self, question: str, version: str) -> Optional[str]:
+        normalized = self.normalize(question)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get((version, normalized))
+            if entry and now - entry["created_at"] <= self.ttl_seconds:
+                self._entries.move_to_end((version, normalized))
+                self._stats["hits"] += 1
+                return entry["response"]
+
+            # Near-duplicate lookup among answers for the same data version
+            words = set(normalized.split())
+            best_key, best_score = None, 0.0
+            for key, candidate in self._entries.items():
+                if key[0] != version or now - candidate["created_at"] > self.ttl_seconds:
+                    continue
+                score = self._similarity(words, candidate["words"])
+                if score > best_score:
+                    best_key, best_score = key, score
+
+            if best_key and best_score >= self.similarity:
+                self._entries.move_to_end(best_key)
+                self._stats["near_hits"] += 1
+                return self._entries[best_key]["response"]
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, question: str, version: str, response: str) -> None:
+        normalized = self.normalize(question)
+
+        with self._lock:
+            # Drop answers computed against older data
+            for key in [key for key in self._entries if key[0] != version]:
+                del self._entries[key]
+
+            self._entries[(version, normalized)] = {
+                "response": response,
+                "words": set(normalized.split()),
+                "created_at": time.time()
+            }
+            self._entries.move_to_end((version, normalized))
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["near_hits"] + self._stats["misses"]
+            hits = self._stats["hits"] + self._stats["near_hits"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+            }
+
+    @staticmethod
+    def _similarity(words: set, other: set) -> float:
+        if not words or not other:
+            return 0.0
+        different = words ^ other
+        # Questions that differ on a number ("top 5" vs "top 10") are never the same
+        if any(any(char.isdigit() for char in word) for word in different):
+            return 0.0
+        # Nor on a negation, an entity or any other meaningful word, however long the question
+        if different & NEGATION_WORDS or different - FILLER_WORDS:
+            return 0.0
+        return len(words & other) / len(words | other)
@@ -0,0 +1,150 @@
+import os
+import re
+import subprocess
+import threading
+from typing import BinaryIO, List, Tuple
+from ..core.config import settings
+
+SILENCE_START = re.compile(r"silence_start: (-?\d+(?:\.\d+)?)")
+SILENCE_END = re.compile(r"silence_end: (-?\d+(?:\.\d+)?)")
+OUT_TIME = re.compile(r"^out_time_us=(\d+)$", re.MULTILINE)
+PIPE_CHUNK_SIZE = 1024 * 1024  # Read size when feeding audio files to ffmpeg
+
+
+class AudioSegmenter:
+    """
+    Split long audio into chunks that can be transcribed independently.
+
+    Cut points are placed in the silence closest to each `transcription_chunk_seconds`
+    boundary (falling back to a hard cut when there is no pause nearby), and every
+    chunk starts `transcription_chunk_overlap_seconds` before its cut so words on the
+    boundary are never lost. `merge_texts` removes the repeated words afterwards.
+    """
+
+    def __init__(self, ffmpeg: str):
+        self.ffmpeg = ffmpeg
+
+    def analyze(self, audio: BinaryIO) -> Tuple[float, List[Tuple[float, float]]]:
+        """Decode the audio once (fed to ffmpeg in pieces) and return its duration and silence intervals"""
+        returncode, stdout, stderr = self._run_with_input([
+            self.ffmpeg, "-hide_banner", "-nostats", "-progress", "pipe:1", "-i", "pipe:0",
+            "-af", f"silencedetect=noise={settings.transcription_silence_db}dB:d={settings.transcription_silence_min_seconds}",
+            "-f", "null", "-"
+        ], audio)
+        if returncode != 0:
+            lines = stderr.decode(errors="ignore").strip().splitlines()
+            raise Exception(lines[-1][-500:] if lines else f"ffmpeg exit code {returncode}")
+
+        progress = OUT_TIME.findall(stdout.decode(errors="ignore"))
+        duration = int(progress[-1]) / 1_000_000 if progress else 0.0
+
+        silences = []
+        start = None
+        for line in stderr.decode(errors="ignore").splitlines():
+            match = SILENCE_START.search(line)
+            if match:
+                start = max(float(match.group(1)), 0.0)
+                continue
+            match = SILENCE_END.search(line)
+            if match and start is not None:
+                silences.append((start, float(match.group(1))))
+                start = None
+        if start is not None:
+            silences.append((start, duration))  # Trailing silence
+
+        return duration, silences
+
+    @staticmethod
+    def _run_with_input(command: List[str], audio: BinaryIO) -> Tuple[int, bytes, bytes]:
+        """Run ffmpeg writing `audio` to its stdin PIPE_CHUNK_SIZE bytes at a time: (returncode, stdout, stderr)"""
+        process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output = {}
+
+        def feed():
+            try:
+                audio.seek(0)
+                for chunk in iter(lambda: audio.read(PIPE_CHUNK_SIZE), b""):
+                    process.stdin.write(chunk)
+            except BrokenPipeError:
+                pass  # ffmpeg exited early, its exit code tells why
+            finally:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        threads = [
+            threading.Thread(target=feed, daemon=True),
+            threading.Thread(target=lambda: output.update(stdout=process.stdout.read()), daemon=True),
+            threading.Thread(target=lambda: output.update(stderr=process.stderr.read()), daemon=True)
+        ]
+        watchdog = threading.Timer(settings.ffmpeg_timeout_seconds, process.kill)
+        for thread in threads:
+            thread.start()
+        watchdog.start()
+        try:
+            process.wait()
+        finally:
+            watchdog.cancel()
+            for thread in threads:
+                thread.join()
+        return process.returncode, output.get("stdout", b""), output.get("stderr", b"")
+
+    @staticmethod
+    def plan(duration: float, silences: List[Tuple[float, float]],
+             chunk_seconds: float = None, overlap: float = None) -> List[Tuple[float, float]]:
+        """Return (start, end) seconds of each chunk, cutting in silences near the target boundaries"""
+        chunk_seconds = chunk_seconds or settings.transcription_chunk_seconds
+        overlap = settings.transcription_chunk_overlap_seconds if overlap is None else overlap
+        window = chunk_seconds / 5  # How far a cut may move to land in a pause
+
+        cuts = []
+        position = 0.0
+        while duration - position > chunk_seconds:
+            target = position + chunk_seconds
+            candidates = [
+                (start + end) / 2 for start, end in silences
+                if abs((start + end) / 2 - target) <= window and (start + end) / 2 > position + window
+            ]
+            cut = min(candidates, key=lambda middle: abs(middle - target)) if candidates else target
+            cuts.append(cut)
+            position = cut
+
+        boundaries = [0.0] + cuts + [duration]
+        return [
+            (max(boundaries[i] - overlap, 0.0) if i else 0.0, boundaries[i + 1])
+            for i in range(len(boundaries) - 1)
+        ]
+
+    def extract(self, audio_path: str, start: float, end: float, muxer: str, output_path: str) -> None:
+        """Cut the [start, end] range of an audio file into `output_path` without re-encoding it"""
+        result = subprocess.run(
+            [self.ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+             "-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-i", audio_path,
+             "-map", "0:a:0", "-c:a", "copy", "-f", muxer, output_path],
+            capture_output=True,
+            timeout=settings.ffmpeg_timeout_seconds
+        )
+        if result.returncode != 0 or not os.path.getsize(output_path):
+            lines = result.stderr.decode(errors="ignore").strip().splitlines()
+            raise Exception(lines[-1][-500:] if lines else f"ffmpeg exit code {result.returncode}")
+
+    @staticmethod
+    def merge_texts(texts: List[str], max_overlap_words: int = 30) -> str:
+        """Join chunk transcriptions in order, dropping words repeated across each boundary"""
+        normalize = lambda word: re.sub(r"[^\w]", "", word.lower())
+        merged: List[str] = []
+
+        for text in texts:
+            words = text.split()
+            if merged and words:
+                tail = [normalize(word) for word in merged[-max_overlap_words:]]
+                head = [normalize(word) for word in words[:max_overlap_words]]
+                # Longest run of at least 2 words ending the previous chunk and starting this one
+                for size in range(min(len(tail), len(head)), 1, -1):
+                    if tail[-size:] == head[:size]:
+                        words = words[size:]
+                        break
+            merged.extend(words)
+
+        return " ".join(merged)
@@ -0,0 +1,120 @@
+import json
+import time
+from typing import List, Dict, Any, Optional
+from uuid import UUID
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models import ChatSession, ChatSessionMessage
+from .openai_client import get_openai_client
+
+
+class ChatSessionManager:
+    """
+    Histórico das conversas com o assistente, guardado no banco.
+
+    As últimas `ai_session_recent_turns` trocas vão inteiras para o prompt; as
+    mais antigas são resumidas em uma memória compacta (ChatSession.summary), em
+    lotes: só quando as mensagens pendentes passam do dobro da janela, então a
+    chamada extra ao modelo de resumo acontece a cada `ai_session_recent_turns`
+    trocas, não a cada pergunta.
+    Os dados buscados no banco ficam salvos na sessão e são reaproveitados nas
+    perguntas seguintes enquanto a versão dos dados não mudar.
+    """
+
+    def __init__(self, usage):
+        self.usage = usage
+
+    @property
+    def client(self):
+        return get_openai_client()
+
+    def create(self, db: Session) -> ChatSession:
+        session = ChatSession()
+        db.add(session)
+        db.commit()
+        db.refresh(session)
+        return session
+
+    def get(self, db: Session, session_id: UUID) -> Optional[ChatSession]:
+        return db.query(ChatSession).filter(ChatSession.id == session_id).first()
+
+    def delete(self, db: Session, session: ChatSession) -> None:
+        db.delete(session)
+        db.commit()
+
+    def recent_messages(self, session: ChatSession) -> List[Dict[str, str]]:
+        """Mensagens ainda não resumidas, no formato da API de chat"""
+        return [
+            {"role": message.role, "content": message.content}
+            for message in session.messages if not message.compacted
+        ]
+
+    def reusable_context(self, session: ChatSession, data_version: str) -> Dict[str, Any]:
+        """Dados buscados em turnos anteriores, se ainda valem para a versão atual"""
+        if not session.context_data or session.data_version != data_version:
+            return {}
+        try:
+            return json.loads(session.context_data)
+        except ValueError:
+            return {}
+
+    def record_turn(self, db: Session, session: ChatSession, question: str, answer: str,
+                    data_version: str, context: Dict[str, Any]) -> None:
+        """Salvar a pergunta, a resposta e os dados usados; compactar o histórico se necessário"""
+        session.messages.append(ChatSessionMessage(role="user", content=question))
+        session.messages.append(ChatSessionMessage(role="assistant", content=answer))
+
+        # Keep only the most recently used sections to bound the stored context
+        sections = list(context.items())[-settings.ai_session_max_context_sections:]
+        session.context_data = json.dumps(dict(sections), ensure_ascii=False, default=str)
+        session.data_version = data_version
+        db.commit()
+
+        try:
+            self._compact(db, session)
+        except Exception as e:
+            db.rollback()
+            print(f"[DEBUG] Erro ao compactar histórico da sessão {session.id}: {e}")
+
+    def _compact(self, db: Session, session: ChatSession) -> None:
+        """Resumir na memória da sessão, de uma vez, tudo o que passou da janela recente quando ela dobra"""
+        pending = [message for message in session.messages if not message.compacted]
+        window = settings.ai_session_recent_turns * 2
+        if len(pending) <= window * 2:
+            return
+
+        to_compact = pending[:len(pending) - window]
+        transcript = "\n".join(
+            f"{'Usuário' if message.role == 'user' else 'Assistente'}: {message.content}"
+            for message in to_compact
+        )
+
+        started = time.perf_counter()
+        response = self.client.chat.completions.create(
+            model=settings.ai_summary_model,
+            messages=[
+                {"role": "system", "content": (
+                    "Você resume conversas entre um usuário e o assistente de dados da El Dorado. "
+                    "Atualize o resumo existente com as novas mensagens, mantendo nomes, números, "
+                    "filtros e conclusões relevantes. Responda apenas com o resumo, em até 150 palavras."
+                )},
+                {"role": "user", "content": (
+                    f"RESUMO ATUAL:\n{session.summary or '(vazio)'}\n\nNOVAS MENSAGENS:\n{transcript}"
+                )}
+            ],
+            temperature=0.2,
+            max_tokens=300
+        )
+        self.usage.record(
+            model=settings.ai_summary_model,
+            prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
+            completion_tokens=response.usage.completion_tokens if response.usage else 0,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            purpose="session_summary"
+        )
+
+        session.summary = response.choices[0].message.content
+        for message in to_compact:
+            message.compacted = True
+        db.commit()
+        print(f"[DEBUG] Sessão {session.id}: {len(to_compact)} mensagens compactadas no resumo")
@@ -0,0 +1,199 @@
+import json
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str):
+    """Carrega o encoding do tiktoken no primeiro uso, ou None se indisponível"""
+    try:
+        import tiktoken
+    except ImportError:
+        print("[WARNING] tiktoken não disponível - contagem de tokens será estimada")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def compact_json(data: Any) -> str:
+    """Serializa dados em JSON compacto (sem indentação nem espaços)"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class TokenCounter:
+    """Conta tokens com tiktoken quando disponível, ou estima (~4 caracteres por token)"""
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = get_encoding(self.model)
+        if encoding is not None:
+            return len(encoding.encode(text))
+        return len(text) // 4 + 1
+
+
+class PromptContextBuilder:
+    """
+    Monta o contexto de dados do prompt respeitando um orçamento de tokens.
+
+    Cada seção tem uma prioridade (menor = mais importante). As seções são
+    incluídas em ordem de prioridade; quando uma seção não cabe no orçamento
+    restante, suas listas e textos são truncados até caber, ou a seção é descartada.
+    """
+
+    def __init__(self, counter: TokenCounter, budget: int):
+        self.counter = counter
+        self.budget = budget
+        self._sections: List[Dict[str, Any]] = []
+
+    def add_section(self, name: str, data: Any, priority: int = 10) -> "PromptContextBuilder":
+        if data:
+            self._sections.append({"name": name, "data": data, "priority": priority})
+        return self
+
+    def build(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict com o texto do contexto, tokens usados e seções truncadas/descartadas
+        """
+        remaining = self.budget
+        included = {}
+        truncated = []
+        dropped = []
+
+        for section in sorted(self._sections, key=lambda s: s["priority"]):
+            # Reserve tokens for the section header ("name":)
+            overhead = self.counter.count(section["name"]) + 4
+            available = remaining - overhead
+            data = section["data"]
+
+            if available <= 0:
+                dropped.append(section["name"])
+                continue
+
+            if self._tokens(data) > available:
+                data = self._fit(data, available)
+                if data is None:
+                    dropped.append(section["name"])
+                    continue
+                truncated.append(section["name"])
+
+            included[section["name"]] = data
+            remaining -= self._tokens(data) + overhead
+
+        text = compact_json(included)
+        return {
+            "text": text,
+            "tokens": self.counter.count(text),
+            "budget": self.budget,
+            "truncated_sections": truncated,
+            "dropped_sections": dropped,
+        }
+
+    def _tokens(self, data: Any) -> int:
+        return self.counter.count(compact_json(data))
+
+    def _fit(self, data: Any, budget: int) -> Optional[Any]:
+        """Reduz os dados até caberem no orçamento, ou retorna None"""
+        if self._tokens(data) <= budget:
+            return data
+
+        if isinstance(data, str):
+            return self._fit_text(data, budget)
+
+        if isinstance(data, list):
+            # Lists are already ranked by the queries, keep the longest prefix that fits
+            low, high = 0, len(data)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if self._tokens(data[:middle]) <= budget:
+                    low = middle
+                else:
+                    high = middle - 1
+            if low > 0:
+                return data[:low]
+            # Not even one item fits as is, try shrinking the first one
+            first = self._fit(data[0], budget - 2) if data else None
+            return [first] if first is not None else None
+
+        if isinstance(data, dict):
+            fitted = dict(data)
+            # Shrink the largest values first until the dict fits
+            while self._tokens(fitted) > budget:
+                key = max(fitted, key=lambda k: self._tokens(fitted[k]))
+                value_tokens = self._tokens(fitted[key])
+                excess = self._tokens(fitted) - budget
+                smaller = None
+                if isinstance(fitted[key], (list, dict, str)) and value_tokens > excess:
+                    smaller = self._fit(fitted[key], value_tokens - excess)
+                if smaller is None or self._tokens(smaller) >= value_tokens:
+                    del fitted[key]
+                    if not fitted:
+                        return None
+                else:
+                    fitted[key] = smaller
+            return fitted
+
+        return None
+
+    def _fit_text(self, text: str, budget: int) -> Optional[str]:
+        if budget <= 2:
+            return None
+        tokens = self.counter.count(text)
+        length = max(int(len(text) * budget / tokens) - 3, 0)
+        while length > 0 and self.counter.count(text[:length] + "...") > budget:
+            length = int(length * 0.9)
+        return text[:length] + "..." if length > 0 else None
+
+
+class UsageTracker:
+    """Registra tokens e latência de cada chamada ao modelo (mantido em memória)"""
+
+    def __init__(self, max_records: int = 500):
+        self._records = deque(maxlen=max_records)
+        self._totals = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "total_latency_ms": 0.0}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, prompt_tokens: int, completion_tokens: int,
+               latency_ms: float, context_tokens: int = 0, **extra) -> Dict[str, Any]:
+        entry = {
+            "timestamp": time.time(),
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "context_tokens": context_tokens,
+            "latency_ms": round(latency_ms, 1),
+            **extra,
+        }
+        with self._lock:
+            self._records.append(entry)
+            self._totals["calls"] += 1
+            self._totals["prompt_tokens"] += prompt_tokens
+            self._totals["completion_tokens"] += completion_tokens
+            self._totals["total_latency_ms"] += latency_ms
+
+        print(f"[DEBUG] Uso OpenAI: {model} prompt={prompt_tokens} completion={completion_tokens} "
+              f"contexto={context_tokens} latência={latency_ms:.0f}ms")
+        return entry
+
+    def summary(self, recent: int = 20) -> Dict[str, Any]:
+        with self._lock:
+            calls = self._totals["calls"]
+            return {
+                "calls": calls,
+                "prompt_tokens": self._totals["prompt_tokens"],
+                "completion_tokens": self._totals["completion_tokens"],
+                "avg_prompt_tokens": round(self._totals["prompt_tokens"] / calls, 1) if calls else 0,
+                "avg_completion_tokens": round(self._totals["completion_tokens"] / calls, 1) if calls else 0,
+                "avg_latency_ms": round(self._totals["total_latency_ms"] / calls, 1) if calls else 0,
+                "recent": list(self._records)[-recent:] if recent > 0 else [],
+            }
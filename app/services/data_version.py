@@ -0,0 +1,32 @@
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..models import Influencer, InfluencerIds, Owner, TikTokVideo
+
+
+class DataVersion:
+    """
+    Carimbo de versão dos dados usado para invalidar caches do assistente.
+
+    O carimbo é derivado do banco (quantidade de linhas e último updated_at de
+    cada tabela que alimenta as respostas: tiktok_videos, influencers, owners e
+    influencer_ids), então qualquer sincronização, transcrição, troca de owner ou
+    de @ do TikTok muda a versão em todos os workers, sem estado compartilhado.
+    """
+
+    TABLES = (TikTokVideo, Influencer, Owner, InfluencerIds)
+
+    @staticmethod
+    def current(db: Session) -> str:
+        # One round trip: count and last update of every table as scalar subqueries
+        values = db.query(*(
+            subquery for model in DataVersion.TABLES for subquery in (
+                select(func.count(model.id)).scalar_subquery(),
+                select(func.max(model.updated_at)).scalar_subquery()
+            )
+        )).one()
+        
+        def stamp(value):
+            return int(value.timestamp() * 1000) if value else 0
+        
+        counts, updates = values[0::2], values[1::2]
+        return "v" + ".".join(f"{count}.{stamp(updated)}" for count, updated in zip(counts, updates))
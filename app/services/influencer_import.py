@@ -0,0 +1,264 @@
+import csv
+import io
+import re
+import tempfile
+import time
+import unicodedata
+from typing import Any, BinaryIO, Dict, List, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from ..core.config import settings
+
+# CSV header (normalized: no accents, lowercase, letters/digits only) → staging column.
+# Covers influencers_limpo.csv, the Notion export template and plain English names.
+HEADER_FIELDS = {
+    "nome": "first_name",
+    "name": "first_name",
+    "firstname": "first_name",
+    "usereldorado": "eldorado_username",
+    "eldoradousername": "eldorado_username",
+    "usuarioeldorado": "eldorado_username",
+    "tiktok": "tiktok_username",
+    "tiktokusername": "tiktok_username",
+    "pais": "country",
+    "country": "country",
+    "owner": "owner",
+    "telefone": "phone",
+    "phone": "phone",
+}
+REQUIRED_FIELDS = ("first_name", "eldorado_username", "owner")
+STAGING_TABLE = "influencer_import_staging"
+
+
+class InfluencerImporter:
+    """
+    Bulk import of influencers from CSV, set-based end to end.
+
+    One streaming pass with csv.reader checks that each record has as many
+    fields as the header. Malformed records are reported instead of aborting
+    COPY, and the rest are staged tagged with the physical line they start on
+    (quoted fields may span lines). The staged file is loaded with COPY into a
+    temporary table (dropped on commit), cleaned and validated in SQL (missing
+    fields, unknown owners, field sizes, usernames repeated in the file), and
+    merged into `influencers` and `influencer_ids` with one INSERT ... ON
+    CONFLICT each. Invalid rows are reported by line; the rest are imported in
+    the same transaction.
+    """
+
+    @staticmethod
+    def normalize_header(name: str) -> str:
+        name = unicodedata.normalize("NFKD", name.replace("\ufeff", "").lower())
+        name = "".join(char for char in name if not unicodedata.combining(char))
+        return re.sub(r"[^a-z0-9]", "", name)
+
+    def map_columns(self, headers: List[str]) -> List[str]:
+        """Staging column for each CSV column, in file order (unknown ones are loaded and ignored)"""
+        columns = []
+        for index, header in enumerate(headers):
+            field = HEADER_FIELDS.get(self.normalize_header(header))
+            columns.append(field if field and field not in columns else f"ignored_{index}")
+
+        missing = [field for field in REQUIRED_FIELDS if field not in columns]
+        if missing:
+            raise ValueError(f"CSV missing required columns: {', '.join(missing)} (header: {headers})")
+        return columns
+
+    def import_csv(self, db: Session, stream: BinaryIO, update_existing: bool = False,
+                   dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Import a CSV stream (binary) and commit, or roll back when `dry_run`
+
+        Args:
+            update_existing: overwrite name/phone/country/owner/TikTok username of
+                influencers that already exist (otherwise they are left untouched)
+
+        Raises:
+            ValueError: when the file is empty, not UTF-8, or the header lacks a required column
+        """
+        started = time.perf_counter()
+        staged = tempfile.SpooledTemporaryFile(max_size=settings.upload_spool_max_bytes)
+        try:
+            columns, malformed = self._stage(stream, staged)
+            try:
+                self._load(db, staged, columns)
+                self._validate(db)
+
+                total_rows = db.execute(text(f"SELECT count(*) FROM {STAGING_TABLE}")).scalar() + len(malformed)
+                invalid_rows = db.execute(text(
+                    f"SELECT line_num, eldorado_username, error FROM {STAGING_TABLE} WHERE error IS NOT NULL"
+                )).all()
+                errors = sorted(malformed + [
+                    {"row": row.line_num, "eldorado_username": row.eldorado_username, "error": row.error}
+                    for row in invalid_rows
+                ], key=lambda error: error["row"])
+
+                if dry_run:
+                    inserted, existing = db.execute(text(f"""
+                        SELECT count(*) FILTER (WHERE i.id IS NULL), count(*) FILTER (WHERE i.id IS NOT NULL)
+                        FROM {STAGING_TABLE} s
+                        LEFT JOIN influencers i ON i.eldorado_username = s.eldorado_username
+                        WHERE s.error IS NULL
+                    """)).one()
+                    social_ids = 0
+                    db.rollback()
+                else:
+                    inserted, existing = self._merge_influencers(db, update_existing)
+                    social_ids = self._merge_influencer_ids(db, update_existing)
+                    db.commit()
+            except Exception:
+                db.rollback()
+                raise
+        finally:
+            staged.close()
+
+        return {
+            "total_rows": total_rows,
+            "inserted": inserted,
+            "updated": existing if update_existing else 0,
+            "skipped_existing": 0 if update_existing else existing,
+            "invalid": len(errors),
+            "social_ids_upserted": social_ids,
+            "dry_run": dry_run,
+            "duration_ms": round((time.perf_counter() - started) * 1000),
+            "errors": errors
+        }
+
+    def _stage(self, stream: BinaryIO, staged: BinaryIO) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Copy the well-formed records of `stream` to `staged` as header-less CSV,
+        each with its physical start line appended (header is line 1). Returns
+        the staging columns and an error for every record whose field count
+        differs from the header's; blank lines are skipped.
+        """
+        source = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        target = io.TextIOWrapper(staged, encoding="utf-8", newline="")
+        reader = csv.reader(source)
+        writer = csv.writer(target)
+        try:
+            headers = next(reader, None)
+            if not headers:
+                raise ValueError("CSV is empty")
+            columns = self.map_columns(headers)
+            username = columns.index("eldorado_username")
+
+            malformed = []
+            start = reader.line_num + 1
+            for record in reader:
+                if len(record) == len(columns):
+                    writer.writerow(record + [start])
+                elif any(field.strip() for field in record):
+                    malformed.append({
+                        "row": start,
+                        "eldorado_username": (record[username].strip() or None) if len(record) > username else None,
+                        "error": f"Expected {len(columns)} fields, found {len(record)}"
+                    })
+                start = reader.line_num + 1
+            target.flush()
+        except UnicodeDecodeError as e:
+            raise ValueError(f"CSV is not UTF-8: {e}")
+        except csv.Error as e:
+            raise ValueError(f"Malformed CSV at line {reader.line_num}: {e}")
+        finally:
+            source.detach()  # Leave the caller's stream open
+            target.detach()
+        staged.seek(0)
+        return columns, malformed
+
+    def _load(self, db: Session, staged: BinaryIO, columns: List[str]) -> None:
+        """COPY the staged records into the staging table (all text, line_num is the file line)"""
+        fields = set(columns) | {"first_name", "eldorado_username", "tiktok_username", "country", "owner", "phone"}
+        db.execute(text(
+            f"CREATE TEMP TABLE {STAGING_TABLE} (line_num bigint NOT NULL, "
+            + ", ".join(f"{field} text" for field in sorted(fields))
+            + ", error text) ON COMMIT DROP"
+        ))
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({', '.join(columns)}, line_num) FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8')",
+                staged
+            )
+        finally:
+            cursor.close()
+
+    def _validate(self, db: Session) -> None:
+        """Clean values and flag invalid rows, both in SQL"""
+        db.execute(text(f"""
+            UPDATE {STAGING_TABLE} SET
+                first_name = NULLIF(trim(first_name), ''),
+                eldorado_username = NULLIF(trim(eldorado_username), ''),
+                tiktok_username = NULLIF(ltrim(trim(tiktok_username), '@'), ''),
+                country = NULLIF(trim(country), ''),
+                owner = NULLIF(lower(trim(owner)), ''),
+                phone = NULLIF(NULLIF(trim(phone), ''), 'null')
+        """))
+        db.execute(text(f"""
+            UPDATE {STAGING_TABLE} SET error = CASE
+                WHEN first_name IS NULL OR eldorado_username IS NULL
+                    THEN 'Missing essential data (nome or eldorado_username)'
+                WHEN owner IS NULL
+                    THEN 'Missing owner'
+                WHEN NOT EXISTS (SELECT 1 FROM owners o WHERE o.name = owner)
+                    THEN 'Invalid owner ''' || owner || ''''
+                WHEN length(first_name) > 255 OR length(eldorado_username) > 100
+                     OR length(tiktok_username) > 100 OR length(phone) > 20 OR length(country) > 100
+                    THEN 'Value too long for one of the columns'
+            END
+        """))
+        # Among the rows that are otherwise valid, so an invalid first occurrence
+        # doesn't reject the valid one after it
+        db.execute(text(f"""
+            UPDATE {STAGING_TABLE} s SET error = 'Duplicated eldorado_username in file'
+            FROM (
+                SELECT line_num, row_number() OVER (PARTITION BY eldorado_username ORDER BY line_num) AS occurrence
+                FROM {STAGING_TABLE}
+                WHERE error IS NULL
+            ) d
+            WHERE s.line_num = d.line_num AND d.occurrence > 1
+        """))
+
+    def _merge_influencers(self, db: Session, update_existing: bool):
+        """One INSERT ... ON CONFLICT for every valid row: (inserted, already existing)"""
+        on_conflict = """
+            DO UPDATE SET
+                first_name = EXCLUDED.first_name,
+                phone = COALESCE(EXCLUDED.phone, influencers.phone),
+                country = COALESCE(EXCLUDED.country, influencers.country),
+                owner_id = EXCLUDED.owner_id,
+                updated_at = now()
+        """ if update_existing else "DO NOTHING"
+
+        inserted = db.execute(text(f"""
+            WITH merged AS (
+                INSERT INTO influencers (first_name, eldorado_username, phone, country, owner_id, status)
+                SELECT s.first_name, s.eldorado_username, s.phone, s.country, o.id, 'active'
+                FROM {STAGING_TABLE} s
+                JOIN owners o ON o.name = s.owner
+                WHERE s.error IS NULL
+                ON CONFLICT (eldorado_username) {on_conflict}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT count(*) FILTER (WHERE inserted) FROM merged
+        """)).scalar()
+        valid = db.execute(text(f"SELECT count(*) FROM {STAGING_TABLE} WHERE error IS NULL")).scalar()
+        return inserted, valid - inserted
+
+    def _merge_influencer_ids(self, db: Session, update_existing: bool) -> int:
+        """One INSERT ... ON CONFLICT for the TikTok usernames (a changed username drops the stale TikTok ID)"""
+        on_conflict = """
+            DO UPDATE SET
+                tiktok_username = EXCLUDED.tiktok_username,
+                tiktok_id = NULL,
+                tiktok_id_attempts = 0,
+                tiktok_id_error = NULL,
+                updated_at = now()
+            WHERE influencer_ids.tiktok_username IS DISTINCT FROM EXCLUDED.tiktok_username
+        """ if update_existing else "DO NOTHING"
+
+        return db.execute(text(f"""
+            INSERT INTO influencer_ids (eldorado_username, tiktok_username)
+            SELECT eldorado_username, tiktok_username
+            FROM {STAGING_TABLE}
+            WHERE error IS NULL AND tiktok_username IS NOT NULL
+            ON CONFLICT (eldorado_username) {on_conflict}
+        """)).rowcount
@@ -0,0 +1,189 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import Influencer, InfluencerIds, Owner
+from ..schemas import InfluencerCreate
+from .scraptik import ScrapTikService
+from .tiktok_id_resolver import TikTokIdResolver
+from .video_sync import VideoSync
+
+
+class InfluencerOnboarding:
+    """
+    Onboard a cohort of influencers in one request.
+
+    All influencers are written with one multi-row INSERT ... ON CONFLICT into
+    `influencers` and one into `influencer_ids`, in a single transaction. The
+    optional follow-up runs in the background for the whole batch: TikTok IDs
+    through TikTokIdResolver (rate limited, one write-back), then video sync,
+    `onboarding_sync_workers` influencers at a time.
+    """
+
+    def bulk_upsert(self, db: Session, influencers: List[InfluencerCreate],
+                    update_existing: bool = False) -> Dict[str, Any]:
+        """Insert (or update) the batch and commit once; returns per-influencer results"""
+        owner_ids = dict(db.query(Owner.name, Owner.id).all())
+
+        results = []  # Same order as the request
+        rows = {}
+        for data in influencers:
+            username = data.eldorado_username.strip()
+            error = None
+            if username in rows:
+                error = "Duplicated eldorado_username in batch"
+            elif data.owner.strip().lower() not in owner_ids:
+                error = f"Owner '{data.owner}' not found"
+            if error:
+                results.append({"eldorado_username": username, "status": "invalid", "error": error})
+                continue
+            rows[username] = data
+            results.append({"eldorado_username": username, "status": None, "error": None})
+
+        merged = {}
+        social_ids = 0
+        if rows:
+            statement = insert(Influencer).values([
+                {
+                    "first_name": data.first_name.strip(),
+                    "eldorado_username": username,
+                    "phone": data.phone,
+                    "country": data.country,
+                    "owner_id": owner_ids[data.owner.strip().lower()],
+                    "status": "active"
+                }
+                for username, data in rows.items()
+            ])
+            if update_existing:
+                statement = statement.on_conflict_do_update(
+                    index_elements=[Influencer.eldorado_username],
+                    set_={
+                        "first_name": statement.excluded.first_name,
+                        "phone": func.coalesce(statement.excluded.phone, Influencer.phone),
+                        "country": func.coalesce(statement.excluded.country, Influencer.country),
+                        "owner_id": statement.excluded.owner_id,
+                        "updated_at": func.now()
+                    }
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=[Influencer.eldorado_username])
+            statement = statement.returning(
+                Influencer.eldorado_username, literal_column("(xmax = 0)").label("inserted")
+            )
+
+            try:
+                merged = {row.eldorado_username: row.inserted for row in db.execute(statement)}
+
+                social_rows = [
+                    {"eldorado_username": username, "tiktok_username": data.tiktok_username.strip().lstrip("@")}
+                    for username, data in rows.items()
+                    if data.tiktok_username and data.tiktok_username.strip().lstrip("@")
+                ]
+                if social_rows:
+                    ids_statement = insert(InfluencerIds).values(social_rows)
+                    if update_existing:
+                        # A new TikTok username makes the stored TikTok ID stale
+                        ids_statement = ids_statement.on_conflict_do_update(
+                            index_elements=[InfluencerIds.eldorado_username],
+                            set_={
+                                "tiktok_username": ids_statement.excluded.tiktok_username,
+                                "tiktok_id": None,
+                                "tiktok_id_attempts": 0,
+                                "tiktok_id_error": None,
+                                "updated_at": func.now()
+                            },
+                            where=InfluencerIds.tiktok_username.is_distinct_from(ids_statement.excluded.tiktok_username)
+                        )
+                    else:
+                        ids_statement = ids_statement.on_conflict_do_nothing(
+                            index_elements=[InfluencerIds.eldorado_username]
+                        )
+                    social_ids = db.execute(ids_statement).rowcount
+
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+        for result in results:
+            if result["status"] is None:
+                username = result["eldorado_username"]
+                if username not in merged:
+                    result["status"] = "existing"
+                else:
+                    result["status"] = "created" if merged[username] else "updated"
+
+        count = lambda status: sum(1 for result in results if result["status"] == status)
+        return {
+            "created": count("created"),
+            "updated": count("updated"),
+            "skipped_existing": count("existing"),
+            "invalid": count("invalid"),
+            "social_ids_upserted": social_ids,
+            "results": results
+        }
+
+    def start_sync_in_background(self, usernames: List[str]) -> None:
+        threading.Thread(target=self.sync, args=(usernames,), daemon=True, name="onboarding-sync").start()
+
+    def sync(self, usernames: List[str]) -> Dict[str, Any]:
+        """Look up missing TikTok IDs and sync the videos of every influencer in the batch (blocking)"""
+        print(f"[DEBUG] Onboarding: sincronizando {len(usernames)} influenciadores...")
+        try:
+            TikTokIdResolver().run(usernames=usernames)
+        except RuntimeError as e:
+            # Another resolution run is in progress: each influencer looks up its own ID below
+            print(f"[DEBUG] Onboarding: {e}")
+
+        with ThreadPoolExecutor(max_workers=settings.onboarding_sync_workers, thread_name_prefix="onboarding") as executor:
+            outcomes = list(executor.map(self._sync_one, usernames))
+
+        summary = {
+            "influencers": len(usernames),
+            "tiktok_ids_found": sum(1 for outcome in outcomes if outcome.get("tiktok_id")),
+            "new_videos": sum(outcome.get("new_videos", 0) for outcome in outcomes),
+            "errors": [outcome["error"] for outcome in outcomes if outcome.get("error")]
+        }
+        print(f"[DEBUG] Onboarding concluído: {summary['tiktok_ids_found']} TikTok IDs, "
+              f"{summary['new_videos']} vídeos novos, {len(summary['errors'])} erros")
+        return summary
+
+    def _sync_one(self, eldorado_username: str) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            influencer_ids = db.query(InfluencerIds).filter(
+                InfluencerIds.eldorado_username == eldorado_username
+            ).first()
+            if not influencer_ids or not influencer_ids.tiktok_username:
+                return {}
+
+            scraptik = ScrapTikService()
+            if not influencer_ids.tiktok_id:
+                tiktok_id = scraptik.get_user_id_from_username(influencer_ids.tiktok_username)
+                if not tiktok_id:
+                    return {"error": f"{eldorado_username}: TikTok ID not found for '{influencer_ids.tiktok_username}'"}
+                influencer_ids.tiktok_id = str(tiktok_id)
+                db.commit()
+
+            sponsored_videos = scraptik.get_eldorado_videos(
+                influencer_ids.tiktok_username, user_id=influencer_ids.tiktok_id
+            )
+            new_videos, _, errors = VideoSync().upsert_videos(
+                db, eldorado_username, influencer_ids.tiktok_username, sponsored_videos
+            )
+            db.commit()
+            return {
+                "tiktok_id": influencer_ids.tiktok_id,
+                "new_videos": new_videos,
+                "error": f"{eldorado_username}: {errors[0]}" if errors else None
+            }
+        except Exception as e:
+            db.rollback()
+            print(f"[DEBUG] Onboarding: erro ao sincronizar {eldorado_username}: {e}")
+            return {"error": f"{eldorado_username}: {str(e)}"}
+        finally:
+            db.close()
@@ -0,0 +1,14 @@
+from functools import lru_cache
+from ..core.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """
+    Shared OpenAI client for the process.
+
+    The openai package (and its httpx/pydantic stack) is imported on first use,
+    so workers that never call OpenAI don't pay for it at startup.
+    """
+    from openai import OpenAI
+    return OpenAI(api_key=settings.openai_api_key)
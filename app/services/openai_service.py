@@ -1,24 +1,72 @@
 import os
+import sys
+import hashlib
+import shutil
 import tempfile
 import requests
 import subprocess
 import re
-from openai import OpenAI
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import BinaryIO, Optional, List, Tuple, Dict, Callable
 from ..core.config import settings
-import io
-try:
-    from moviepy.editor import VideoFileClip
-    MOVIEPY_AVAILABLE = True
-except ImportError:
-    MOVIEPY_AVAILABLE = False
-    print("[WARNING] MoviePy não disponível - compressão de vídeo desabilitada")
+from .openai_client import get_openai_client
+from .audio_segmenter import AudioSegmenter
+from .transcription_backends import get_transcription_backend
+
+
+@lru_cache(maxsize=1)
+def get_ffmpeg_binary() -> Optional[str]:
+    """Locate ffmpeg (configured name/path or PATH, then the binary bundled with imageio-ffmpeg)"""
+    binary = shutil.which(settings.ffmpeg_binary)
+    if binary:
+        return binary
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        print("[WARNING] ffmpeg não encontrado - extração de áudio desabilitada")
+        return None
+
+
+# Enhanced headers to bypass TikTok restrictions on CDN downloads
+VIDEO_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
+    'Accept': '*/*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'identity',  # Don't use compression to avoid issues
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'video',
+    'Sec-Fetch-Mode': 'no-cors',
+    'Sec-Fetch-Site': 'cross-site',
+}
+
+# Read size when piping the HTTP body into ffmpeg
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# ffmpeg muxer and file extension for each supported audio codec
+AUDIO_FORMATS = {
+    "libopus": ("ogg", ".ogg"),
+    "libmp3lame": ("mp3", ".mp3"),
+    "copy": ("ipod", ".m4a"),  # Remux the original AAC track without re-encoding
+}
+
+
+class TranscriptionCancelled(Exception):
+    """Raised by a before_upload callback to stop before Whisper; never wrapped"""
 
 
 class OpenAIService:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
-        self.max_file_size = 25 * 1024 * 1024  # 25MB limit for OpenAI
+    def __init__(self, backend_name: str = None):
+        # Speech-to-text engine (TRANSCRIPTION_BACKEND): OpenAI Whisper API or local faster-whisper
+        self.backend = get_transcription_backend(backend_name)
+        self.max_file_size = self.backend.max_file_size or sys.maxsize
+    
+    @property
+    def client(self):
+        return get_openai_client()
     
     def get_fresh_video_url(self, tiktok_url: str) -> str:
         """Get a fresh video URL from TikTok page"""
@@ -64,22 +112,55 @@ class OpenAIService:
             print(f"[DEBUG] Erro ao buscar URL fresco: {str(e)}")
             return None
     
+    def probe_video_url(self, video_url: str) -> None:
+        """Cheap health check: request the first KB of the video, raise if it is not downloadable"""
+        headers = dict(VIDEO_REQUEST_HEADERS)
+        headers['Range'] = 'bytes=0-1023'
+        timeout = settings.download_probe_timeout_seconds
+        
+        with requests.get(video_url, headers=headers, stream=True, timeout=(timeout, timeout), allow_redirects=True) as response:
+            if response.status_code not in (200, 206):
+                raise Exception(f"HTTP {response.status_code}")
+            content_type = response.headers.get('content-type', '')
+            if 'html' in content_type or 'json' in content_type:
+                raise Exception(f"Content-Type inesperado: {content_type}")
+    
+    def pick_healthy_video_url(self, candidates: List[Tuple[str, str]]) -> Tuple[Optional[Tuple[str, str]], Dict[str, str]]:
+        """
+        Probe all candidate URLs concurrently and return the first healthy one
+        
+        Args:
+            candidates: (label, url) pairs, e.g. [("primary", url), ("alt1", url)]
+            
+        Returns:
+            ((label, url) of the first URL to answer successfully or None, errors by label)
+        """
+        errors = {}
+        if not candidates:
+            return None, errors
+        
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
+        futures = {executor.submit(self.probe_video_url, url): (label, url) for label, url in candidates}
+        try:
+            for future in as_completed(futures):
+                label, url = futures[future]
+                try:
+                    future.result()
+                    print(f"[DEBUG] URL {label} respondeu primeiro e está saudável")
+                    return (label, url), errors
+                except Exception as probe_error:
+                    print(f"[DEBUG] URL {label} falhou no teste: {probe_error}")
+                    errors[label] = str(probe_error)
+            return None, errors
+        finally:
+            # Don't wait for the slower probes (they are bounded by the probe timeout)
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def download_video(self, video_url: str) -> str:
         """Download video to temporary file and return file path"""
         try:
-            # Enhanced headers to bypass TikTok restrictions
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
-                'Accept': '*/*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'identity',  # Don't use compression to avoid issues
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'video',
-                'Sec-Fetch-Mode': 'no-cors',
-                'Sec-Fetch-Site': 'cross-site',
-                'Range': 'bytes=0-'  # Request full range
-            }
+            headers = dict(VIDEO_REQUEST_HEADERS)
+            headers['Range'] = 'bytes=0-'  # Request full range
             
             # Try multiple attempts with different strategies
             for attempt in range(3):
@@ -108,7 +189,7 @@ class OpenAIService:
                     # Create temporary file
                     with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
                         total_size = 0
-                        for chunk in response.iter_content(chunk_size=8192):
+                        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
                             if chunk:  # Filter out keep-alive chunks
                                 tmp_file.write(chunk)
                                 total_size += len(chunk)
@@ -131,26 +212,44 @@ class OpenAIService:
             else:
                 raise Exception(f"Erro ao baixar vídeo: {error_msg}")
     
+    def audio_output_args(self, pipe: bool = False) -> list:
+        """ffmpeg output options: audio track only, mono low-bitrate speech encoding"""
+        codec = settings.transcription_audio_codec
+        if codec not in AUDIO_FORMATS:
+            raise Exception(f"Codec de áudio não suportado: {codec}")
+        
+        # bitexact + no metadata: the same audio always encodes to the same bytes (see audio_fingerprint)
+        args = ["-map", "0:a:0", "-vn", "-sn", "-dn", "-map_metadata", "-1",
+                "-fflags", "+bitexact", "-flags:a", "+bitexact", "-c:a", codec]
+        if codec != "copy":
+            args += ["-ac", "1", "-ar", "16000", "-b:a", settings.transcription_audio_bitrate]
+        elif pipe:
+            # The MP4 muxer needs a seekable output unless it writes fragments
+            args += ["-movflags", "frag_keyframe+empty_moov"]
+        return args + ["-f", AUDIO_FORMATS[codec][0]]
+    
     def extract_audio_from_video(self, video_path: str) -> str:
-        """Extract audio from video to reduce file size"""
-        if not MOVIEPY_AVAILABLE:
-            raise Exception("MoviePy não disponível para extração de áudio")
+        """Extract the audio track with ffmpeg (video frames are never decoded)"""
+        ffmpeg = get_ffmpeg_binary()
+        if ffmpeg is None:
+            raise Exception("ffmpeg não disponível para extração de áudio")
         
         audio_path = None
         try:
             print(f"[DEBUG] Extraindo áudio do vídeo: {video_path}")
             
-            # Load video and extract audio
-            with VideoFileClip(video_path) as video:
-                audio = video.audio
-                
-                # Create temporary audio file
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_audio:
-                    audio_path = tmp_audio.name
-                
-                # Write audio to file
-                audio.write_audiofile(audio_path, verbose=False, logger=None)
-                
+            with tempfile.NamedTemporaryFile(delete=False, suffix=AUDIO_FORMATS[settings.transcription_audio_codec][1]) as tmp_audio:
+                audio_path = tmp_audio.name
+            
+            result = subprocess.run(
+                [ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+                 "-i", video_path, *self.audio_output_args(), audio_path],
+                capture_output=True,
+                timeout=settings.ffmpeg_timeout_seconds
+            )
+            if result.returncode != 0:
+                raise Exception(result.stderr.decode(errors="ignore").strip()[-500:] or f"ffmpeg exit code {result.returncode}")
+            
             print(f"[DEBUG] Áudio extraído: {audio_path}")
             return audio_path
             
@@ -159,184 +258,211 @@ class OpenAIService:
                 os.unlink(audio_path)
             raise Exception(f"Erro ao extrair áudio: {str(e)}")
     
-    def compress_video(self, video_path: str, target_size_mb: float = 20) -> str:
-        """Compress video to target size"""
-        if not MOVIEPY_AVAILABLE:
-            raise Exception("MoviePy não disponível para compressão")
+    def stream_audio_from_url(self, video_url: str) -> BinaryIO:
+        """
+        Pipe the HTTP response body straight into ffmpeg and collect the encoded
+        audio from its stdout, so download and encoding overlap. The audio goes
+        into a spooled temporary file (the caller closes it) that stays in RAM up
+        to `upload_spool_max_bytes` and spills to disk past it.
         
-        compressed_path = None
-        try:
-            print(f"[DEBUG] Comprimindo vídeo para ~{target_size_mb}MB")
-            
-            # Create temporary compressed file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='_compressed.mp4') as tmp_compressed:
-                compressed_path = tmp_compressed.name
-            
-            with VideoFileClip(video_path) as video:
-                # Calculate target bitrate based on duration and target size
-                duration = video.duration
-                target_bitrate = int((target_size_mb * 8 * 1024) / duration)  # kbps
-                
-                # Limit bitrate to reasonable range
-                target_bitrate = max(200, min(target_bitrate, 2000))  # 200-2000 kbps
-                
-                print(f"[DEBUG] Duração: {duration}s, Bitrate alvo: {target_bitrate}kbps")
-                
-                # Compress video
-                video.write_videofile(
-                    compressed_path,
-                    bitrate=f"{target_bitrate}k",
-                    verbose=False,
-                    logger=None
-                )
-            
-            compressed_size = os.path.getsize(compressed_path) / (1024 * 1024)
-            print(f"[DEBUG] Vídeo comprimido: {compressed_size:.1f}MB")
-            
-            return compressed_path
-            
-        except Exception as e:
-            if compressed_path and os.path.exists(compressed_path):
-                os.unlink(compressed_path)
-            raise Exception(f"Erro na compressão: {str(e)}")
-    
-    def check_file_size_limit(self, video_path: str) -> bool:
-        """Check if file size is within OpenAI limits"""
-        try:
-            file_size = os.path.getsize(video_path)
-            size_mb = file_size / (1024 * 1024)
-            print(f"[DEBUG] File size: {file_size} bytes ({size_mb:.1f}MB)")
+        Raises if the input can't be demuxed from a pipe (e.g. MP4 with the moov
+        atom at the end), the caller then falls back to the temp-file path.
+        """
+        ffmpeg = get_ffmpeg_binary()
+        if ffmpeg is None:
+            raise Exception("ffmpeg não disponível para extração de áudio")
+        
+        headers = dict(VIDEO_REQUEST_HEADERS)
+        headers['Range'] = 'bytes=0-'
+        output_args = self.audio_output_args(pipe=True)
+        
+        with requests.get(video_url, headers=headers, stream=True, timeout=120, allow_redirects=True) as response:
+            response.raise_for_status()
             
-            if file_size > self.max_file_size:
-                print(f"[DEBUG] File too large: {size_mb:.1f}MB > {self.max_file_size / (1024*1024):.1f}MB")
-                return False
+            process = subprocess.Popen(
+                # -xerror: a truncated demux (unseekable MP4) must fail instead of yielding empty audio
+                [ffmpeg, "-hide_banner", "-loglevel", "error", "-nostdin", "-xerror",
+                 "-i", "pipe:0", *output_args, "pipe:1"],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                bufsize=STREAM_CHUNK_SIZE
+            )
+            downloaded = {"bytes": 0, "error": None}
             
-            print("[DEBUG] File size OK")
-            return True
+            def feed():
+                try:
+                    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                        if chunk:
+                            process.stdin.write(chunk)
+                            downloaded["bytes"] += len(chunk)
+                except BrokenPipeError:
+                    pass  # ffmpeg exited early, its exit code tells why
+                except Exception as feed_error:
+                    downloaded["error"] = feed_error
+                finally:
+                    try:
+                        process.stdin.close()
+                    except BrokenPipeError:
+                        pass
             
-        except Exception as e:
-            print(f"[DEBUG] Error checking file size: {str(e)}")
-            return True  # Continue if we can't check
+            stderr = []
+            feeder = threading.Thread(target=feed, daemon=True)
+            drainer = threading.Thread(target=lambda: stderr.append(process.stderr.read()), daemon=True)
+            watchdog = threading.Timer(settings.ffmpeg_timeout_seconds, process.kill)
+            audio = tempfile.SpooledTemporaryFile(max_size=settings.upload_spool_max_bytes)
+            feeder.start()
+            drainer.start()
+            watchdog.start()
+            try:
+                for chunk in iter(lambda: process.stdout.read(STREAM_CHUNK_SIZE), b""):
+                    audio.write(chunk)
+                process.wait()
+            except Exception:
+                audio.close()
+                raise
+            finally:
+                watchdog.cancel()
+                feeder.join()
+                drainer.join()
+        
+        size = audio.tell()
+        if downloaded["error"] is not None or process.returncode != 0 or not size:
+            audio.close()
+            if downloaded["error"] is not None:
+                raise Exception(f"Erro ao baixar vídeo: {downloaded['error']}")
+            lines = b"".join(stderr).decode(errors="ignore").strip().splitlines()
+            raise Exception(lines[-1][-500:] if lines else f"ffmpeg exit code {process.returncode}")
+        
+        print(f"[DEBUG] Áudio extraído em streaming: {size / (1024 * 1024):.2f}MB "
+              f"(vídeo: {downloaded['bytes'] / (1024 * 1024):.1f}MB, "
+              f"{'disco' if size > settings.upload_spool_max_bytes else 'memória'})")
+        return audio
     
-    def transcribe_video(self, video_path: str) -> str:
-        """Transcribe video using OpenAI Whisper API"""
+    def transcribe_audio_file(self, audio: BinaryIO, filename: str) -> str:
+        """Transcribe an audio file object with the configured backend (read in pieces by the upload)"""
         try:
-            print(f"[DEBUG] Opening file for transcription: {video_path}")
-            with open(video_path, "rb") as audio_file:
-                print(f"[DEBUG] Sending to OpenAI Whisper...")
-                transcription = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="pt"  # Portuguese
-                )
-                print(f"[DEBUG] OpenAI response received")
-            return transcription.text
-            
+            print(f"[DEBUG] Sending to Whisper ({self.backend.name})...")
+            text = self.backend.transcribe((filename, audio))  # The name tells the format
+            print(f"[DEBUG] Whisper response received")
+            return text
         except Exception as e:
             print(f"[DEBUG] Transcription error: {str(e)}")
             raise Exception(f"Erro na transcrição: {str(e)}")
-        finally:
-            # Clean up temporary file
-            print(f"[DEBUG] Cleaning up temp file: {video_path}")
-            if os.path.exists(video_path):
-                try:
-                    os.unlink(video_path)
-                    print(f"[DEBUG] Temp file deleted successfully")
-                except Exception as cleanup_error:
-                    print(f"[DEBUG] Failed to delete temp file: {cleanup_error}")
-                    pass
     
-    def transcribe_from_url_streaming(self, video_url: str) -> str:
-        """Stream video directly to OpenAI without saving to disk"""
-        try:
-            # Download video to memory with enhanced headers
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
-                'Accept': '*/*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'identity',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'video',
-                'Sec-Fetch-Mode': 'no-cors',
-                'Sec-Fetch-Site': 'cross-site'
-            }
-            response = requests.get(video_url, timeout=120, headers=headers)
-            response.raise_for_status()
-            
-            # Create a file-like object from bytes
-            video_bytes = io.BytesIO(response.content)
-            video_bytes.name = "video.mp4"  # OpenAI needs a filename
+    @staticmethod
+    def audio_fingerprint(audio: BinaryIO) -> str:
+        """
+        Content hash of the extracted audio. Extraction is bit-exact, so reposts or
+        re-uploads carrying the same audio track (even in a different video or
+        container) hash the same.
+        """
+        digest = hashlib.sha256()
+        audio.seek(0)
+        for chunk in iter(lambda: audio.read(STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+    
+    def transcribe_audio(self, audio: BinaryIO, before_upload: Optional[Callable[[float, str], Optional[str]]] = None) -> str:
+        """
+        Transcribe extracted audio (a file object, never loaded whole into memory).
+        Audio longer than `transcription_chunk_seconds` (or over the upload limit) is
+        split on silences into temporary files and the chunks are handed to the
+        backend together: concurrent API calls, or the resident local model
+        decoding several chunks at once, so wall-clock time follows the longest chunk.
+        
+        `before_upload(duration_seconds, audio_fingerprint)` runs before anything is
+        sent to Whisper: it may return an existing transcription to reuse instead,
+        or raise TranscriptionCancelled (e.g. a minutes budget).
+        """
+        muxer, extension = AUDIO_FORMATS[settings.transcription_audio_codec]
+        segmenter = AudioSegmenter(get_ffmpeg_binary())
+        size = audio.seek(0, os.SEEK_END)
+        duration, silences = segmenter.analyze(audio)
+        if before_upload:
+            reused = before_upload(duration, self.audio_fingerprint(audio))
+            if reused is not None:
+                return reused
+        
+        if duration <= settings.transcription_chunk_seconds and size <= self.max_file_size:
+            audio.seek(0)
+            return self.transcribe_audio_file(audio, "audio" + extension)
+        
+        segments = segmenter.plan(duration, silences)
+        print(f"[DEBUG] Áudio de {duration:.0f}s dividido em {len(segments)} partes")
+        
+        with tempfile.TemporaryDirectory() as workdir:
+            # The chunks seek into a local copy of the audio instead of re-decoding it from the start
+            audio_path = os.path.join(workdir, "audio" + extension)
+            with open(audio_path, "wb") as local_copy:
+                audio.seek(0)
+                shutil.copyfileobj(audio, local_copy, STREAM_CHUNK_SIZE)
             
-            # Send directly to OpenAI
-            transcription = self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=video_bytes,
-                language="pt"
-            )
+            chunk_paths = [os.path.join(workdir, f"audio_{i}{extension}") for i in range(len(segments))]
+            with ThreadPoolExecutor(max_workers=min(settings.transcription_max_parallel_chunks, len(segments))) as executor:
+                list(executor.map(lambda job: segmenter.extract(audio_path, *job[0], muxer, job[1]), zip(segments, chunk_paths)))
             
-            return transcription.text
+            for path in chunk_paths:
+                chunk_size = os.path.getsize(path)
+                if chunk_size > self.max_file_size:
+                    raise Exception(f"Parte do áudio muito grande ({chunk_size / (1024 * 1024):.1f}MB). Limite: 25MB.")
             
-        except Exception as e:
-            raise Exception(f"Erro na transcrição streaming: {str(e)}")
+            # All chunks go to the backend at once (concurrent API calls, or one resident local model),
+            # each uploaded from its file
+            chunk_files = [open(path, "rb") for path in chunk_paths]
+            try:
+                texts = self.backend.transcribe_many([(os.path.basename(path), chunk_file)
+                                                      for path, chunk_file in zip(chunk_paths, chunk_files)])
+            except Exception as e:
+                raise Exception(f"Erro na transcrição: {str(e)}")
+            finally:
+                for chunk_file in chunk_files:
+                    chunk_file.close()
+        
+        return segmenter.merge_texts(texts)
     
-    def transcribe_from_url(self, video_url: str) -> str:
-        """Download video to disk and transcribe with compression if needed"""
+    def transcribe_from_url(self, video_url: str, before_upload: Optional[Callable[[float, str], Optional[str]]] = None) -> str:
+        """Download video, extract its audio track with ffmpeg and transcribe it (see transcribe_audio)"""
+        if get_ffmpeg_binary() is None:
+            # Uploading the video as is would skip the audio hash reuse and the minutes
+            # budget (both need the extracted audio), so refuse instead
+            raise Exception("Erro no download e transcrição: ffmpeg não encontrado, não é possível extrair o áudio")
+        
+        audio = None
+        try:
+            print(f"[DEBUG] Starting streaming extraction from: {video_url}")
+            audio = self.stream_audio_from_url(video_url)
+        except Exception as stream_error:
+            # Non-streamable input (e.g. moov atom at the end): download to disk first
+            print(f"[DEBUG] Streaming falhou ({stream_error}), usando arquivo temporário...")
+        
         video_path = None
         processed_path = None
         try:
-            print(f"[DEBUG] Starting download from: {video_url}")
-            # Download video to temporary file
-            video_path = self.download_video(video_url)
-            original_size = os.path.getsize(video_path) / (1024 * 1024)
-            print(f"[DEBUG] Downloaded to: {video_path}, size: {original_size:.1f}MB")
-            
-            # Check if file needs processing
-            if self.check_file_size_limit(video_path):
-                # File is small enough, use directly
-                processed_path = video_path
-            else:
-                print(f"[DEBUG] Arquivo muito grande ({original_size:.1f}MB), tentando compressão...")
-                
-                if not MOVIEPY_AVAILABLE:
-                    raise Exception(f"Arquivo muito grande ({original_size:.1f}MB). O limite máximo é 25MB. MoviePy não disponível para compressão.")
+            if audio is None:
+                print(f"[DEBUG] Starting download from: {video_url}")
+                # Download video to temporary file
+                video_path = self.download_video(video_url)
+                original_size = os.path.getsize(video_path) / (1024 * 1024)
+                print(f"[DEBUG] Downloaded to: {video_path}, size: {original_size:.1f}MB")
                 
-                try:
-                    # Try audio extraction first (smaller file)
-                    print(f"[DEBUG] Tentando extrair apenas áudio...")
-                    processed_path = self.extract_audio_from_video(video_path)
-                    
-                    audio_size = os.path.getsize(processed_path) / (1024 * 1024)
-                    print(f"[DEBUG] Áudio extraído: {audio_size:.1f}MB")
-                    
-                    if not self.check_file_size_limit(processed_path):
-                        # Audio still too big, try video compression
-                        print(f"[DEBUG] Áudio ainda grande, tentando compressão de vídeo...")
-                        if processed_path != video_path:
-                            os.unlink(processed_path)
-                        
-                        processed_path = self.compress_video(video_path, target_size_mb=20)
-                        compressed_size = os.path.getsize(processed_path) / (1024 * 1024)
-                        
-                        if not self.check_file_size_limit(processed_path):
-                            raise Exception(f"Mesmo após compressão ({compressed_size:.1f}MB), arquivo ainda muito grande. Limite: 25MB.")
-                    
-                except Exception as compression_error:
-                    print(f"[DEBUG] Erro na compressão: {compression_error}")
-                    raise Exception(f"Arquivo muito grande ({original_size:.1f}MB) e falha na compressão: {str(compression_error)}")
+                # Upload just the audio track: ~10x smaller than the MP4
+                processed_path = self.extract_audio_from_video(video_path)
+                os.unlink(video_path)
+                video_path = None
+                audio = open(processed_path, "rb")
             
-            # Transcribe from processed file
-            print(f"[DEBUG] Starting transcription...")
-            final_size = os.path.getsize(processed_path) / (1024 * 1024)
-            print(f"[DEBUG] Processando arquivo de {final_size:.1f}MB")
-            
-            result = self.transcribe_video(processed_path)
+            print(f"[DEBUG] Starting transcription of {audio.seek(0, os.SEEK_END) / (1024 * 1024):.2f}MB of audio...")
+            result = self.transcribe_audio(audio, before_upload)
             print(f"[DEBUG] Transcription successful, length: {len(result)} chars")
             return result
             
+        except TranscriptionCancelled:
+            raise
         except Exception as e:
             print(f"[DEBUG] Error occurred: {str(e)}")
-            # Clean up in case of error
+            raise Exception(f"Erro no download e transcrição: {str(e)}")
+        finally:
+            if audio is not None:
+                audio.close()
             for path in [video_path, processed_path]:
                 if path and os.path.exists(path):
                     try:
@@ -344,4 +470,3 @@ class OpenAIService:
                         print(f"[DEBUG] Cleaned up temp file: {path}")
                     except:
                         pass
-            raise Exception(f"Erro no download e transcrição: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+from ..models import Influencer, Owner, TikTokVideo
+
+SORT_FIELDS = ("views", "period_views", "views_change_pct", "videos", "period_videos", "engagement_rate", "influencers")
+
+
+class OwnerStats:
+    """
+    Performance of each owner (recruiter) over their influencers' videos.
+
+    Everything comes from one grouped query over `owners` LEFT JOIN
+    `influencers` (on the indexed owner_id) LEFT JOIN `tiktok_videos`:
+    all-time totals plus the same metrics for the last `days` days and the
+    `days` before that (FILTER clauses on published_at), so a leaderboard
+    never loads video rows.
+    """
+
+    def __init__(self, days: int = 30):
+        self.days = days
+
+    def leaderboard(self, db: Session, sort_by: str = "views") -> List[Dict[str, Any]]:
+        """Every owner, best first by `sort_by` (one of SORT_FIELDS), with rank"""
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Invalid sort_by '{sort_by}' (allowed: {', '.join(SORT_FIELDS)})")
+
+        owners = [self._to_dict(row) for row in self._query(db).all()]
+        owners.sort(key=lambda owner: (self._sort_value(owner, sort_by), owner["total_views"]), reverse=True)
+        for rank, owner in enumerate(owners, start=1):
+            owner["rank"] = rank
+        return owners
+
+    def stats(self, db: Session, owner: str) -> Dict[str, Any]:
+        """Same metrics for one owner (zeros if there is no owner with that name)"""
+        row = self._query(db).filter(Owner.name == owner).first()
+        return self._to_dict(row) if row else self._to_dict(None, owner=owner)
+
+    def _query(self, db: Session):
+        now = datetime.now(timezone.utc)
+        period_start = now - timedelta(days=self.days)
+        previous_start = period_start - timedelta(days=self.days)
+
+        in_period = TikTokVideo.published_at >= period_start
+        in_previous = and_(TikTokVideo.published_at >= previous_start, TikTokVideo.published_at < period_start)
+        interactions = TikTokVideo.like_count + TikTokVideo.comment_count + TikTokVideo.share_count
+
+        return db.query(
+            Owner.name.label("owner"),
+            func.count(func.distinct(Influencer.id)).label("influencers"),
+            func.count(func.distinct(Influencer.id)).filter(Influencer.status == "active").label("active_influencers"),
+            func.count(TikTokVideo.id).label("total_videos"),
+            func.coalesce(func.sum(TikTokVideo.view_count), 0).label("total_views"),
+            func.coalesce(func.sum(TikTokVideo.like_count), 0).label("total_likes"),
+            func.coalesce(func.sum(TikTokVideo.comment_count), 0).label("total_comments"),
+            func.coalesce(func.sum(TikTokVideo.share_count), 0).label("total_shares"),
+            func.count(TikTokVideo.id).filter(in_period).label("period_videos"),
+            func.coalesce(func.sum(TikTokVideo.view_count).filter(in_period), 0).label("period_views"),
+            func.coalesce(func.sum(interactions).filter(in_period), 0).label("period_interactions"),
+            func.count(func.distinct(TikTokVideo.eldorado_username)).filter(in_period).label("period_posting_influencers"),
+            func.count(TikTokVideo.id).filter(in_previous).label("previous_videos"),
+            func.coalesce(func.sum(TikTokVideo.view_count).filter(in_previous), 0).label("previous_views"),
+            func.coalesce(func.sum(interactions).filter(in_previous), 0).label("previous_interactions"),
+            func.count(func.distinct(TikTokVideo.eldorado_username)).filter(in_previous).label("previous_posting_influencers")
+        ).outerjoin(
+            Influencer, Influencer.owner_id == Owner.id
+        ).outerjoin(
+            TikTokVideo, TikTokVideo.eldorado_username == Influencer.eldorado_username
+        ).group_by(Owner.id, Owner.name)
+
+    def _to_dict(self, row, owner: Optional[str] = None) -> Dict[str, Any]:
+        value = lambda name: int(getattr(row, name) or 0) if row is not None else 0
+        total_interactions = value("total_likes") + value("total_comments") + value("total_shares")
+        period_views, previous_views = value("period_views"), value("previous_views")
+        return {
+            "owner": row.owner if row is not None else owner,
+            "influencers": value("influencers"),
+            "active_influencers": value("active_influencers"),
+            "total_videos": value("total_videos"),
+            "total_views": value("total_views"),
+            "total_likes": value("total_likes"),
+            "total_comments": value("total_comments"),
+            "total_shares": value("total_shares"),
+            "engagement_rate": self._rate(total_interactions, value("total_views")),
+            "period_days": self.days,
+            "period": {
+                "videos": value("period_videos"),
+                "views": period_views,
+                "engagement_rate": self._rate(value("period_interactions"), period_views),
+                "posting_influencers": value("period_posting_influencers")
+            },
+            "previous_period": {
+                "videos": value("previous_videos"),
+                "views": previous_views,
+                "engagement_rate": self._rate(value("previous_interactions"), previous_views),
+                "posting_influencers": value("previous_posting_influencers")
+            },
+            "videos_change": value("period_videos") - value("previous_videos"),
+            "views_change_pct": round((period_views - previous_views) / previous_views * 100, 2) if previous_views else None
+        }
+
+    @staticmethod
+    def _rate(interactions: int, views: int) -> float:
+        """(likes + comments + shares) / views * 100"""
+        return round(interactions / views * 100, 2) if views else 0.0
+
+    @staticmethod
+    def _sort_value(owner: Dict[str, Any], sort_by: str) -> float:
+        if sort_by == "views":
+            return owner["total_views"]
+        if sort_by == "videos":
+            return owner["total_videos"]
+        if sort_by in ("period_views", "period_videos"):
+            return owner["period"][sort_by.split("_")[1]]
+        if sort_by == "views_change_pct":
+            # Owners without a previous period to compare go last
+            return owner["views_change_pct"] if owner["views_change_pct"] is not None else float("-inf")
+        return owner[sort_by]
@@ -1,6 +1,6 @@
 import requests
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from ..core.config import settings
 
 
@@ -27,6 +27,18 @@ class ScrapTikService:
         Returns:
             User ID string if found, None otherwise
         """
+        user_id, error = self.lookup_user_id(username)
+        if error:
+            print(f"Error getting user ID for {username}: {error}")
+        return user_id
+    
+    def lookup_user_id(self, username: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Same lookup as get_user_id_from_username, but says why it failed
+        
+        Returns:
+            (user_id, None) if found, (None, error message) otherwise
+        """
         url = f"https://{settings.rapidapi_host}/username-to-id"
         params = {"username": username.replace("@", "")}
         
@@ -36,24 +48,21 @@ class ScrapTikService:
             result = response.json()
             
             # Try different possible response formats
-            if 'uid' in result:
-                return result['uid']
-            elif 'user_id' in result:
-                return result['user_id']
-            elif 'data' in result and 'user_id' in result['data']:
-                return result['data']['user_id']
-            elif 'id' in result:
-                return result['id']
+            if result.get('uid'):
+                return str(result['uid']), None
+            elif result.get('user_id'):
+                return str(result['user_id']), None
+            elif isinstance(result.get('data'), dict) and result['data'].get('user_id'):
+                return str(result['data']['user_id']), None
+            elif result.get('id'):
+                return str(result['id']), None
             else:
-                print(f"Unexpected response format: {result}")
-                return None
+                return None, f"Unexpected response format: {str(result)[:300]}"
                 
         except requests.RequestException as e:
-            print(f"Error getting user ID for {username}: {e}")
-            return None
+            return None, f"Request failed: {e}"
         except Exception as e:
-            print(f"Unexpected error for {username}: {e}")
-            return None
+            return None, f"Unexpected error: {e}"
     
     def get_user_posts(self, user_id: str, count: int = None) -> Optional[Dict[str, Any]]:
         """
@@ -219,18 +228,19 @@ class ScrapTikService:
             print(f"Unexpected error getting video info: {e}")
             return None
 
-    def get_eldorado_videos(self, username: str) -> List[Dict[str, Any]]:
+    def get_eldorado_videos(self, username: str, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Complete pipeline: username → user_id → posts → filter El Dorado videos
         
         Args:
             username: TikTok username
+            user_id: TikTok user ID when already known (skips the username lookup)
             
         Returns:
             List of sponsored videos ready for database insertion
         """
         # Step 1: Get user ID
-        user_id = self.get_user_id_from_username(username)
+        user_id = user_id or self.get_user_id_from_username(username)
         if not user_id:
             return []
         
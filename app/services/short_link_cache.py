@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy.dialects.postgresql import insert
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import ShortLink
+
+
+class ShortLinkCache:
+    """
+    Short link → expanded URL, resolved over the network at most once.
+
+    Lookups go through an in-process LRU (`short_link_cache_size` entries), then
+    the `short_links` table, shared by every worker and kept across restarts.
+    Only misses in both pay the redirect, and concurrent requests for the same
+    link wait for a single resolution. Redirects don't change, so entries never
+    expire; failed resolutions are not cached.
+    """
+
+    _entries: "OrderedDict[str, str]" = OrderedDict()
+    _lock = threading.Lock()
+    _inflight: Dict[str, List[Any]] = {}  # short_url → [lock, threads holding or waiting for it]
+    _stats = {"memory_hits": 0, "db_hits": 0, "resolved": 0, "failed": 0}
+
+    def get_or_resolve(self, short_url: str, resolve: Callable[[], Optional[str]]) -> Optional[str]:
+        """Cached expansion of `short_url` (normalized), calling `resolve` only if never seen"""
+        expanded_url = self._memory_get(short_url, count=True)
+        if expanded_url:
+            return expanded_url
+
+        with self._key_lock(short_url):
+            # Another request may have resolved it while we waited
+            expanded_url = self._memory_get(short_url, count=False)
+            if expanded_url:
+                self._count("memory_hits")
+                return expanded_url
+
+            expanded_url = self._db_get(short_url)
+            if expanded_url:
+                self._count("db_hits")
+                self._memory_set(short_url, expanded_url)
+                return expanded_url
+
+            expanded_url = resolve()
+            if not expanded_url:
+                self._count("failed")
+                return None
+
+            self._count("resolved")
+            self._memory_set(short_url, expanded_url)
+            self._db_set(short_url, expanded_url)
+            return expanded_url
+
+    def prefetch(self, short_urls: Iterable[str]) -> None:
+        """Load the stored expansions of many links into memory with one query"""
+        with self._lock:
+            missing = {short_url for short_url in short_urls if short_url not in self._entries}
+        if not missing:
+            return
+        db = SessionLocal()
+        try:
+            rows = db.query(ShortLink.short_url, ShortLink.expanded_url).filter(
+                ShortLink.short_url.in_(missing)
+            ).all()
+        except Exception as e:
+            print(f"[DEBUG] Erro ao ler cache de short links: {e}")
+            return
+        finally:
+            db.close()
+        for row in rows:
+            self._memory_set(row.short_url, row.expanded_url)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = sum(self._stats.values())
+            hits = self._stats["memory_hits"] + self._stats["db_hits"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        """Drop the in-process entries (the table is kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def _memory_get(self, short_url: str, count: bool) -> Optional[str]:
+        with self._lock:
+            expanded_url = self._entries.get(short_url)
+            if expanded_url:
+                self._entries.move_to_end(short_url)
+                if count:
+                    self._stats["memory_hits"] += 1
+            return expanded_url
+
+    def _memory_set(self, short_url: str, expanded_url: str) -> None:
+        with self._lock:
+            self._entries[short_url] = expanded_url
+            self._entries.move_to_end(short_url)
+            while len(self._entries) > settings.short_link_cache_size:
+                self._entries.popitem(last=False)
+
+    @contextmanager
+    def _key_lock(self, short_url: str) -> Iterator[None]:
+        """
+        Hold the per-link lock. Locks are reference counted and dropped by the last
+        thread to leave, so only links being resolved right now have one and a lock
+        is never forgotten while someone holds or waits for it.
+        """
+        with self._lock:
+            entry = self._inflight.setdefault(short_url, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._inflight[short_url]
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self._stats[stat] += 1
+
+    @staticmethod
+    def _db_get(short_url: str) -> Optional[str]:
+        db = SessionLocal()
+        try:
+            row = db.query(ShortLink.expanded_url).filter(ShortLink.short_url == short_url).first()
+            return row.expanded_url if row else None
+        except Exception as e:
+            print(f"[DEBUG] Erro ao ler cache de short links: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _db_set(short_url: str, expanded_url: str) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(insert(ShortLink).values(
+                short_url=short_url, expanded_url=expanded_url[:1000]
+            ).on_conflict_do_nothing(index_elements=[ShortLink.short_url]))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[DEBUG] Erro ao salvar cache de short links: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,207 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import InfluencerIds
+from .scraptik import ScrapTikService
+
+
+class RateLimiter:
+    """Thread-safe limiter: at most `per_second` calls start per second, across all threads"""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until this caller's slot comes up (slots are handed out in order)"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TikTokIdResolver:
+    """
+    Look up the TikTok ID of every influencer that has a TikTok username but no ID.
+
+    Lookups run `tiktok_id_workers` at a time and never faster than
+    `tiktok_id_requests_per_second` (ScrapTik quota). Results are written back
+    one batch at a time with a single UPDATE ... FROM (VALUES ...): found IDs are
+    stored, failures get their error and attempt count on `influencer_ids`, so a
+    later run retries them until `tiktok_id_max_attempts`.
+    """
+
+    _running = threading.Lock()  # One resolution run per process
+
+    def __init__(self, workers: int = None, requests_per_second: float = None, max_attempts: int = None):
+        self.workers = workers or settings.tiktok_id_workers
+        self.requests_per_second = requests_per_second or settings.tiktok_id_requests_per_second
+        self.max_attempts = max_attempts or settings.tiktok_id_max_attempts
+
+    def candidates_query(self, db: Session, retry_failed: bool = False):
+        """Influencers missing a TikTok ID, those never tried first"""
+        query = db.query(InfluencerIds).filter(
+            InfluencerIds.tiktok_username.isnot(None),
+            InfluencerIds.tiktok_id.is_(None)
+        )
+        if not retry_failed:
+            query = query.filter(InfluencerIds.tiktok_id_attempts < self.max_attempts)
+        return query.order_by(InfluencerIds.tiktok_id_attempts, InfluencerIds.eldorado_username)
+
+    def status(self, db: Session) -> Dict[str, Any]:
+        """Counts of influencers by TikTok ID state (one query)"""
+        has_username = InfluencerIds.tiktok_username.isnot(None)
+        missing_id = InfluencerIds.tiktok_id.is_(None)
+        row = db.query(
+            func.count().filter(has_username, InfluencerIds.tiktok_id.isnot(None)).label("resolved"),
+            func.count().filter(has_username, missing_id,
+                                InfluencerIds.tiktok_id_attempts < self.max_attempts).label("pending"),
+            func.count().filter(has_username, missing_id,
+                                InfluencerIds.tiktok_id_attempts >= self.max_attempts).label("given_up"),
+            func.count().filter(has_username, missing_id,
+                                InfluencerIds.tiktok_id_error.isnot(None)).label("with_errors")
+        ).one()
+        return {
+            "running": self.is_running(),
+            "resolved": row.resolved,
+            "pending": row.pending,
+            "given_up": row.given_up,
+            "with_errors": row.with_errors,
+            "max_attempts": self.max_attempts
+        }
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._running.locked()
+
+    def start_in_background(self, retry_failed: bool = False, limit: Optional[int] = None) -> bool:
+        """Start a run in a thread; False if one is already running"""
+        if not self._running.acquire(blocking=False):
+            return False
+        threading.Thread(
+            target=self._run_and_release, kwargs={"retry_failed": retry_failed, "limit": limit},
+            daemon=True, name="tiktok-id-resolver"
+        ).start()
+        return True
+
+    def run(self, retry_failed: bool = False, limit: Optional[int] = None,
+            usernames: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Resolve the pending influencers (blocking)
+
+        Args:
+            retry_failed: also retry influencers that reached tiktok_id_max_attempts
+            limit: resolve at most this many influencers
+            usernames: only these eldorado usernames
+
+        Raises:
+            RuntimeError: when another run is in progress in this process
+        """
+        if not self._running.acquire(blocking=False):
+            raise RuntimeError("A TikTok ID resolution run is already in progress")
+        return self._run_and_release(retry_failed=retry_failed, limit=limit, usernames=usernames)
+
+    def _run_and_release(self, retry_failed: bool = False, limit: Optional[int] = None,
+                         usernames: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Body of a run; the caller holds `_running`"""
+        summary = {"processed": 0, "resolved": 0, "failed": 0, "errors": []}
+        try:
+            db = SessionLocal()
+            try:
+                query = self.candidates_query(db, retry_failed=retry_failed)
+                if usernames is not None:
+                    query = query.filter(InfluencerIds.eldorado_username.in_(usernames))
+                if limit:
+                    query = query.limit(limit)
+                pending = query.with_entities(InfluencerIds.eldorado_username, InfluencerIds.tiktok_username).all()
+            finally:
+                db.close()
+
+            if not pending:
+                return summary
+
+            print(f"[DEBUG] TikTok IDs: resolvendo {len(pending)} influenciadores "
+                  f"({self.workers} workers, {self.requests_per_second}/s)")
+            limiter = RateLimiter(self.requests_per_second)
+            scraptik = ScrapTikService()
+            batch_size = settings.tiktok_id_batch_size
+
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tiktok-id") as executor:
+                for start in range(0, len(pending), batch_size):
+                    batch = pending[start:start + batch_size]
+                    outcomes = list(executor.map(
+                        lambda row: self._lookup(scraptik, limiter, row.eldorado_username, row.tiktok_username),
+                        batch
+                    ))
+                    self._write_back(outcomes)
+
+                    summary["processed"] += len(outcomes)
+                    for eldorado_username, _, tiktok_id, error in outcomes:
+                        if tiktok_id:
+                            summary["resolved"] += 1
+                        else:
+                            summary["failed"] += 1
+                            summary["errors"].append({"eldorado_username": eldorado_username, "error": error})
+                    print(f"[DEBUG] TikTok IDs: {summary['processed']}/{len(pending)} processados, "
+                          f"{summary['resolved']} encontrados, {summary['failed']} falhas")
+            return summary
+        except Exception as e:
+            print(f"[DEBUG] TikTok IDs: execução interrompida: {e}")
+            raise
+        finally:
+            self._running.release()
+
+    @staticmethod
+    def _lookup(scraptik: ScrapTikService, limiter: RateLimiter,
+                eldorado_username: str, tiktok_username: str) -> Tuple[str, str, Optional[str], Optional[str]]:
+        """(eldorado_username, tiktok_username, tiktok_id, error)"""
+        limiter.wait()
+        tiktok_id, error = scraptik.lookup_user_id(tiktok_username)
+        if not tiktok_id and not error:
+            error = f"TikTok ID not found for '{tiktok_username}'"
+        return eldorado_username, tiktok_username, tiktok_id, error
+
+    @staticmethod
+    def _write_back(outcomes: List[Tuple[str, str, Optional[str], Optional[str]]]) -> None:
+        """One UPDATE for the whole batch; rows whose TikTok username changed meanwhile are left alone"""
+        if not outcomes:
+            return
+        values = ", ".join(
+            f"(:username_{i}, :tiktok_username_{i}, :tiktok_id_{i}, :error_{i})" for i in range(len(outcomes))
+        )
+        params = {}
+        for i, (eldorado_username, tiktok_username, tiktok_id, error) in enumerate(outcomes):
+            params.update({
+                f"username_{i}": eldorado_username,
+                f"tiktok_username_{i}": tiktok_username,
+                f"tiktok_id_{i}": tiktok_id,
+                f"error_{i}": error[:1000] if error else None
+            })
+
+        db = SessionLocal()
+        try:
+            db.execute(text(f"""
+                UPDATE influencer_ids AS i SET
+                    tiktok_id = COALESCE(v.tiktok_id, i.tiktok_id),
+                    tiktok_id_error = v.error,
+                    tiktok_id_attempts = CASE WHEN v.tiktok_id IS NULL THEN i.tiktok_id_attempts + 1 ELSE 0 END,
+                    tiktok_id_attempted_at = now(),
+                    updated_at = now()
+                FROM (VALUES {values}) AS v (eldorado_username, tiktok_username, tiktok_id, error)
+                WHERE i.eldorado_username = v.eldorado_username
+                  AND i.tiktok_username = v.tiktok_username
+            """), params)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
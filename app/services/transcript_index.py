@@ -0,0 +1,202 @@
+import hashlib
+import math
+import threading
+from typing import List, Dict, Any, Optional
+from sqlalchemy import func, and_, exists
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models import TikTokVideo, TranscriptionChunk
+from .openai_client import get_openai_client
+
+
+class TranscriptIndex:
+    """
+    Semantic index over video transcriptions.
+
+    Transcriptions are split into overlapping word chunks, embedded in batches with
+    the OpenAI embeddings API and stored in `transcription_chunks`. Search loads the
+    normalized vectors once per index change and ranks chunks by cosine similarity;
+    chunks below `semantic_search_min_score` are not returned, so an unrelated
+    question gets no matches instead of the least dissimilar chunks.
+    """
+
+    # Vectors loaded from the database, shared by all instances of the process
+    _matrix_lock = threading.Lock()
+    _matrix_cache: Dict[str, Any] = {"key": None, "chunks": [], "matrix": None}
+
+    def __init__(self):
+        self.model = settings.embedding_model
+
+    @property
+    def client(self):
+        return get_openai_client()
+
+    @staticmethod
+    def chunk_text(text: str, chunk_words: int = None, overlap: int = None) -> List[str]:
+        """Split text into chunks of `chunk_words` words overlapping by `overlap` words"""
+        chunk_words = chunk_words or settings.embedding_chunk_words
+        overlap = min(overlap if overlap is not None else settings.embedding_chunk_overlap, chunk_words - 1)
+        words = text.split()
+        if not words:
+            return []
+
+        chunks = []
+        step = chunk_words - overlap
+        for start in range(0, len(words), step):
+            chunks.append(" ".join(words[start:start + chunk_words]))
+            if start + chunk_words >= len(words):
+                break
+        return chunks
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings in batches of `embedding_batch_size` inputs per API call"""
+        embeddings = []
+        batch_size = settings.embedding_batch_size
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            response = self.client.embeddings.create(model=self.model, input=batch)
+            # The API may return items out of order, sort by their input index
+            embeddings.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return embeddings
+
+    def pending_videos_query(self, db: Session):
+        """Videos with a transcription that has no chunks for its current content"""
+        indexed = exists().where(and_(
+            TranscriptionChunk.video_id == TikTokVideo.id,
+            TranscriptionChunk.transcription_md5 == func.md5(TikTokVideo.transcription),
+            TranscriptionChunk.embedding_model == self.model
+        ))
+        return db.query(TikTokVideo).filter(
+            TikTokVideo.transcription.isnot(None),
+            TikTokVideo.transcription != "",
+            ~indexed
+        )
+
+    def index_videos(self, db: Session, videos: List[TikTokVideo]) -> Dict[str, int]:
+        """Chunk, embed and store the transcriptions of the given videos (replacing old chunks)"""
+        pending = []
+        for video in videos:
+            if not video.transcription:
+                continue
+            chunks = self.chunk_text(video.transcription)
+            if chunks:
+                md5 = hashlib.md5(video.transcription.encode("utf-8")).hexdigest()
+                pending.append((video, md5, chunks))
+
+        if not pending:
+            return {"videos_indexed": 0, "chunks_indexed": 0}
+
+        # One batched embedding pass over the chunks of every video
+        all_chunks = [chunk for _, _, chunks in pending for chunk in chunks]
+        vectors = iter(self.embed(all_chunks))
+
+        for video, md5, chunks in pending:
+            db.query(TranscriptionChunk).filter(
+                TranscriptionChunk.video_id == video.id
+            ).delete(synchronize_session=False)
+
+            for chunk_index, content in enumerate(chunks):
+                db.add(TranscriptionChunk(
+                    video_id=video.id,
+                    chunk_index=chunk_index,
+                    content=content,
+                    embedding=next(vectors),
+                    embedding_model=self.model,
+                    transcription_md5=md5
+                ))
+
+        db.commit()
+        print(f"[DEBUG] Indexados {len(all_chunks)} trechos de {len(pending)} transcrições")
+        return {"videos_indexed": len(pending), "chunks_indexed": len(all_chunks)}
+
+    def index_pending(self, db: Session, limit: int = 200) -> Dict[str, int]:
+        """Incrementally index only transcriptions that are new or changed"""
+        videos = self.pending_videos_query(db).limit(limit).all()
+        result = self.index_videos(db, videos)
+        result["remaining"] = self.pending_videos_query(db).count()
+        return result
+
+    def search(self, db: Session, query: str, k: int = 5, min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Return the top-k chunks most similar to the query (cosine >= min_score), at most one per video"""
+        min_score = settings.semantic_search_min_score if min_score is None else min_score
+        if not query.strip():
+            return []
+
+        chunks, matrix = self._load_vectors(db)
+        if not chunks:
+            return []
+
+        query_vector = self._normalize(self.embed([query])[0])
+
+        if matrix is not None:
+            import numpy as np
+            scores = matrix @ np.asarray(query_vector, dtype=np.float32)
+            ranking = [int(i) for i in np.argsort(-scores)]
+            score_of = lambda i: float(scores[i])
+        else:
+            scores = [sum(a * b for a, b in zip(chunk["vector"], query_vector)) for chunk in chunks]
+            ranking = sorted(range(len(chunks)), key=lambda i: scores[i], reverse=True)
+            score_of = lambda i: scores[i]
+
+        results = []
+        seen_videos = set()
+        for i in ranking:
+            if score_of(i) < min_score:
+                break  # Ranked best first, everything after scores lower
+            chunk = chunks[i]
+            if chunk["video_id"] in seen_videos:
+                continue
+            seen_videos.add(chunk["video_id"])
+            results.append({
+                "video_id": chunk["video_id"],
+                "chunk_index": chunk["chunk_index"],
+                "content": chunk["content"],
+                "score": round(score_of(i), 4)
+            })
+            if len(results) >= k:
+                break
+
+        return results
+
+    def _load_vectors(self, db: Session):
+        """Load (and cache until the index changes) all chunk vectors of the current model"""
+        count, last_created = db.query(
+            func.count(TranscriptionChunk.id),
+            func.max(TranscriptionChunk.created_at)
+        ).filter(TranscriptionChunk.embedding_model == self.model).one()
+        key = f"{self.model}:{count}:{last_created}"
+
+        with self._matrix_lock:
+            cache = TranscriptIndex._matrix_cache
+            if cache["key"] == key:
+                return cache["chunks"], cache["matrix"]
+
+            rows = db.query(
+                TranscriptionChunk.video_id,
+                TranscriptionChunk.chunk_index,
+                TranscriptionChunk.content,
+                TranscriptionChunk.embedding
+            ).filter(TranscriptionChunk.embedding_model == self.model).all()
+
+            chunks = [{
+                "video_id": row.video_id,
+                "chunk_index": row.chunk_index,
+                "content": row.content,
+                "vector": self._normalize(row.embedding)
+            } for row in rows]
+
+            matrix = None
+            try:
+                import numpy as np
+                if chunks:
+                    matrix = np.asarray([chunk.pop("vector") for chunk in chunks], dtype=np.float32)
+            except ImportError:
+                print("[WARNING] numpy não disponível - busca semântica usando Python puro")
+
+            cache.update({"key": key, "chunks": chunks, "matrix": matrix})
+            return chunks, matrix
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> List[float]:
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
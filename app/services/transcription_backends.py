@@ -0,0 +1,136 @@
+import io
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import BinaryIO, List, Optional, Tuple, Union
+from ..core.config import settings
+from .openai_client import get_openai_client
+
+# (filename, content): the name tells the engine the container format
+AudioFile = Tuple[str, Union[bytes, BinaryIO]]
+
+# Caps concurrent Whisper API uploads across requests, jobs, chunks and backfill workers
+WHISPER_SLOTS = threading.BoundedSemaphore(settings.whisper_max_concurrent_requests)
+
+
+class TranscriptionBackend(ABC):
+    """Speech-to-text engine used by OpenAIService"""
+
+    name = "base"
+    max_file_size: Optional[int] = None  # Upload limit in bytes, None when unlimited
+    max_workers = settings.transcription_max_parallel_chunks  # Files transcribed at the same time by transcribe_many
+
+    @abstractmethod
+    def transcribe(self, audio: AudioFile) -> str:
+        """Transcribe one audio file"""
+
+    def transcribe_many(self, audios: List[AudioFile]) -> List[str]:
+        """Transcribe several files (e.g. chunks of one long audio), results in input order"""
+        if len(audios) == 1:
+            return [self.transcribe(audios[0])]
+        workers = min(self.max_workers, len(audios))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.transcribe, audios))
+
+    def warm_up(self) -> None:
+        """Load whatever the engine needs before the first request"""
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """OpenAI Whisper API (whisper-1)"""
+
+    name = "openai"
+    max_file_size = 25 * 1024 * 1024  # 25MB limit for OpenAI
+
+    def transcribe(self, audio: AudioFile) -> str:
+        filename, content = audio
+        if isinstance(content, bytes):
+            content = io.BytesIO(content)
+        with WHISPER_SLOTS:
+            transcription = get_openai_client().audio.transcriptions.create(
+                model="whisper-1",
+                file=(filename, content),
+                language="pt"  # Portuguese
+            )
+        return transcription.text
+
+
+@lru_cache(maxsize=1)
+def get_local_whisper_model():
+    """Load the faster-whisper model once per process and keep it resident"""
+    try:
+        from faster_whisper import WhisperModel
+    except ImportError:
+        raise Exception("faster-whisper não instalado - use TRANSCRIPTION_BACKEND=openai ou instale faster-whisper")
+
+    print(f"[DEBUG] Carregando modelo Whisper local '{settings.local_whisper_model}' "
+          f"({settings.local_whisper_compute_type}, {settings.local_whisper_workers} workers)...")
+    return WhisperModel(
+        settings.local_whisper_model,
+        device="cpu",
+        compute_type=settings.local_whisper_compute_type,
+        cpu_threads=settings.local_whisper_cpu_threads,
+        num_workers=settings.local_whisper_workers  # Concurrent transcribe() calls on the same weights
+    )
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    faster-whisper (CTranslate2, int8 on CPU) running in-process: no API cost,
+    no network and no rate limits. The model stays loaded for the life of the
+    process. Batching here means two things, not several files per model call:
+    transcribe_many runs `max_workers` per-file transcribe() calls at once on
+    the same weights, and within each file BatchedInferencePipeline (when the
+    installed faster-whisper has it) decodes the audio windows in batches.
+    """
+
+    name = "local"
+    max_workers = settings.local_whisper_workers  # Matches the model's num_workers
+
+    def __init__(self):
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
+
+    def pipeline(self):
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                model = get_local_whisper_model()
+                try:
+                    from faster_whisper import BatchedInferencePipeline
+                    self._pipeline = BatchedInferencePipeline(model=model)
+                except ImportError:
+                    print("[WARNING] faster-whisper sem BatchedInferencePipeline - decodificação sem lotes")
+                    self._pipeline = model
+            return self._pipeline
+
+    def warm_up(self) -> None:
+        self.pipeline()
+
+    def transcribe(self, audio: AudioFile) -> str:
+        _, content = audio
+        if isinstance(content, bytes):
+            content = io.BytesIO(content)
+
+        pipeline = self.pipeline()
+        options = {"language": "pt", "vad_filter": True}
+        if pipeline is not get_local_whisper_model():
+            options["batch_size"] = settings.local_whisper_batch_size
+        segments, _ = pipeline.transcribe(content, **options)
+        # Segments are generated lazily, decoding happens while iterating
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+TRANSCRIPTION_BACKENDS = {
+    "openai": OpenAIWhisperBackend,
+    "local": LocalWhisperBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_transcription_backend(name: str = None) -> TranscriptionBackend:
+    """Backend configured by TRANSCRIPTION_BACKEND (one shared instance per name)"""
+    name = name or settings.transcription_backend
+    if name not in TRANSCRIPTION_BACKENDS:
+        raise Exception(f"Backend de transcrição desconhecido: {name}")
+    return TRANSCRIPTION_BACKENDS[name]()
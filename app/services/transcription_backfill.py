@@ -0,0 +1,341 @@
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import TikTokVideo, TranscriptionBackfillRun
+from .openai_service import TranscriptionCancelled
+from .transcription_service import TranscriptionService, TransientTranscriptionError
+
+
+class AudioBudget:
+    """Thread-safe budget of audio seconds sent to Whisper"""
+
+    def __init__(self, limit_seconds: float, used_seconds: float = 0.0):
+        self.limit_seconds = limit_seconds
+        self.used_seconds = used_seconds
+        self.exhausted = used_seconds >= limit_seconds
+        self._lock = threading.Lock()
+
+    def reserve(self, seconds: float) -> None:
+        """Account for `seconds` of audio, or cancel the upload if they don't fit"""
+        with self._lock:
+            if self.used_seconds + seconds > self.limit_seconds:
+                self.exhausted = True
+                raise TranscriptionCancelled(
+                    f"Orçamento de áudio esgotado ({self.used_seconds / 60:.1f} de {self.limit_seconds / 60:.0f} min)"
+                )
+            self.used_seconds += seconds
+
+
+class TranscriptionBackfill:
+    """
+    Transcribe every video that has no transcription yet, most-viewed first.
+
+    Up to `backfill_workers` videos are downloaded/transcribed at once (Whisper calls
+    are further capped by `whisper_max_concurrent_requests`), and each run stops when
+    its audio minutes budget is spent. Progress lives in `transcription_backfill_runs`
+    and on the videos themselves: a video is marked when a run picks it, failures are
+    counted per video, so an interrupted run resumes where it stopped and videos that
+    keep failing are eventually skipped.
+
+    A working run beats its `updated_at` heartbeat at least every HEARTBEAT_SECONDS.
+    Videos are claimed exclusively (`transcription_claimed_by`, FOR UPDATE SKIP
+    LOCKED), so concurrent runs never pay Whisper twice for the same video, and a
+    run whose heartbeat went stale (its process died) can be taken over.
+    """
+
+    HEARTBEAT_SECONDS = 60
+    # A running run whose heartbeat is older than this was lost with its process
+    STALE_HEARTBEAT_MINUTES = 10
+    ACTIVE_STATUSES = ("running", "stopping")
+
+    def __init__(self, workers: int = None, max_attempts: int = None):
+        self.workers = workers or settings.backfill_workers
+        self.max_attempts = max_attempts or settings.backfill_max_attempts
+
+    def candidates_query(self, db: Session):
+        """Untranscribed videos that haven't failed too often, most-viewed first"""
+        return db.query(TikTokVideo).filter(
+            TikTokVideo.transcription.is_(None),
+            TikTokVideo.transcription_attempts < self.max_attempts
+        ).order_by(TikTokVideo.view_count.desc().nullslast(), TikTokVideo.id)
+
+    def create_run(self, db: Session, budget_minutes: float = None, max_videos: int = None) -> TranscriptionBackfillRun:
+        run = TranscriptionBackfillRun(
+            status="running",
+            budget_minutes=budget_minutes or settings.backfill_budget_minutes,
+            max_videos=max_videos,
+            audio_seconds=0,
+            videos_transcribed=0,
+            videos_failed=0
+        )
+        db.add(run)
+        db.commit()
+        db.refresh(run)
+        return run
+
+    def get_run(self, db: Session, run_id: UUID) -> Optional[TranscriptionBackfillRun]:
+        return db.query(TranscriptionBackfillRun).filter(TranscriptionBackfillRun.id == run_id).first()
+
+    def stale_before(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(minutes=self.STALE_HEARTBEAT_MINUTES)
+
+    def is_alive(self, run: TranscriptionBackfillRun) -> bool:
+        """A process is still working on the run (active status and fresh heartbeat)"""
+        return run.status in self.ACTIVE_STATUSES and run.updated_at is not None and run.updated_at >= self.stale_before()
+
+    def take_over(self, db: Session, run_id: UUID, budget_minutes: float = None, max_videos: int = None) -> bool:
+        """
+        Atomically mark a run as running for the caller, who then calls run(). False
+        while another process is still working on it (active with a fresh heartbeat).
+        """
+        values = {"status": "running", "finished_at": None, "updated_at": func.now()}
+        if budget_minutes:
+            values["budget_minutes"] = budget_minutes
+        if max_videos:
+            values["max_videos"] = max_videos
+        taken = db.query(TranscriptionBackfillRun).filter(
+            TranscriptionBackfillRun.id == run_id,
+            or_(
+                TranscriptionBackfillRun.status.notin_(self.ACTIVE_STATUSES),
+                TranscriptionBackfillRun.updated_at < self.stale_before()
+            )
+        ).update(values, synchronize_session=False)
+        db.commit()
+        return bool(taken)
+
+    def resume_stale(self) -> int:
+        """Resume runs left running by a dead process (called on startup); stale stopping runs are just stopped"""
+        db = SessionLocal()
+        try:
+            runs = db.query(TranscriptionBackfillRun).filter(
+                TranscriptionBackfillRun.status.in_(self.ACTIVE_STATUSES),
+                TranscriptionBackfillRun.updated_at < self.stale_before()
+            ).all()
+            resumed = 0
+            for run in runs:
+                if run.status == "stopping":
+                    self._release_claims(db, run.id)
+                    run.status = "stopped"
+                    run.finished_at = func.now()
+                    db.commit()
+                elif self.take_over(db, run.id):
+                    self.start_in_background(run.id)
+                    resumed += 1
+            if resumed:
+                print(f"[DEBUG] {resumed} execuções de backfill retomadas")
+            return resumed
+        finally:
+            db.close()
+
+    def start_in_background(self, run_id: UUID) -> None:
+        threading.Thread(target=self.run, args=(run_id,), daemon=True, name=f"backfill-{run_id}").start()
+
+    def run(self, run_id: UUID) -> Dict[str, Any]:
+        """
+        Process a run until done, out of budget, at max_videos or stopped (blocking).
+        New runs come from create_run, resumed ones from a successful take_over.
+        """
+        db = SessionLocal()
+        pending = deque()  # Claimed but not started yet
+        try:
+            run = self.get_run(db, run_id)
+            run.status = "running"
+            run.finished_at = None
+            run.updated_at = func.now()
+            db.commit()
+            # Videos this run claimed before it was interrupted go back to the pool
+            self._release_claims(db, run.id)
+
+            budget = AudioBudget(run.budget_minutes * 60, run.audio_seconds)
+            sync_cache: Dict[str, List[Dict[str, Any]]] = {}
+            processed = run.videos_transcribed + run.videos_failed
+            in_flight = {}
+
+            print(f"[DEBUG] Backfill {run.id}: iniciando com {self.workers} workers, "
+                  f"orçamento {run.budget_minutes:.0f} min ({run.audio_seconds / 60:.1f} usados)")
+
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as executor:
+                while True:
+                    db.refresh(run)  # Picks up a stop request from the API
+                    limit_reached = run.max_videos and processed + len(in_flight) >= run.max_videos
+                    if run.status == "stopping" or budget.exhausted or limit_reached:
+                        # Stop feeding new videos but let the in-flight ones finish
+                        self._release(db, list(pending))
+                        pending.clear()
+                    else:
+                        # Keep every worker busy
+                        while len(in_flight) < self.workers:
+                            if run.max_videos and processed + len(in_flight) >= run.max_videos:
+                                break
+                            if not pending:
+                                pending.extend(self._claim_next(db, run, self.workers * 4))
+                                if not pending:
+                                    break
+                            video_id = pending.popleft()
+                            in_flight[executor.submit(self._transcribe_one, video_id, budget, sync_cache)] = video_id
+
+                    if not in_flight:
+                        break
+
+                    # Wake up at least every HEARTBEAT_SECONDS to beat while long videos run
+                    done, _ = wait(list(in_flight), timeout=self.HEARTBEAT_SECONDS, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        in_flight.pop(future)
+                        outcome, error = future.result()
+                        if outcome == "transcribed":
+                            run.videos_transcribed += 1
+                            processed += 1
+                        elif outcome == "failed":
+                            run.videos_failed += 1
+                            run.last_error = (error or "")[:1000]
+                            processed += 1
+                    run.audio_seconds = budget.used_seconds
+                    run.updated_at = func.now()  # Heartbeat
+                    db.commit()
+
+                    if done:
+                        print(f"[DEBUG] Backfill {run.id}: {run.videos_transcribed} transcritos, "
+                              f"{run.videos_failed} falhas, {run.audio_seconds / 60:.1f}/{run.budget_minutes:.0f} min")
+
+            if run.status == "stopping":
+                run.status = "stopped"
+            elif budget.exhausted:
+                run.status = "budget_exhausted"
+            else:
+                run.status = "completed"
+            run.audio_seconds = budget.used_seconds
+            run.finished_at = func.now()
+            db.commit()
+            print(f"[DEBUG] Backfill {run.id} finalizado: {run.status}")
+            return self.summary(db, run)
+
+        except BaseException as e:
+            # Also covers Ctrl+C from the CLI: leave the run resumable
+            db.rollback()
+            self._release(db, list(pending))
+            run = self.get_run(db, run_id)
+            if run:
+                run.status = "stopped" if isinstance(e, KeyboardInterrupt) else "failed"
+                run.last_error = str(e)[:1000] or run.last_error
+                run.finished_at = func.now()
+                db.commit()
+            raise
+        finally:
+            db.close()
+
+    def summary(self, db: Session, run: TranscriptionBackfillRun) -> Dict[str, Any]:
+        return {
+            "run_id": run.id,
+            "status": run.status,
+            "budget_minutes": run.budget_minutes,
+            "audio_minutes": round(run.audio_seconds / 60, 1),
+            "max_videos": run.max_videos,
+            "videos_transcribed": run.videos_transcribed,
+            "videos_failed": run.videos_failed,
+            "last_error": run.last_error,
+            "remaining_videos": self.candidates_query(db).count(),
+            "created_at": run.created_at,
+            "finished_at": run.finished_at
+        }
+
+    def _claim_next(self, db: Session, run: TranscriptionBackfillRun, limit: int) -> List[UUID]:
+        """
+        Claim the next videos this run hasn't tried yet. Videos claimed by another
+        live run are skipped; rows being claimed concurrently are skipped too
+        (FOR UPDATE SKIP LOCKED), so a video is never claimed twice.
+        """
+        live_runs = db.query(TranscriptionBackfillRun.id).filter(
+            TranscriptionBackfillRun.status.in_(self.ACTIVE_STATUSES),
+            TranscriptionBackfillRun.updated_at >= self.stale_before(),
+            TranscriptionBackfillRun.id != run.id
+        )
+        rows = self.candidates_query(db).filter(
+            or_(
+                TikTokVideo.transcription_attempted_at.is_(None),
+                TikTokVideo.transcription_attempted_at < run.created_at,
+                # Left behind by another run (a dead one, per the filter below)
+                and_(TikTokVideo.transcription_claimed_by.isnot(None), TikTokVideo.transcription_claimed_by != run.id)
+            ),
+            or_(
+                TikTokVideo.transcription_claimed_by.is_(None),
+                TikTokVideo.transcription_claimed_by.notin_(live_runs)
+            )
+        ).with_entities(TikTokVideo.id).limit(limit).with_for_update(skip_locked=True).all()
+        video_ids = [row.id for row in rows]
+        if video_ids:
+            db.query(TikTokVideo).filter(TikTokVideo.id.in_(video_ids)).update(
+                {"transcription_attempted_at": func.now(), "transcription_claimed_by": run.id},
+                synchronize_session=False
+            )
+        db.commit()  # Also ends the FOR UPDATE transaction when nothing was claimed
+        return video_ids
+
+    def _release(self, db: Session, video_ids: List[UUID]) -> None:
+        """Unmark videos that were picked but not started, so a resumed run takes them"""
+        if video_ids:
+            db.query(TikTokVideo).filter(TikTokVideo.id.in_(video_ids)).update(
+                {"transcription_attempted_at": None, "transcription_claimed_by": None}, synchronize_session=False
+            )
+            db.commit()
+
+    def _release_claims(self, db: Session, run_id: UUID) -> None:
+        """Unmark every video a run claimed and never finished (it died or stopped mid-way)"""
+        db.query(TikTokVideo).filter(TikTokVideo.transcription_claimed_by == run_id).update(
+            {"transcription_attempted_at": None, "transcription_claimed_by": None}, synchronize_session=False
+        )
+        db.commit()
+
+    @staticmethod
+    def _finish_claim(db: Session, video_id: UUID) -> None:
+        """The run is done with the video (transcribed or failed): other runs may take it again"""
+        db.query(TikTokVideo).filter(TikTokVideo.id == video_id).update(
+            {"transcription_claimed_by": None}, synchronize_session=False
+        )
+        db.commit()
+
+    def _transcribe_one(self, video_id: UUID, budget: AudioBudget,
+                        sync_cache: Dict[str, List[Dict[str, Any]]]) -> tuple:
+        """Returns (outcome, error) with outcome transcribed | failed | skipped"""
+        db = SessionLocal()
+        try:
+            video = db.query(TikTokVideo).filter(TikTokVideo.id == video_id).first()
+            if not video or video.transcription:
+                self._finish_claim(db, video_id)
+                return "skipped", None
+
+            try:
+                response = TranscriptionService(sync_cache=sync_cache).transcribe_video(
+                    db, video, reserve_audio=budget.reserve
+                )
+                error = None if response.success else response.message
+            except TranscriptionCancelled:
+                # Out of budget: not the video's fault, a later run retries it
+                db.rollback()
+                self._release(db, [video_id])
+                return "skipped", None
+            except TransientTranscriptionError as e:
+                error = e.response.message
+            except Exception as e:
+                db.rollback()
+                error = str(e)
+
+            if error is None:
+                self._finish_claim(db, video_id)
+                return "transcribed", None
+
+            video = db.query(TikTokVideo).filter(TikTokVideo.id == video_id).first()
+            video.transcription_attempts = (video.transcription_attempts or 0) + 1
+            video.transcription_error = error[:2000]
+            video.transcription_claimed_by = None
+            db.commit()
+            print(f"[DEBUG] Backfill: falha no vídeo {video.tiktok_video_id}: {error[:200]}")
+            return "failed", error
+        finally:
+            db.close()
@@ -0,0 +1,224 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models import TranscriptionJob
+from ..schemas import VideoTranscriptionResponse
+from .transcription_service import TranscriptionService, TransientTranscriptionError
+
+
+class TranscriptionJobQueue:
+    """
+    Run transcriptions in the background on a pool of `transcription_workers` threads.
+
+    Jobs live in the `transcription_jobs` table, so any API worker can report their
+    status. Transient download/Whisper failures are retried up to
+    `transcription_job_max_attempts` times with exponential backoff, stored in
+    `next_attempt_at` so every worker (and a restarted process) respects it; other
+    errors fail the job right away. A job is claimed with a conditional UPDATE so a
+    resubmitted job never runs twice.
+    """
+
+    # A running job whose heartbeat (updated_at, touched on every progress step) is
+    # older than this was lost with its process
+    STALE_HEARTBEAT_MINUTES = 10
+    # Also beats between progress steps (long downloads, Whisper on long audio)
+    HEARTBEAT_SECONDS = 60
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=settings.transcription_workers,
+                    thread_name_prefix="transcription"
+                )
+            return cls._executor
+
+    def submit(self, db: Session, tiktok_url: str) -> TranscriptionJob:
+        """Queue a transcription, reusing an unfinished job for the same URL"""
+        tiktok_url = tiktok_url.strip()
+        job = db.query(TranscriptionJob).filter(
+            TranscriptionJob.tiktok_url == tiktok_url,
+            TranscriptionJob.status.in_(["queued", "running"])
+        ).first()
+        if job:
+            return job
+
+        job = TranscriptionJob(tiktok_url=tiktok_url, status="queued", step="Na fila...", attempts=0)
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+
+        self.executor().submit(self._run, job.id)
+        print(f"[DEBUG] Job de transcrição {job.id} enfileirado")
+        return job
+
+    def get(self, db: Session, job_id: UUID) -> Optional[TranscriptionJob]:
+        return db.query(TranscriptionJob).filter(TranscriptionJob.id == job_id).first()
+
+    def resume_pending(self) -> int:
+        """
+        Re-queue jobs left queued or running by a previous process (called on startup).
+        A running job is only taken over once its heartbeat is stale, so jobs still
+        making progress in another API worker are left alone.
+        """
+        stale_before = datetime.now(timezone.utc) - timedelta(minutes=self.STALE_HEARTBEAT_MINUTES)
+        db = SessionLocal()
+        try:
+            db.query(TranscriptionJob).filter(
+                TranscriptionJob.status == "running",
+                TranscriptionJob.updated_at < stale_before
+            ).update({
+                "status": "queued",
+                "step": "Na fila...",
+                "updated_at": func.now()
+            }, synchronize_session=False)
+            db.commit()
+
+            # Queued jobs are claimed with a conditional UPDATE, so one that another
+            # worker already picked up is skipped by _run; jobs waiting for a retry
+            # are scheduled for when their backoff ends
+            jobs = db.query(TranscriptionJob.id, self._seconds_until_due()).filter(
+                TranscriptionJob.status == "queued"
+            ).all()
+            for job_id, wait in jobs:
+                self._schedule(job_id, float(wait))
+            if jobs:
+                print(f"[DEBUG] {len(jobs)} jobs de transcrição retomados")
+            return len(jobs)
+        finally:
+            db.close()
+
+    def _claim(self, db: Session, job_id: UUID) -> Optional[TranscriptionJob]:
+        """Atomically move a due queued job to running, None if another worker got it or its backoff isn't over"""
+        claimed = db.query(TranscriptionJob).filter(
+            TranscriptionJob.id == job_id,
+            TranscriptionJob.status == "queued",
+            or_(TranscriptionJob.next_attempt_at.is_(None), TranscriptionJob.next_attempt_at <= func.now())
+        ).update({
+            "status": "running",
+            "attempts": TranscriptionJob.attempts + 1,
+            "next_attempt_at": None,
+            "started_at": func.now(),
+            "updated_at": func.now(),
+            "error": None
+        }, synchronize_session=False)
+        db.commit()
+        return self.get(db, job_id) if claimed else None
+
+    def _run(self, job_id: UUID) -> None:
+        db = SessionLocal()
+        try:
+            job = self._claim(db, job_id)
+            if job is None:
+                # Woken before the backoff ended (clock skew with the database): wait the rest
+                wait = db.query(self._seconds_until_due()).filter(
+                    TranscriptionJob.id == job_id,
+                    TranscriptionJob.status == "queued",
+                    TranscriptionJob.next_attempt_at > func.now()
+                ).scalar()
+                if wait:
+                    self._schedule(job_id, float(wait))
+                return
+            stop_heartbeat = self._start_heartbeat(job_id)
+
+            def progress(step: str) -> None:
+                # Also the heartbeat resume_pending checks, even when the step text repeats
+                job.step = step
+                job.updated_at = func.now()
+                db.commit()
+
+            try:
+                response = TranscriptionService(progress=progress).transcribe(db, job.tiktok_url)
+                self._finish(db, job, response)
+            except TransientTranscriptionError as e:
+                self._retry_or_fail(db, job, e.response)
+            except Exception as e:
+                # Not a download/Whisper hiccup: retrying would fail the same way
+                db.rollback()
+                print(f"[DEBUG] Erro no job de transcrição {job_id}: {e}")
+                self._finish(db, job, VideoTranscriptionResponse(
+                    success=False,
+                    message=f"Erro interno: {str(e)}"
+                ))
+            finally:
+                stop_heartbeat.set()
+        except Exception as e:
+            print(f"[DEBUG] Erro ao executar job de transcrição {job_id}: {e}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _seconds_until_due():
+        """Seconds until a job's next_attempt_at by the database clock (0 when due)"""
+        return func.greatest(func.coalesce(
+            func.extract("epoch", TranscriptionJob.next_attempt_at - func.now()), 0
+        ), 0)
+
+    def _schedule(self, job_id: UUID, delay: float) -> None:
+        """Run the job now, or after `delay` seconds"""
+        if delay <= 0:
+            self.executor().submit(self._run, job_id)
+            return
+        timer = threading.Timer(delay, lambda: self.executor().submit(self._run, job_id))
+        timer.daemon = True
+        timer.start()
+
+    def _start_heartbeat(self, job_id: UUID) -> threading.Event:
+        """Touch the job's updated_at every HEARTBEAT_SECONDS while it runs; set the event to stop"""
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.HEARTBEAT_SECONDS):
+                db = SessionLocal()  # Sessions are not shared across threads
+                try:
+                    db.query(TranscriptionJob).filter(
+                        TranscriptionJob.id == job_id,
+                        TranscriptionJob.status == "running"
+                    ).update({"updated_at": func.now()}, synchronize_session=False)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    print(f"[DEBUG] Erro no heartbeat do job {job_id}: {e}")
+                finally:
+                    db.close()
+
+        threading.Thread(target=beat, daemon=True, name=f"transcription-heartbeat-{job_id}").start()
+        return stop
+
+    def _finish(self, db: Session, job: TranscriptionJob, response: VideoTranscriptionResponse) -> None:
+        job.status = "succeeded" if response.success else "failed"
+        job.step = "Concluído!"
+        job.error = None if response.success else response.message
+        job.result = response.model_dump_json()
+        job.video_id = response.video_info.id if response.video_info else job.video_id
+        job.finished_at = func.now()
+        db.commit()
+        print(f"[DEBUG] Job de transcrição {job.id} finalizado: {job.status}")
+
+    def _retry_or_fail(self, db: Session, job: TranscriptionJob, response: VideoTranscriptionResponse) -> None:
+        if job.attempts >= settings.transcription_job_max_attempts:
+            self._finish(db, job, response)
+            return
+
+        job_id = job.id  # The session is closed by the time the timer fires
+        delay = settings.transcription_job_retry_backoff_seconds * 2 ** (job.attempts - 1)
+        job.status = "queued"
+        # Stored so no worker claims it early; if this process dies, resume_pending
+        # picks the retry up on the next startup
+        job.next_attempt_at = func.now() + timedelta(seconds=delay)
+        job.step = f"Falhou, nova tentativa em {delay}s..."
+        job.error = response.message
+        db.commit()
+        print(f"[DEBUG] Job {job_id}: tentativa {job.attempts} falhou, nova tentativa em {delay}s")
+
+        self._schedule(job_id, delay)
@@ -0,0 +1,294 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models import TikTokVideo
+from ..schemas import TikTokVideoResponse, VideoTranscriptionResponse
+from .scraptik import ScrapTikService
+from .openai_service import OpenAIService, TranscriptionCancelled
+from .url_expander import URLExpander
+from .video_url_index import VideoUrlIndex
+from .transcript_index import TranscriptIndex
+
+
+class TransientTranscriptionError(Exception):
+    """Download/Whisper failure that may succeed on a later attempt"""
+
+    def __init__(self, response: VideoTranscriptionResponse):
+        super().__init__(response.message)
+        self.response = response
+
+
+class TranscriptionService:
+    """
+    Resolve a TikTok URL to a registered video and transcribe it. Shared by the
+    synchronous endpoint and the job workers.
+
+    Tiered lookup: a saved transcription is returned right away; otherwise the
+    stored download URLs are probed and the (paid) ScrapTik re-sync only happens
+    when none of them still works.
+    """
+
+    def __init__(self, progress: Optional[Callable[[str], None]] = None,
+                 sync_cache: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.progress = progress or (lambda step: None)
+        # ScrapTik results by username, shared by a batch so each influencer is synced once
+        self.sync_cache = sync_cache
+        self.url_index = VideoUrlIndex()
+
+    def resolve_video_id(self, db: Session, tiktok_url: str) -> Optional[str]:
+        """Expand a (possibly short) TikTok URL, extract the video ID and remember the mapping"""
+        expanded_url = URLExpander.expand_tiktok_url(tiktok_url)
+        print(f"[DEBUG] Expanded URL: {expanded_url}")
+
+        video_id = URLExpander.parse_video_id(expanded_url)
+        print(f"[DEBUG] Extracted video ID: {video_id}")
+
+        if video_id:
+            # Next time this link resolves from the index, without the redirect
+            try:
+                self.url_index.record(db, video_id, [tiktok_url, expanded_url])
+                db.commit()
+            except Exception as index_error:
+                db.rollback()
+                print(f"[DEBUG] Erro ao salvar alias do URL: {index_error}")
+        return video_id
+
+    def find_video(self, db: Session, tiktok_url: str) -> Tuple[Optional[str], Optional[TikTokVideo]]:
+        """
+        Find the registered video a URL points to: (tiktok_video_id, video).
+        Full URLs are parsed locally; links without the ID (short links) are one
+        indexed lookup when known, otherwise expanded once and indexed.
+        """
+        video_id = URLExpander.parse_video_id(tiktok_url)
+        if not video_id:
+            video_id, video = self.url_index.lookup(db, tiktok_url)
+            if video_id:
+                print(f"[DEBUG] URL já indexado: vídeo {video_id}")
+                return video_id, video
+
+            video_id = self.resolve_video_id(db, tiktok_url)
+        if not video_id:
+            return None, None
+
+        video = db.query(TikTokVideo).filter(
+            TikTokVideo.tiktok_video_id == video_id
+        ).first()
+        return video_id, video
+
+    def refresh_video_urls(self, db: Session, video: TikTokVideo) -> None:
+        """Re-sync the influencer with ScrapTik to get fresh (non-expired) download URLs"""
+        print(f"[DEBUG] Sincronizando vídeos para {video.eldorado_username} antes da transcrição...")
+        try:
+            if self.sync_cache is not None and video.tiktok_username in self.sync_cache:
+                sponsored_videos = self.sync_cache[video.tiktok_username]
+            else:
+                scraptik = ScrapTikService()
+                sponsored_videos = scraptik.get_eldorado_videos(video.tiktok_username)
+                if self.sync_cache is not None:
+                    self.sync_cache[video.tiktok_username] = sponsored_videos
+
+            # Update the specific video with fresh URLs if found
+            for video_data in sponsored_videos:
+                if video_data['tiktok_video_id'] == video.tiktok_video_id:
+                    video.watermark_free_url = video_data['watermark_free_url']
+                    video.watermark_free_url_alt1 = video_data.get('watermark_free_url_alt1')
+                    video.watermark_free_url_alt2 = video_data.get('watermark_free_url_alt2')
+                    db.commit()
+                    print(f"[DEBUG] URLs atualizados para vídeo {video.tiktok_video_id}")
+                    break
+        except Exception as sync_error:
+            print(f"[DEBUG] Erro na sincronização prévia: {sync_error}")
+            # Continue mesmo se a sincronização falhar
+
+        # Refresh video object to get updated URLs
+        db.refresh(video)
+
+    def transcribe(self, db: Session, tiktok_url: str) -> VideoTranscriptionResponse:
+        """
+        Transcribe a TikTok video and save the transcription
+
+        Raises:
+            TransientTranscriptionError: when every download URL or the Whisper call failed
+        """
+        tiktok_url = tiktok_url.strip()
+
+        # Basic URL validation
+        if not tiktok_url or not ("tiktok.com" in tiktok_url or "vm.tiktok.com" in tiktok_url):
+            return VideoTranscriptionResponse(
+                success=False,
+                message="URL inválida. Forneça uma URL válida do TikTok."
+            )
+
+        print(f"[DEBUG] Original URL: {tiktok_url}")
+        self.progress("Verificando se é vídeo de influenciador...")
+        video_id, video = self.find_video(db, tiktok_url)
+
+        if not video_id:
+            return VideoTranscriptionResponse(
+                success=False,
+                message="Não foi possível extrair o ID do vídeo da URL fornecida. Tente usar uma URL válida do TikTok."
+            )
+
+        if not video:
+            return VideoTranscriptionResponse(
+                success=True,
+                message="Este vídeo não é de um influenciador cadastrado.",
+                video_found=False,
+                is_influencer_video=False
+            )
+
+        return self.transcribe_video(db, video)
+
+    def transcribe_video(self, db: Session, video: TikTokVideo,
+                         reserve_audio: Optional[Callable[[float], None]] = None) -> VideoTranscriptionResponse:
+        """
+        Transcribe a registered video and save the transcription
+
+        Args:
+            reserve_audio: called with the audio duration before paying for Whisper
+
+        Raises:
+            TransientTranscriptionError: when every download URL or the Whisper call failed
+            TranscriptionCancelled: when `reserve_audio` refused the audio
+        """
+        # Fast path: already transcribed, no sync or download needed
+        if video.transcription:
+            return VideoTranscriptionResponse(
+                success=True,
+                message="Transcrição já existe (cache)!",
+                video_found=True,
+                is_influencer_video=True,
+                eldorado_username=video.eldorado_username,
+                transcription=video.transcription,
+                video_info=TikTokVideoResponse.model_validate(video)
+            )
+
+        # Only pay for a ScrapTik re-sync when none of the stored URLs still works
+        self.progress("Verificando links do vídeo...")
+        healthy_url, errors_by_url = OpenAIService().pick_healthy_video_url(self.video_urls(video))
+        synced = healthy_url is None
+
+        if synced:
+            print(f"[DEBUG] Nenhum URL salvo respondeu ({errors_by_url}), buscando URLs frescos...")
+            self.progress("Atualizando links do vídeo...")
+            self.refresh_video_urls(db, video)
+
+            if not video.watermark_free_url:
+                return VideoTranscriptionResponse(
+                    success=False,
+                    message="URL do vídeo sem marca d'água não disponível mesmo após sincronização.",
+                    video_found=True,
+                    is_influencer_video=True,
+                    eldorado_username=video.eldorado_username
+                )
+
+        audio = {}
+
+        def before_upload(duration: float, audio_hash: str) -> Optional[str]:
+            # Same audio already transcribed for another video (repost, duplicate): reuse it for free
+            audio["hash"] = audio_hash
+            duplicate = db.query(TikTokVideo.transcription).filter(
+                TikTokVideo.audio_hash == audio_hash,
+                TikTokVideo.transcription.isnot(None),
+                TikTokVideo.id != video.id
+            ).first()
+            if duplicate:
+                print(f"[DEBUG] Áudio idêntico já transcrito ({audio_hash[:12]}), reutilizando transcrição")
+                return duplicate.transcription
+            # A retry after re-syncing uploads the same audio: the budget counts it once
+            if reserve_audio and "reserved" not in audio:
+                reserve_audio(duration)
+                audio["reserved"] = duration
+            return None
+
+        try:
+            transcription = self.transcribe_video_urls(video, healthy_url, before_upload, synced=synced)
+        except TransientTranscriptionError:
+            if synced:
+                raise
+            # The stored URL answered the probe but the download, ffmpeg or Whisper failed
+            # with it: re-sync once and retry with fresh URLs
+            print(f"[DEBUG] Falha com os URLs salvos, buscando URLs frescos e tentando de novo...")
+            self.progress("Atualizando links do vídeo...")
+            self.refresh_video_urls(db, video)
+            transcription = self.transcribe_video_urls(video, None, before_upload, synced=True)
+
+        # Save transcription to database
+        self.progress("Salvando transcrição...")
+        video.transcription = transcription
+        video.audio_hash = audio.get("hash")
+        db.commit()
+
+        # Index the new transcription for semantic search (never fails the request)
+        try:
+            TranscriptIndex().index_videos(db, [video])
+        except Exception as index_error:
+            db.rollback()
+            print(f"[DEBUG] Erro ao indexar transcrição: {index_error}")
+
+        return VideoTranscriptionResponse(
+            success=True,
+            message="Transcrição realizada com sucesso!",
+            video_found=True,
+            is_influencer_video=True,
+            eldorado_username=video.eldorado_username,
+            transcription=transcription,
+            video_info=TikTokVideoResponse.model_validate(video)
+        )
+
+    @staticmethod
+    def video_urls(video: TikTokVideo) -> List[Tuple[str, str]]:
+        """Candidate download URLs: primary, alt1, alt2"""
+        urls = []
+        if video.watermark_free_url:
+            urls.append(("primary", video.watermark_free_url))
+        if video.watermark_free_url_alt1:
+            urls.append(("alt1", video.watermark_free_url_alt1))
+        if video.watermark_free_url_alt2:
+            urls.append(("alt2", video.watermark_free_url_alt2))
+        return urls
+
+    def transcribe_video_urls(self, video: TikTokVideo, healthy_url: Optional[Tuple[str, str]] = None,
+                              before_upload: Optional[Callable[[float, str], Optional[str]]] = None,
+                              synced: bool = False) -> str:
+        """
+        Transcribe from the first healthy of the video's download URLs (already probed or not)
+
+        Args:
+            synced: the URLs were just refreshed from ScrapTik (only changes the error message)
+        """
+        openai_service = OpenAIService()
+        urls_to_try = self.video_urls(video)
+        errors_by_url = {}
+
+        if healthy_url is None:
+            # Probe all URLs at once and transcribe from the first healthy one,
+            # instead of paying download retries/timeouts for each expired link
+            print(f"[DEBUG] Testando {len(urls_to_try)} URLs em paralelo...")
+            healthy_url, errors_by_url = openai_service.pick_healthy_video_url(urls_to_try)
+
+        if healthy_url:
+            url_type, video_url = healthy_url
+            try:
+                self.progress("Baixando e transcrevendo com OpenAI...")
+                print(f"[DEBUG] Usando URL {url_type}: {video_url[:50]}...")
+                transcription = openai_service.transcribe_from_url(video_url, before_upload)
+                print(f"[DEBUG] SUCESSO com URL {url_type}!")
+                return transcription
+            except TranscriptionCancelled:
+                raise
+            except Exception as url_error:
+                print(f"[DEBUG] FALHA com URL {url_type}: {url_error}")
+                errors_by_url[url_type] = str(url_error)
+
+        # If we get here, ALL URLs failed
+        error_details = [f"{url_type}: {error_msg}" for url_type, error_msg in errors_by_url.items()]
+        print(f"[DEBUG] Todos os {len(urls_to_try)} URLs falharam:\n" + "\n".join(error_details))
+
+        after_sync = " mesmo após sincronização" if synced else ""
+        raise TransientTranscriptionError(VideoTranscriptionResponse(
+            success=False,
+            message=f"Não foi possível transcrever o vídeo. Todos os URLs falharam{after_sync}. Últimos erros: {'; '.join([f'{k}={v}' for k, v in errors_by_url.items()])}",
+            video_found=True,
+            is_influencer_video=True,
+            eldorado_username=video.eldorado_username
+        ))
@@ -1,10 +1,27 @@
+import re
 import requests
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from ..core.config import settings
+from .short_link_cache import ShortLinkCache
+from .video_url_index import VideoUrlIndex
+
+# Video ID in every known full URL shape, so only short links need the network:
+#   (www.|m.)tiktok.com/@user/video/<id>, /photo/<id>, m.tiktok.com/v/<id>.html,
+#   /embed/<id>, /embed/v2/<id>, /player/v1/<id>, share URLs with ?aweme_id= / item_id= / share_item_id=
+VIDEO_ID_PATTERN = re.compile(
+    r"/(?:video|photo|v|embed(?:/v\d+)?|player/v\d+)/(\d{5,})(?=[/?#.&]|$)"
+    r"|[?&#](?:aweme_id|item_id|share_item_id)=(\d{5,})"
+)
 
 class URLExpander:
     """Service to expand short URLs, specifically for TikTok vm.tiktok.com links"""
     
+    # Process-wide: every expansion goes through the same LRU + short_links table
+    short_links = ShortLinkCache()
+    
     @staticmethod
     def expand_tiktok_url(url: str) -> str:
         """
@@ -18,41 +35,97 @@ class URLExpander:
         """
         url = url.strip()
         
-        # If it's already a full TikTok URL, return as is
-        if "tiktok.com/@" in url and "/video/" in url:
+        # If the ID can already be parsed (any full URL shape), return as is
+        if URLExpander.parse_video_id(url):
             return url
             
-        # If it's a vm.tiktok.com short URL, expand it
-        if "vm.tiktok.com/" in url:
-            try:
-                # Follow redirects to get the full URL
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1'
-                }
-                
-                # Use HEAD request to get redirect without downloading content
-                response = requests.head(url, allow_redirects=True, timeout=10, headers=headers)
-                
-                # The final URL after all redirects
-                expanded_url = response.url
-                
-                # Clean up any tracking parameters but keep essential ones
-                if "tiktok.com/@" in expanded_url and "/video/" in expanded_url:
-                    # Extract the clean URL parts
-                    parsed = urlparse(expanded_url)
-                    clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-                    return clean_url
-                    
-                return expanded_url
-                
-            except Exception as e:
-                print(f"[DEBUG] Failed to expand URL {url}: {str(e)}")
-                # Return original URL if expansion fails
-                return url
+        # If it's a short URL (vm.tiktok.com), expand it once and cache the result
+        short_url = URLExpander.short_url_key(url)
+        if short_url:
+            expanded_url = URLExpander.short_links.get_or_resolve(
+                short_url, lambda: URLExpander.resolve_short_url(url)
+            )
+            # Return original URL if expansion fails
+            return expanded_url or url
         
         # Return original URL if it's not a short URL
         return url
     
+    @staticmethod
+    def short_url_key(url: str) -> Optional[str]:
+        """Normalized short link (cache key), None if the URL is not a short link"""
+        short_url = VideoUrlIndex.normalize(url)
+        return short_url if short_url and VideoUrlIndex.kind_of(short_url) == "short" else None
+    
+    @staticmethod
+    def expand_many(urls: List[str]) -> Dict[str, str]:
+        """
+        Expand many URLs at once: stored short links are loaded with one query and
+        the rest are resolved concurrently over a shared connection pool
+        
+        Returns:
+            Dict[str, str]: original URL → expanded URL (or the original if expansion fails)
+        """
+        urls = list(dict.fromkeys(url.strip() for url in urls))
+        short_urls = {url: URLExpander.short_url_key(url) for url in urls}
+        short_urls = {url: short_url for url, short_url in short_urls.items() if short_url}
+        expanded = {url: url for url in urls if url not in short_urls}
+        if not short_urls:
+            return expanded
+        
+        URLExpander.short_links.prefetch(short_urls.values())
+        
+        workers = min(settings.url_resolve_workers, len(short_urls))
+        with requests.Session() as session:
+            adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            
+            def expand(url: str) -> str:
+                return URLExpander.short_links.get_or_resolve(
+                    short_urls[url], lambda: URLExpander.resolve_short_url(url, session)
+                ) or url
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                expanded.update(zip(short_urls, executor.map(expand, short_urls)))
+        
+        return expanded
+    
+    @staticmethod
+    def resolve_short_url(url: str, session: Optional[requests.Session] = None) -> Optional[str]:
+        """Follow the short link redirects (network), None unless they end on a video URL"""
+        try:
+            # Follow redirects to get the full URL
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 15_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/15.0 Mobile/15E148 Safari/604.1'
+            }
+            
+            # Use HEAD request to get redirect without downloading content
+            response = (session or requests).head(url if "://" in url else f"https://{url}", allow_redirects=True, timeout=10, headers=headers)
+            
+            # The final URL after all redirects
+            expanded_url = response.url
+            
+            # Clean up any tracking parameters but keep essential ones
+            if URLExpander.parse_video_id(expanded_url):
+                # Extract the clean URL parts (unless the ID is only in the query)
+                parsed = urlparse(expanded_url)
+                clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+                return clean_url if URLExpander.parse_video_id(clean_url) else expanded_url
+            
+            print(f"[DEBUG] Short URL {url} did not redirect to a video: {expanded_url}")
+            return None
+            
+        except Exception as e:
+            print(f"[DEBUG] Failed to expand URL {url}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def parse_video_id(url: str) -> Optional[str]:
+        """Video ID of any full URL shape (no network), None for short links and unknown URLs"""
+        match = VIDEO_ID_PATTERN.search(url)
+        return (match.group(1) or match.group(2)) if match else None
+    
     @staticmethod
     def extract_video_id_from_url(url: str) -> Optional[str]:
         """
@@ -65,15 +138,16 @@ class URLExpander:
             Optional[str]: Video ID if found, None otherwise
         """
         try:
-            # First expand the URL if it's a short URL
+            # Fast path: parse full URLs locally
+            video_id = URLExpander.parse_video_id(url)
+            if video_id:
+                return video_id
+            
+            # Last resort: expand the URL if it's a short URL
             expanded_url = URLExpander.expand_tiktok_url(url)
             
             # Extract video ID from expanded URL
-            if "/video/" in expanded_url:
-                video_id = expanded_url.split("/video/")[-1].split("?")[0].split("/")[0]
-                return video_id
-                
-            return None
+            return URLExpander.parse_video_id(expanded_url)
             
         except Exception as e:
             print(f"[DEBUG] Failed to extract video ID from {url}: {str(e)}")
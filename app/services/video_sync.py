@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, Tuple
+from sqlalchemy.orm import Session
+from ..models import TikTokVideo
+from .video_url_index import VideoUrlIndex
+
+
+class VideoSync:
+    """Upsert the sponsored videos returned by ScrapTik for one influencer"""
+
+    def __init__(self):
+        self.url_index = VideoUrlIndex()
+
+    def upsert_videos(self, db: Session, eldorado_username: str, tiktok_username: str,
+                      sponsored_videos: List[Dict[str, Any]]) -> Tuple[int, int, List[str]]:
+        """
+        Insert new videos, refresh metrics and URLs of known ones and index their URLs.
+        The caller commits.
+
+        Returns:
+            (new_videos, updated_videos, errors)
+        """
+        new_videos = 0
+        updated_videos = 0
+        errors = []
+
+        for video_data in sponsored_videos:
+            try:
+                # Check if video already exists
+                existing_video = db.query(TikTokVideo).filter(
+                    TikTokVideo.tiktok_video_id == video_data['tiktok_video_id']
+                ).first()
+
+                if existing_video:
+                    # UPDATE existing video metrics
+                    existing_video.view_count = video_data['view_count']
+                    existing_video.like_count = video_data['like_count']
+                    existing_video.comment_count = video_data['comment_count']
+                    existing_video.share_count = video_data['share_count']
+
+                    # Always update URLs (they might have changed)
+                    existing_video.public_video_url = video_data['public_video_url']
+                    existing_video.watermark_free_url = video_data['watermark_free_url']
+                    existing_video.watermark_free_url_alt1 = video_data.get('watermark_free_url_alt1')
+                    existing_video.watermark_free_url_alt2 = video_data.get('watermark_free_url_alt2')
+
+                    updated_videos += 1
+                else:
+                    # INSERT new sponsored video
+                    db.add(TikTokVideo(
+                        eldorado_username=eldorado_username,
+                        tiktok_username=tiktok_username,
+                        tiktok_video_id=video_data['tiktok_video_id'],
+                        description=video_data['description'],
+                        view_count=video_data['view_count'],
+                        like_count=video_data['like_count'],
+                        comment_count=video_data['comment_count'],
+                        share_count=video_data['share_count'],
+                        public_video_url=video_data['public_video_url'],
+                        watermark_free_url=video_data['watermark_free_url'],
+                        watermark_free_url_alt1=video_data.get('watermark_free_url_alt1'),
+                        watermark_free_url_alt2=video_data.get('watermark_free_url_alt2'),
+                        published_at=video_data['published_at']
+                    ))
+                    new_videos += 1
+
+                self.url_index.record_video(db, tiktok_username, video_data)
+
+            except Exception as e:
+                errors.append(f"Error processing video {video_data.get('tiktok_video_id', 'unknown')}: {str(e)}")
+
+        return new_videos, updated_videos, errors
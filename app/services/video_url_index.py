@@ -0,0 +1,104 @@
+import re
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..models import TikTokVideo, VideoUrlAlias
+
+SHORT_LINK_HOSTS = ("vm.tiktok.com", "vt.tiktok.com")
+# Share URLs carrying the video ID in the query (/share/video?aweme_id=<id>, /link/v2?item_id=<id>)
+ID_QUERY_PARAM = re.compile(r"[?&#]((?:aweme_id|item_id|share_item_id)=\d{5,})")
+
+
+class VideoUrlIndex:
+    """
+    URL → TikTok video ID index (`video_url_aliases`).
+
+    Every URL a video is known by (vm.tiktok.com short links, canonical
+    /@user/video/<id> URLs, ScrapTik share URLs) is stored normalized, so
+    resolving a pasted link is one indexed point query instead of a LIKE scan
+    on `public_video_url` or an HTTP redirect. Filled during video sync and
+    whenever a short link is expanded.
+    """
+
+    @staticmethod
+    def normalize(url: Optional[str]) -> Optional[str]:
+        """
+        Host (without www./m.) + path: scheme, query, fragment and trailing slash
+        don't matter, except a video ID parameter, which is kept as ?<name>=<id>
+        (otherwise every /share/video?aweme_id=... link would be the same alias)
+        """
+        url = (url or "").strip()
+        if not url:
+            return None
+        parsed = urlparse(url if "://" in url else f"https://{url}")
+        host = parsed.netloc.lower().split(":")[0]
+        for prefix in ("www.", "m."):
+            if host.startswith(prefix):
+                host = host[len(prefix):]
+        if not host:
+            return None
+        id_param = ID_QUERY_PARAM.search(url)
+        query = f"?{id_param.group(1)}" if id_param else ""
+        return f"{host}{parsed.path.rstrip('/')}{query}"[:1000]
+
+    @staticmethod
+    def kind_of(alias: str) -> str:
+        host, _, path = alias.partition("/")
+        if host in SHORT_LINK_HOSTS or (host == "tiktok.com" and path.startswith("t/")):
+            return "short"  # vm.tiktok.com/<code>, vt.tiktok.com/<code>, tiktok.com/t/<code>
+        return "canonical" if "/video/" in alias else "share"
+
+    @staticmethod
+    def canonical_url(tiktok_username: str, tiktok_video_id: str) -> str:
+        return f"https://www.tiktok.com/@{tiktok_username}/video/{tiktok_video_id}"
+
+    def lookup(self, db: Session, url: str) -> Tuple[Optional[str], Optional[TikTokVideo]]:
+        """(tiktok_video_id, registered video) for a known URL, (None, None) if never seen"""
+        alias = self.normalize(url)
+        if not alias:
+            return None, None
+        row = db.query(VideoUrlAlias.tiktok_video_id, TikTokVideo).outerjoin(
+            TikTokVideo, TikTokVideo.tiktok_video_id == VideoUrlAlias.tiktok_video_id
+        ).filter(VideoUrlAlias.alias == alias).first()
+        return (row[0], row[1]) if row else (None, None)
+
+    def record(self, db: Session, tiktok_video_id: str, urls: Iterable[Optional[str]]) -> None:
+        """Map URLs to a video ID (upsert, committed by the caller)"""
+        self.record_many(db, [(tiktok_video_id, urls)])
+
+    def record_many(self, db: Session, mappings: Iterable[Tuple[str, Iterable[Optional[str]]]]) -> None:
+        """Upsert several (tiktok_video_id, urls) mappings in one statement"""
+        rows = {}
+        for tiktok_video_id, urls in mappings:
+            for alias in (self.normalize(url) for url in urls):
+                if alias:
+                    rows[alias] = tiktok_video_id  # One row per alias, the statement can't touch it twice
+        if not rows:
+            return
+        statement = insert(VideoUrlAlias).values([
+            {"alias": alias, "tiktok_video_id": tiktok_video_id, "kind": self.kind_of(alias)}
+            for alias, tiktok_video_id in sorted(rows.items())
+        ])
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[VideoUrlAlias.alias],
+            set_={"tiktok_video_id": statement.excluded.tiktok_video_id}
+        ))
+
+    def lookup_many(self, db: Session, urls: Iterable[str]) -> Dict[str, str]:
+        """tiktok_video_id of every already indexed URL, in one query"""
+        aliases = {url: self.normalize(url) for url in urls}
+        wanted = {alias for alias in aliases.values() if alias}
+        if not wanted:
+            return {}
+        known = dict(db.query(VideoUrlAlias.alias, VideoUrlAlias.tiktok_video_id).filter(
+            VideoUrlAlias.alias.in_(wanted)
+        ).all())
+        return {url: known[alias] for url, alias in aliases.items() if alias in known}
+
+    def record_video(self, db: Session, tiktok_username: str, video_data: dict) -> None:
+        """Aliases of a synced video: its share URL and canonical URL"""
+        self.record(db, video_data["tiktok_video_id"], [
+            video_data.get("public_video_url"),
+            self.canonical_url(tiktok_username, video_data["tiktok_video_id"])
+        ])
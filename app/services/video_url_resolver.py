@@ -0,0 +1,82 @@
+from typing import Any, Dict, List
+from sqlalchemy.orm import Session
+from ..models import TikTokVideo
+from .url_expander import URLExpander
+from .video_url_index import VideoUrlIndex
+from .transcription_jobs import TranscriptionJobQueue
+
+
+class VideoUrlResolver:
+    """
+    Match a list of TikTok links against the registered videos in bulk.
+
+    Full URLs are parsed locally; links without the ID (short links) are found with
+    one query on `video_url_aliases` or else expanded concurrently
+    (URLExpander.expand_many), and every video ID is then matched with a single
+    IN query on `tiktok_videos`.
+    """
+
+    def __init__(self):
+        self.url_index = VideoUrlIndex()
+
+    def resolve(self, db: Session, urls: List[str], enqueue_transcriptions: bool = False) -> List[Dict[str, Any]]:
+        """One result per distinct URL, in input order"""
+        urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        valid_urls = [url for url in urls if "tiktok.com" in url]
+        valid_set = set(valid_urls)
+
+        video_ids = {url: URLExpander.parse_video_id(url) for url in valid_urls}
+        video_ids = {url: video_id for url, video_id in video_ids.items() if video_id}
+        video_ids.update(self.url_index.lookup_many(db, [url for url in valid_urls if url not in video_ids]))
+
+        unknown_urls = [url for url in valid_urls if url not in video_ids]
+        if unknown_urls:
+            expanded = URLExpander.expand_many(unknown_urls)
+            new_aliases = []
+            for url in unknown_urls:
+                video_id = URLExpander.parse_video_id(expanded[url])
+                if video_id:
+                    video_ids[url] = video_id
+                    new_aliases.append((video_id, [url, expanded[url]]))
+            try:
+                self.url_index.record_many(db, new_aliases)
+                db.commit()
+            except Exception as index_error:
+                db.rollback()
+                print(f"[DEBUG] Erro ao salvar aliases de URLs: {index_error}")
+
+        videos = {}
+        if video_ids:
+            videos = {
+                video.tiktok_video_id: video
+                for video in db.query(TikTokVideo).filter(
+                    TikTokVideo.tiktok_video_id.in_(set(video_ids.values()))
+                ).all()
+            }
+
+        results = []
+        jobs_by_video = {}
+        for url in urls:
+            video_id = video_ids.get(url)
+            video = videos.get(video_id)
+            result = {
+                "url": url,
+                "tiktok_video_id": video_id,
+                "is_influencer_video": video is not None,
+                "eldorado_username": video.eldorado_username if video else None,
+                "has_transcription": bool(video and video.transcription),
+                "job_id": None,
+                "error": None
+            }
+            if url not in valid_set:
+                result["error"] = "URL inválida. Forneça uma URL válida do TikTok."
+            elif not video_id:
+                result["error"] = "Não foi possível extrair o ID do vídeo da URL fornecida."
+            elif enqueue_transcriptions and video and not video.transcription:
+                # Links to the same video share one job
+                if video_id not in jobs_by_video:
+                    jobs_by_video[video_id] = TranscriptionJobQueue().submit(db, url).id
+                result["job_id"] = jobs_by_video[video_id]
+            results.append(result)
+
+        return results
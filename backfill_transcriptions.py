@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Transcribe every video without a transcription, most-viewed first
+
+Usage:
+    python backfill_transcriptions.py --dry-run                  # show what would be transcribed
+    python backfill_transcriptions.py --budget-minutes 300       # new run, stop after 300 audio minutes
+    python backfill_transcriptions.py --max-videos 50 --workers 4
+    python backfill_transcriptions.py --resume <run_id>          # continue a stopped (or dead) run
+
+Ctrl+C stops after the videos in progress; the run can be resumed later.
+"""
+import argparse
+import sys
+from uuid import UUID
+
+from app.core.database import SessionLocal
+from app.services import TranscriptionBackfill
+
+
+def print_summary(summary):
+    print("=" * 60)
+    print(f"Run:          {summary['run_id']}")
+    print(f"Status:       {summary['status']}")
+    print(f"Transcritos:  {summary['videos_transcribed']}")
+    print(f"Falhas:       {summary['videos_failed']}")
+    print(f"Áudio:        {summary['audio_minutes']:.1f} / {summary['budget_minutes']:.0f} min")
+    print(f"Restantes:    {summary['remaining_videos']}")
+    if summary.get("last_error"):
+        print(f"Último erro:  {summary['last_error'][:200]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill transcriptions of untranscribed videos")
+    parser.add_argument("--budget-minutes", type=float, help="Audio minutes sent to Whisper in this run")
+    parser.add_argument("--max-videos", type=int, help="Stop after this many videos")
+    parser.add_argument("--workers", type=int, help="Videos processed at the same time")
+    parser.add_argument("--resume", type=UUID, metavar="RUN_ID", help="Continue a stopped run")
+    parser.add_argument("--dry-run", action="store_true", help="List the next videos without transcribing")
+    args = parser.parse_args()
+
+    backfill = TranscriptionBackfill(workers=args.workers)
+    db = SessionLocal()
+    try:
+        if args.dry_run:
+            query = backfill.candidates_query(db)
+            print(f"🎯 {query.count()} vídeos sem transcrição")
+            for video in query.limit(args.max_videos or 20):
+                print(f"  {video.view_count or 0:>12,} views  {video.eldorado_username:<25} {video.tiktok_video_id}")
+            return
+
+        if args.resume:
+            run = backfill.get_run(db, args.resume)
+            if not run:
+                print(f"❌ Execução {args.resume} não encontrada")
+                sys.exit(1)
+            if not backfill.take_over(db, run.id, args.budget_minutes, args.max_videos):
+                print(f"❌ Execução {args.resume} ainda está em andamento em outro processo")
+                sys.exit(1)
+        else:
+            run = backfill.create_run(db, args.budget_minutes, args.max_videos)
+        run_id = run.id
+    finally:
+        db.close()
+
+    print(f"🚀 Backfill {run_id} (retome com --resume {run_id})")
+    try:
+        summary = backfill.run(run_id)
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrompido")
+        db = SessionLocal()
+        try:
+            summary = backfill.summary(db, backfill.get_run(db, run_id))
+        finally:
+            db.close()
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark and check of the TikTok video ID parser against tiktok_url_corpus.tsv
+
+Compares URLExpander.parse_video_id (compiled pattern, no network) with the
+previous split-based parser, which only understood /video/<id>.
+
+Usage:
+    python benchmark_url_parser.py                 # check the corpus + time both parsers
+    python benchmark_url_parser.py --iterations 50000
+    python benchmark_url_parser.py --corpus my_urls.tsv
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.services.url_expander import URLExpander
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tiktok_url_corpus.tsv")
+
+
+def legacy_parse(url: str):
+    """Parser before the compiled pattern: only /video/<id>"""
+    if "/video/" in url:
+        return url.split("/video/")[-1].split("?")[0].split("/")[0]
+    return None
+
+
+def load_corpus(path: str):
+    """(url, expected) pairs; expected is a video ID, 'short' or 'none'"""
+    cases = []
+    with open(path, encoding="utf-8") as corpus:
+        for line in corpus:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            url, expected = line.split("\t")
+            cases.append((url, expected))
+    return cases
+
+
+def classify(url: str, parse):
+    """What a parser makes of a URL: the ID, 'short' (needs the network) or 'none'"""
+    video_id = parse(url)
+    if video_id:
+        return video_id
+    return "short" if URLExpander.short_url_key(url) else "none"
+
+
+def time_parser(parse, urls, iterations: int) -> float:
+    """Microseconds per URL"""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for url in urls:
+            parse(url)
+    return (time.perf_counter() - started) / (iterations * len(urls)) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TikTok video ID parser")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="TSV file: url<TAB>expected")
+    parser.add_argument("--iterations", type=int, default=20000, help="Passes over the corpus when timing")
+    args = parser.parse_args()
+
+    cases = load_corpus(args.corpus)
+    urls = [url for url, _ in cases]
+
+    print(f"🔗 TikTok URL parser - {len(cases)} URLs ({os.path.basename(args.corpus)})")
+    print("=" * 70)
+
+    failures = []
+    legacy_missed = 0
+    for url, expected in cases:
+        got = classify(url, URLExpander.parse_video_id)
+        if got != expected:
+            failures.append((url, expected, got))
+
+        if expected not in ("short", "none") and legacy_parse(url) != expected:
+            legacy_missed += 1  # Full URL the old parser couldn't read
+
+    parsed_locally = sum(1 for _, expected in cases if expected not in ("short", "none"))
+    print(f"Parsed locally:         {parsed_locally}")
+    print(f"Short links (network):  {sum(1 for _, expected in cases if expected == 'short')}")
+    print(f"Not video links:        {sum(1 for _, expected in cases if expected == 'none')}")
+    print(f"Legacy parser missed:   {legacy_missed} of {parsed_locally} full URLs")
+
+    regex_us = time_parser(URLExpander.parse_video_id, urls, args.iterations)
+    legacy_us = time_parser(legacy_parse, urls, args.iterations)
+    print(f"\nparse_video_id: {regex_us:.2f} µs/URL")
+    print(f"legacy split:   {legacy_us:.2f} µs/URL (one short link expansion is ~100-500 ms)")
+
+    if failures:
+        print(f"\n❌ {len(failures)} mismatches:")
+        for url, expected, got in failures:
+            print(f"  {url}\n    expected {expected}, got {got}")
+        sys.exit(1)
+    print("\n✅ All corpus URLs parsed as expected")
+
+
+if __name__ == "__main__":
+    main()
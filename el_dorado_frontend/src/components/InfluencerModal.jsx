@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import { X, User, AtSign, Phone, Globe, Crown, Video } from 'lucide-react'
+import { ownerAPI } from '../services/api'
 
 const InfluencerModal = ({ influencer, onClose, onSave }) => {
   const [formData, setFormData] = useState({
@@ -13,7 +14,8 @@ const InfluencerModal = ({ influencer, onClose, onSave }) => {
   const [errors, setErrors] = useState({})
   const [loading, setLoading] = useState(false)
 
-  const owners = [
+  // Owners live in the owners table; this list is only used until it loads
+  const [owners, setOwners] = useState([
     'alejandra',
     'alessandro', 
     'bianca',
@@ -21,7 +23,18 @@ const InfluencerModal = ({ influencer, onClose, onSave }) => {
     'jesus',
     'julia',
     'samuel'
-  ]
+  ])
+
+  useEffect(() => {
+    ownerAPI.getAll()
+      .then(response => {
+        const names = response.data.map(owner => owner.name)
+        if (names.length) {
+          setOwners(names)
+        }
+      })
+      .catch(error => console.error('Error loading owners:', error))
+  }, [])
 
   useEffect(() => {
     if (influencer) {
@@ -18,6 +18,7 @@ const AIAssistant = () => {
   const [inputMessage, setInputMessage] = useState('');
   const [isLoading, setIsLoading] = useState(false);
   const [suggestions, setSuggestions] = useState([]);
+  const [sessionId, setSessionId] = useState(null);
   const messagesEndRef = useRef(null);
   const inputRef = useRef(null);
 
@@ -42,6 +43,19 @@ const AIAssistant = () => {
     }
   };
 
+  // Chat sessions keep the conversation history on the server
+  const ensureSession = async () => {
+    if (sessionId) return sessionId;
+    try {
+      const response = await axios.post(`${API_BASE_URL}/api/v1/ai-assistant/sessions`);
+      setSessionId(response.data.session_id);
+      return response.data.session_id;
+    } catch (error) {
+      console.error('Erro ao criar sessão:', error);
+      return null;
+    }
+  };
+
   const sendMessage = async (message = inputMessage) => {
     if (!message.trim()) return;
 
@@ -57,8 +71,10 @@ const AIAssistant = () => {
     setIsLoading(true);
 
     try {
+      const currentSessionId = await ensureSession();
       const response = await axios.post(`${API_BASE_URL}/api/v1/ai-assistant/chat`, {
-        message: message
+        message: message,
+        session_id: currentSessionId
       });
 
       const botMessage = {
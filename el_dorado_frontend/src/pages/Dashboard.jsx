@@ -70,7 +70,7 @@ const Dashboard = () => {
     try {
       const [statsRes, influencersRes, videosRes] = await Promise.all([
         analyticsAPI.getDashboardStats(),
-        influencerAPI.getAll({ limit: 1000 }),
+        influencerAPI.getAll({ limit: 1000, include: 'stats' }),
         videosAPI.getAll({ limit: 10000 })
       ])
       setStats(statsRes.data)
@@ -87,21 +87,13 @@ const Dashboard = () => {
   // Get top 5 influencers by total views
   const getTopInfluencers = () => {
     return influencers
-      .map(influencer => {
-        const influencerVideos = videos.filter(
-          video => video.eldorado_username === influencer.eldorado_username
-        )
-        const totalViews = influencerVideos.reduce((sum, video) => sum + (video.view_count || 0), 0)
-        const totalLikes = influencerVideos.reduce((sum, video) => sum + (video.like_count || 0), 0)
-        const totalVideos = influencerVideos.length
-        
-        return {
-          ...influencer,
-          totalViews,
-          totalLikes,
-          totalVideos
-        }
-      })
+      .map(influencer => ({
+        ...influencer,
+        // Aggregated by the API (include=stats)
+        totalViews: influencer.stats?.total_views || 0,
+        totalLikes: influencer.stats?.total_likes || 0,
+        totalVideos: influencer.stats?.total_videos || 0
+      }))
       .sort((a, b) => b.totalViews - a.totalViews)
       .slice(0, 5)
   }
@@ -148,12 +140,9 @@ const Dashboard = () => {
         }
       }
       
-      const influencerVideos = videos.filter(v => v.eldorado_username === influencer.eldorado_username)
-      const totalViews = influencerVideos.reduce((sum, v) => sum + (v.view_count || 0), 0)
-      
       countryStats[country].count++
-      countryStats[country].totalViews += totalViews
-      countryStats[country].totalVideos += influencerVideos.length
+      countryStats[country].totalViews += influencer.stats?.total_views || 0
+      countryStats[country].totalVideos += influencer.stats?.total_videos || 0
       countryStats[country].influencers.push(influencer.first_name)
     })
 
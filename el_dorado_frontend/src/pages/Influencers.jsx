@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react'
 import { Plus, Search, Edit, Trash2, ExternalLink, Grid, List } from 'lucide-react'
-import { influencerAPI, videosAPI } from '../services/api'
+import { influencerAPI } from '../services/api'
 import InfluencerModal from '../components/InfluencerModal'
 import toast from 'react-hot-toast'
 
@@ -50,33 +50,24 @@ const Influencers = () => {
         console.log('Update response:', response)
         toast.success('Influencer atualizado!')
       } else {
-        // Create new influencer
-        const response = await influencerAPI.create(data)
+        // Create new influencer; TikTok ID + video sync run on the server in the same request
+        const hasTikTok = Boolean(data.tiktok_username && data.tiktok_username.trim())
+        const response = await influencerAPI.bulkCreate([data], { sync: hasTikTok })
         console.log('Create response:', response)
-        const newInfluencer = response.data
+        const [result] = response.data.results
         
-        toast.success('Influencer criado!')
+        if (result.status === 'existing') {
+          toast.error(`Influencer ${result.eldorado_username} já existe`)
+          return
+        }
+        if (result.status === 'invalid') {
+          toast.error(result.error)
+          return
+        }
         
-        // Auto-sync TikTok ID if tiktok_username exists
-        if (data.tiktok_username && data.tiktok_username.trim()) {
-          try {
-            console.log('Syncing TikTok ID for:', newInfluencer.eldorado_username)
-            await influencerAPI.syncTikTokId(newInfluencer.eldorado_username)
-            toast.success('TikTok ID sincronizado!')
-            
-            // Auto-sync videos after getting TikTok ID
-            try {
-              console.log('Syncing videos for:', newInfluencer.eldorado_username)
-              await videosAPI.syncVideos(newInfluencer.eldorado_username)
-              toast.success('Vídeos sincronizados!')
-            } catch (videoError) {
-              console.error('Error syncing videos:', videoError)
-              toast.error('Erro ao sincronizar vídeos (TikTok ID pode não ter sido encontrado)')
-            }
-          } catch (tiktokError) {
-            console.error('Error syncing TikTok ID:', tiktokError)
-            toast.error('Erro ao sincronizar TikTok ID')
-          }
+        toast.success('Influencer criado!')
+        if (response.data.sync_started) {
+          toast.success('Sincronização do TikTok iniciada!')
         }
       }
       
@@ -1,6 +1,8 @@
 import React, { useState } from 'react';
 import { VideoCameraIcon, MicrophoneIcon, ExclamationCircleIcon, CheckCircleIcon, ClockIcon, DocumentTextIcon } from '@heroicons/react/24/outline';
 
+const JOB_POLL_INTERVAL_MS = 2000;
+
 const VideoTranscription = () => {
   const [tiktokUrl, setTiktokUrl] = useState('');
   const [loading, setLoading] = useState(false);
@@ -27,32 +29,23 @@ const VideoTranscription = () => {
       // Initial progress
       setProgress(10);
 
-      // Simulate gradual progress for better UX
-      const progressInterval = setInterval(() => {
-        setProgress(prev => {
-          if (prev >= 90) return 90; // Stop at 90% until API completes
-          return prev + Math.random() * 15; // Random increments
-        });
-      }, 800);
-
-      // Step updates
-      setTimeout(() => {
-        setProcessStep('Verificando se é vídeo de influenciador...');
-      }, 1000);
-      
-      setTimeout(() => {
-        setProcessStep('Baixando vídeo...');
-      }, 3000);
-      
-      setTimeout(() => {
-        setProcessStep('Transcrevendo com OpenAI...');
-      }, 5000);
-
       const API_BASE_URL = (process.env.NODE_ENV === 'development' || window.location.hostname === 'localhost')
         ? 'http://localhost:8000/api/v1'
         : 'https://influencer-eldorado.up.railway.app/api/v1';
-      
-      const response = await fetch(`${API_BASE_URL}/videos/transcribe`, {
+
+      const readJson = async (response) => {
+        if (!response.ok) {
+          throw new Error(`Erro HTTP: ${response.status}`);
+        }
+        const contentType = response.headers.get('content-type');
+        if (!contentType || !contentType.includes('application/json')) {
+          throw new Error('Resposta da API não é um JSON válido');
+        }
+        return response.json();
+      };
+
+      // Queue the transcription and poll the job instead of holding the request open
+      let job = await readJson(await fetch(`${API_BASE_URL}/videos/transcribe/jobs`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -60,19 +53,16 @@ const VideoTranscription = () => {
         body: JSON.stringify({
           tiktok_url: tiktokUrl
         })
-      });
-
-      if (!response.ok) {
-        throw new Error(`Erro HTTP: ${response.status}`);
-      }
+      }));
 
-      const contentType = response.headers.get('content-type');
-      if (!contentType || !contentType.includes('application/json')) {
-        throw new Error('Resposta da API não é um JSON válido');
+      while (job.status === 'queued' || job.status === 'running') {
+        setProcessStep(job.step || 'Processando...');
+        setProgress(prev => Math.min(prev + Math.random() * 8, 90)); // Stop at 90% until the job finishes
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+        job = await readJson(await fetch(`${API_BASE_URL}/videos/transcribe/jobs/${job.job_id}`));
       }
 
-      const data = await response.json();
-      clearInterval(progressInterval);
+      const data = job.result || { success: false, message: job.error || 'Falha na transcrição.' };
       setProgress(100);
       setProcessStep('Concluído!');
       setResult(data);
@@ -81,7 +71,6 @@ const VideoTranscription = () => {
         setError(data.message);
       }
     } catch (err) {
-      clearInterval(progressInterval);
       console.error('Erro:', err);
       if (err.message.includes('Failed to fetch') || err.message.includes('NetworkError')) {
         setError('Erro de conexão. Verifique se o backend está rodando.');
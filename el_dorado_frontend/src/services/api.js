@@ -13,7 +13,7 @@ const api = axios.create({
 
 // API Methods
 export const influencerAPI = {
-  // Get all influencers
+  // Get all influencers (params.include: 'social_ids', 'stats' or both, comma-separated)
   getAll: (params = {}) => api.get('/influencers/', { params }),
   
   // Get influencer by username
@@ -22,6 +22,10 @@ export const influencerAPI = {
   // Create new influencer
   create: (data) => api.post('/influencers/', data),
   
+  // Create many influencers in one transaction (sync: look up TikTok IDs + sync videos in the background)
+  bulkCreate: (influencers, { sync = false, updateExisting = false } = {}) =>
+    api.post('/influencers/bulk', { influencers, sync, update_existing: updateExisting }),
+  
   // Update influencer
   update: (username, data) => api.put(`/influencers/${username}`, data),
   
@@ -49,6 +53,14 @@ export const videosAPI = {
   syncAllVideos: () => api.post('/videos/sync/all'),
 }
 
+export const ownerAPI = {
+  // Get active owners
+  getAll: (params = {}) => api.get('/owners/', { params }),
+  
+  // Get owners ranked by their influencers' performance
+  getLeaderboard: (params = {}) => api.get('/owners/leaderboard', { params }),
+}
+
 export const analyticsAPI = {
   // Get dashboard stats
   getDashboardStats: () => api.get('/analytics/dashboard'),
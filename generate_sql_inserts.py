@@ -38,8 +38,9 @@ def read_csv_and_generate_sql(csv_file_path: str):
             # INSERT na tabela influencers
             sql_statements.append(f"-- [{count}] Influencer: {eldorado_username}")
             
-            insert_influencer = f"""INSERT INTO influencers (first_name, eldorado_username, phone, country, owner, status, created_at, updated_at) 
-VALUES ('{first_name}', '{eldorado_username}', {f"'{phone}'" if phone else 'NULL'}, '{country}', '{owner}', 'active', NOW(), NOW())
+            insert_influencer = f"""INSERT INTO influencers (first_name, eldorado_username, phone, country, owner_id, status, created_at, updated_at) 
+SELECT '{first_name}', '{eldorado_username}', {f"'{phone}'" if phone else 'NULL'}, '{country}', id, 'active', NOW(), NOW()
+FROM owners WHERE name = lower('{owner}')
 ON CONFLICT (eldorado_username) DO NOTHING;"""
             
             sql_statements.append(insert_influencer)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Import-time profile of the API startup (python -X importtime)
+
+Usage:
+    python profile_startup.py            # top 25 modules by cumulative import time
+    python profile_startup.py --top 50
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Dependencies that should only load on first use, never at startup
+LAZY_MODULES = ["openai", "numpy", "imageio", "tiktoken", "faster_whisper", "ctranslate2"]
+
+PROBE = """
+import resource, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print("ELAPSED", elapsed)
+print("MAXRSS_KB", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+print("LOADED", ",".join(m for m in sys.argv[1:] if m in sys.modules))
+"""
+
+
+def run_probe():
+    """Import app.main in a fresh interpreter with -X importtime"""
+    env = dict(os.environ)
+    env.pop("RAILWAY_ENVIRONMENT", None)  # Don't run migrations on import
+    env.pop("PORT", None)
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, *LAZY_MODULES],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+
+def parse_importtime(stderr: str):
+    """Parse '-X importtime' lines into (self_us, cumulative_us, module) tuples"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len("import time:"):].split("|")
+            rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+        except ValueError:
+            continue
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of app startup")
+    parser.add_argument("--top", type=int, default=25, help="Number of modules to show")
+    args = parser.parse_args()
+
+    result = run_probe()
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(result.returncode)
+
+    stats = dict(line.split(" ", 1) for line in result.stdout.splitlines() if " " in line)
+    rows = parse_importtime(result.stderr)
+
+    print("🚀 Startup import profile - app.main")
+    print("=" * 70)
+    print(f"Import time:  {float(stats.get('ELAPSED', 0)) * 1000:.0f} ms")
+    print(f"Peak RSS:     {int(stats.get('MAXRSS_KB', 0)) / 1024:.1f} MB")
+    print(f"Modules:      {len(rows)}")
+
+    print(f"\nTop {args.top} by cumulative time:")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for self_us, cumulative_us, module in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {module}")
+
+    loaded = [m for m in stats.get("LOADED", "").strip().split(",") if m]
+    print("\nLazy dependencies loaded at startup:")
+    if loaded:
+        for module in loaded:
+            print(f"  ❌ {module}")
+        sys.exit(1)
+    print("  ✅ none (" + ", ".join(LAZY_MODULES) + ")")
+
+
+if __name__ == "__main__":
+    main()
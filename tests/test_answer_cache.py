@@ -0,0 +1,15 @@
+from app.services.answer_cache import AnswerCache
+
+QUESTION = "Quais influenciadores do owner alisson postaram mais vídeos com mais views nos últimos 30 dias?"
+
+
+def test_near_duplicates_only_differ_on_filler_words():
+    cache = AnswerCache()
+    cache.set(QUESTION, "v1", "resposta")
+
+    assert cache.get("Mostre quais influenciadores do owner alisson postaram mais vídeos com mais views nos últimos 30 dias", "v1") == "resposta"
+    # A different owner, an added negation or another period is another question
+    assert cache.get(QUESTION.replace("alisson", "samuel"), "v1") is None
+    assert cache.get(QUESTION.replace("postaram", "não postaram"), "v1") is None
+    assert cache.get(QUESTION.replace("30", "7"), "v1") is None
+    assert cache.get(QUESTION, "v2") is None
@@ -0,0 +1,30 @@
+import csv
+import io
+import tempfile
+
+from app.services.influencer_import import InfluencerImporter
+
+CSV = (
+    "Nome,User El dorado,tiktok @,Pais,Owner,telefone\n"
+    "Ana,ana01,@ana,Brasil,alisson,\n"
+    "Bia,bia02,@bia,Brasil\n"
+    "\n"
+    '"Caio\nSilva",caio03,@caio,Brasil,alisson,,extra\n'
+    "Duda,duda04,@duda,Brasil,alisson,5511999999999\n"
+)
+
+
+def test_stage_reports_wrong_field_counts_by_line_and_keeps_the_rest():
+    stream = io.BytesIO(CSV.encode("utf-8"))
+    with tempfile.SpooledTemporaryFile() as staged:
+        columns, malformed = InfluencerImporter()._stage(stream, staged)
+        staged_rows = list(csv.reader(io.TextIOWrapper(staged, encoding="utf-8", newline="")))
+
+    assert columns == ["first_name", "eldorado_username", "tiktok_username", "country", "owner", "phone"]
+    assert malformed == [
+        {"row": 3, "eldorado_username": "bia02", "error": "Expected 6 fields, found 4"},
+        {"row": 5, "eldorado_username": "caio03", "error": "Expected 6 fields, found 7"},
+    ]
+    # Staged records carry the line they start on, after the one spanning lines 5-6
+    assert [(row[1], row[-1]) for row in staged_rows] == [("ana01", "2"), ("duda04", "7")]
+    assert not stream.closed
@@ -0,0 +1,41 @@
+from unittest import mock
+
+from app.services.transcription_service import TranscriptionService
+from app.services.video_url_index import VideoUrlIndex
+from app.services.video_url_resolver import VideoUrlResolver
+
+FIRST = "https://www.tiktok.com/share/video?aweme_id=7301234567890123456&utm_source=copy"
+SECOND = "https://www.tiktok.com/share/video?aweme_id=7309876543210987654&utm_source=copy"
+
+
+def test_share_urls_with_different_ids_are_different_aliases():
+    assert VideoUrlIndex.normalize(FIRST) == "tiktok.com/share/video?aweme_id=7301234567890123456"
+    assert VideoUrlIndex.normalize(FIRST) != VideoUrlIndex.normalize(SECOND)
+
+
+def test_resolver_parses_share_urls_before_the_index():
+    db = mock.MagicMock()
+    db.query.return_value.filter.return_value.all.return_value = []
+    resolver = VideoUrlResolver()
+    # A stale alias that would map every share link to the first video
+    stale = {FIRST: "7301234567890123456", SECOND: "7301234567890123456"}
+    resolver.url_index.lookup_many = mock.MagicMock(
+        side_effect=lambda db, urls: {url: stale[url] for url in urls if url in stale}
+    )
+
+    results = resolver.resolve(db, [FIRST, SECOND])
+
+    assert [result["tiktok_video_id"] for result in results] == ["7301234567890123456", "7309876543210987654"]
+    resolver.url_index.lookup_many.assert_called_once_with(db, [])
+
+
+def test_find_video_parses_share_urls_before_the_index():
+    db = mock.MagicMock()
+    service = TranscriptionService()
+    service.url_index.lookup = mock.MagicMock(return_value=("7301234567890123456", None))
+
+    first_id, _ = service.find_video(db, FIRST)
+    second_id, _ = service.find_video(db, SECOND)
+
+    assert (first_id, second_id) == ("7301234567890123456", "7309876543210987654")
+    service.url_index.lookup.assert_not_called()